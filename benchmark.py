@@ -51,7 +51,7 @@ def _build_extensions ():
 
 
 
-_BENCHMARK_MODULES = ('emission', 'logical')
+_BENCHMARK_MODULES = ('connection', 'emission', 'logical', 'variable')
 
 def _import_module_benchmarks (module_name):
     _build_extensions ()
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+#--------------------------------------------------------------------#
+# This file is part of Py-notify.                                    #
+#                                                                    #
+# Copyright (C) 2007, 2008 Paul Pogonyshev.                          #
+#                                                                    #
+# This library is free software; you can redistribute it and/or      #
+# modify it under the terms of the GNU Lesser General Public License #
+# as published by the Free Software Foundation; either version 2.1   #
+# of the License, or (at your option) any later version.             #
+#                                                                    #
+# This library is distributed in the hope that it will be useful,    #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of     #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU  #
+# Lesser General Public License for more details.                    #
+#                                                                    #
+# You should have received a copy of the GNU Lesser General Public   #
+# License along with this library; if not, write to the Free         #
+# Software Foundation, Inc., 51 Franklin Street, Fifth Floor,        #
+# Boston, MA 02110-1301 USA                                          #
+#--------------------------------------------------------------------#
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+
+from benchmark     import benchmarking
+from notify.signal import Signal
+
+
+
+if sys.version_info[0] >= 3:
+    xrange = range
+
+
+
+_NUM_CONNECTIONS = 2000
+
+
+class ConnectionBenchmark1 (benchmarking.Benchmark):
+
+    def get_description (self, scale = 1.0):
+        return ('%d connections with identifiers, interleaved with as many connections '
+                'with priorities, then disconnected by identifier'
+                % int (scale * _NUM_CONNECTIONS))
+
+
+    def execute (self, scale = 1.0):
+        signal      = Signal ()
+        connections = []
+
+        # Each handler with a priority goes in front of all handlers with identifiers.
+        for k in xrange (0, int (scale * _NUM_CONNECTIONS)):
+            connections.append (signal.connect_with_id (_ignoring_handler, k))
+            signal.connect_with_priority (1, _ignoring_handler, k)
+
+        for connection in connections:
+            connection.disconnect ()
+
+
+class ConnectionBenchmark2 (benchmarking.Benchmark):
+
+    def get_description (self, scale = 1.0):
+        return ('%d connections with identifiers, each surrounded with connections with '
+                'priorities and then disconnected by identifier'
+                % int (scale * _NUM_CONNECTIONS))
+
+
+    def execute (self, scale = 1.0):
+        signal = Signal ()
+
+        for k in xrange (0, int (scale * _NUM_CONNECTIONS)):
+            connection = signal.connect_with_id (_ignoring_handler, k)
+            signal.connect_with_priority (-1, _ignoring_handler, k)
+            signal.connect_with_priority (1, _ignoring_handler, k)
+            connection.disconnect ()
+
+
+
+def _ignoring_handler (*arguments):
+    pass
+
+
+
+if __name__ == '__main__':
+    benchmarking.main ()
+
+
+
+# Local variables:
+# mode: python
+# python-indent: 4
+# indent-tabs-mode: nil
+# fill-column: 90
+# End:
@@ -33,7 +33,7 @@ if __name__ == '__main__':
 import sys
 
 from benchmark     import benchmarking
-from notify.signal import Signal
+from notify.signal import AbstractSignal, Signal
 
 
 
@@ -97,6 +97,56 @@ class EmissionBenchmark2 (benchmarking.Benchmark):
             signal ()
 
 
+class EmissionBenchmark3 (benchmarking.Benchmark):
+
+    def initialize (self):
+        signal = Signal ()
+
+        signal.connect (_ignoring_handler)
+        signal.connect (_ignoring_handler)
+        signal.connect (_ignoring_handler)
+        signal.connect (_ignoring_handler)
+
+        self.__signal = signal
+
+
+    def get_description (self, scale = 1.0):
+        return ('%d emissions with an argument of a signal with 4 unbound function handlers'
+                % int (scale * _NUM_EMISSIONS))
+
+
+    def execute (self, scale = 1.0):
+        signal = self.__signal
+
+        for k in xrange (0, int (scale * _NUM_EMISSIONS)):
+            signal (k)
+
+
+class EmissionBenchmark4 (benchmarking.Benchmark):
+
+    def initialize (self):
+        signal = Signal (AbstractSignal.VALUE_LIST)
+
+        signal.connect (_ignoring_handler)
+        signal.connect (_ignoring_handler)
+        signal.connect (_ignoring_handler)
+        signal.connect (_ignoring_handler)
+
+        self.__signal = signal
+
+
+    def get_description (self, scale = 1.0):
+        return ('%d emissions of a signal with 4 unbound function handlers and value list accumulator'
+                % int (scale * _NUM_EMISSIONS))
+
+
+    def execute (self, scale = 1.0):
+        signal = self.__signal
+
+        for k in xrange (0, int (scale * _NUM_EMISSIONS)):
+            signal (k)
+
+
 
 try:
     import pygtk
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+#--------------------------------------------------------------------#
+# This file is part of Py-notify.                                    #
+#                                                                    #
+# Copyright (C) 2007, 2008 Paul Pogonyshev.                          #
+#                                                                    #
+# This library is free software; you can redistribute it and/or      #
+# modify it under the terms of the GNU Lesser General Public License #
+# as published by the Free Software Foundation; either version 2.1   #
+# of the License, or (at your option) any later version.             #
+#                                                                    #
+# This library is distributed in the hope that it will be useful,    #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of     #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU  #
+# Lesser General Public License for more details.                    #
+#                                                                    #
+# You should have received a copy of the GNU Lesser General Public   #
+# License along with this library; if not, write to the Free         #
+# Software Foundation, Inc., 51 Franklin Street, Fifth Floor,        #
+# Boston, MA 02110-1301 USA                                          #
+#--------------------------------------------------------------------#
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+
+    sys.path.insert (0, os.path.join (sys.path[0], os.pardir))
+
+
+
+import sys
+
+from benchmark       import benchmarking
+from notify.variable import Variable
+
+
+
+if sys.version_info[0] >= 3:
+    xrange = range
+
+
+
+_NUM_CHANGES = 100000
+
+
+class VariableBenchmark1 (benchmarking.Benchmark):
+
+    def initialize (self):
+        self.__variable = Variable (0)
+        self.__variable.changed.connect (_ignoring_handler)
+
+
+    def get_description (self, scale = 1.0):
+        return ('%d changes of a variable with a handler and no derived objects'
+                % int (scale * _NUM_CHANGES))
+
+
+    def execute (self, scale = 1.0):
+        variable = self.__variable
+
+        for k in xrange (0, int (scale * _NUM_CHANGES)):
+            variable.set (k)
+
+
+class VariableBenchmark2 (benchmarking.Benchmark):
+
+    def initialize (self):
+        self.__variable  = Variable (0)
+        self.__condition = self.__variable.predicate (lambda value: value & 1)
+        self.__condition.changed.connect (_ignoring_handler)
+
+
+    def get_description (self, scale = 1.0):
+        return ('%d changes of a variable feeding a predicate with a handler'
+                % int (scale * _NUM_CHANGES))
+
+
+    def execute (self, scale = 1.0):
+        variable = self.__variable
+
+        for k in xrange (0, int (scale * _NUM_CHANGES)):
+            variable.set (k)
+
+
+
+def _ignoring_handler (*arguments):
+    pass
+
+
+
+if __name__ == '__main__':
+    benchmarking.main ()
+
+
+
+# Local variables:
+# mode: python
+# python-indent: 4
+# indent-tabs-mode: nil
+# fill-column: 90
+# End:
@@ -0,0 +1,99 @@
+cdef extern from *:
+	"""
+	/* Call `callable' with positional arguments from tuple `arguments' and no keywords.
+	 * On Python versions with vectorcall protocol, tuple items are passed directly, so
+	 * callables implementing the protocol don't need to unpack the tuple.
+	 */
+	static PyObject *
+	__pyx_cnotify_call_positional (PyObject *callable, PyObject *arguments)
+	{
+	#if PY_VERSION_HEX >= 0x03090000
+		return PyObject_Vectorcall (callable, ((PyTupleObject *) arguments)->ob_item,
+									PyTuple_GET_SIZE (arguments), NULL);
+	#else
+		return PyObject_Call (callable, arguments, NULL);
+	#endif
+	}
+
+	/* Call `callable' with `self' (unless `has_self' is zero), items of `fixed' tuple and
+	 * items of `arguments' tuple as positional arguments and `keywords' (a dictionary or
+	 * None) as keyword arguments.  This is what bindings do on each call, so we avoid
+	 * concatenating tuples where possible.
+	 */
+	static PyObject *
+	__pyx_cnotify_call_prefixed (PyObject *callable, PyObject *self, int has_self,
+								 PyObject *fixed, PyObject *arguments, PyObject *keywords)
+	{
+		Py_ssize_t  num_fixed     = PyTuple_GET_SIZE (fixed);
+		Py_ssize_t  num_arguments = PyTuple_GET_SIZE (arguments);
+		Py_ssize_t  total         = (has_self ? 1 : 0) + num_fixed + num_arguments;
+		Py_ssize_t  index         = 0;
+		Py_ssize_t  k;
+		PyObject   *result;
+
+		if (keywords == Py_None || PyDict_Size (keywords) == 0)
+			keywords = NULL;
+
+		if (total == num_arguments)
+			return PyObject_Call (callable, arguments, keywords);
+
+	#if PY_VERSION_HEX >= 0x03090000
+		{
+			PyObject  *small_stack[8];
+			PyObject **stack = small_stack;
+
+			if (total > 8) {
+				stack = PyMem_Malloc (total * sizeof (PyObject *));
+				if (stack == NULL)
+					return PyErr_NoMemory ();
+			}
+
+			if (has_self)
+				stack[index++] = self;
+			for (k = 0; k < num_fixed; k++)
+				stack[index++] = PyTuple_GET_ITEM (fixed, k);
+			for (k = 0; k < num_arguments; k++)
+				stack[index++] = PyTuple_GET_ITEM (arguments, k);
+
+			result = PyObject_VectorcallDict (callable, stack, total, keywords);
+
+			if (stack != small_stack)
+				PyMem_Free (stack);
+		}
+	#else
+		{
+			PyObject *all_arguments = PyTuple_New (total);
+			if (all_arguments == NULL)
+				return NULL;
+
+			if (has_self) {
+				Py_INCREF (self);
+				PyTuple_SET_ITEM (all_arguments, index++, self);
+			}
+			for (k = 0; k < num_fixed; k++) {
+				PyObject *item = PyTuple_GET_ITEM (fixed, k);
+				Py_INCREF (item);
+				PyTuple_SET_ITEM (all_arguments, index++, item);
+			}
+			for (k = 0; k < num_arguments; k++) {
+				PyObject *item = PyTuple_GET_ITEM (arguments, k);
+				Py_INCREF (item);
+				PyTuple_SET_ITEM (all_arguments, index++, item);
+			}
+
+			result = PyObject_Call (callable, all_arguments, keywords);
+			Py_DECREF (all_arguments);
+		}
+	#endif
+
+		return result;
+	}
+	"""
+	object call_positional "__pyx_cnotify_call_positional" (object callable, tuple arguments)
+	object call_prefixed "__pyx_cnotify_call_prefixed" (object callable, object self, bint has_self,
+														tuple fixed, tuple arguments, object keywords)
+
+cdef extern from "Python.h":
+	bint PyFunction_Check(object)
+	bint PyMethod_Check(object)
+	bint PyCFunction_Check(object)
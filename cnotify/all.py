@@ -33,6 +33,7 @@ Whether to use this feature is up to you.
 __docformat__ = 'epytext en'
 
 
+from cnotify.array     import *
 from cnotify.base      import *
 from cnotify.bind      import *
 from cnotify.condition import *
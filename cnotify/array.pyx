@@ -0,0 +1,619 @@
+# -*- coding: utf-8 -*-
+
+#--------------------------------------------------------------------#
+# This file is part of Py-notify.                                    #
+#                                                                    #
+# Copyright (C) 2006, 2007, 2008 Paul Pogonyshev.                    #
+#                                                                    #
+# This library is free software; you can redistribute it and/or      #
+# modify it under the terms of the GNU Lesser General Public License #
+# as published by the Free Software Foundation; either version 2.1   #
+# of the License, or (at your option) any later version.             #
+#                                                                    #
+# This library is distributed in the hope that it will be useful,    #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of     #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU  #
+# Lesser General Public License for more details.                    #
+#                                                                    #
+# You should have received a copy of the GNU Lesser General Public   #
+# License along with this library; if not, write to the Free         #
+# Software Foundation, Inc., 51 Franklin Street, Fifth Floor,        #
+# Boston, MA 02110-1301 USA                                          #
+#--------------------------------------------------------------------#
+
+
+"""
+L{Variable arrays <VariableArray>} hold many values in one NumPy array and notify about
+changes of any number of elements at once.  L{Condition arrays <ConditionArray>} are
+their vectorized counterpart of predicate conditions.  This module requires NumPy;
+without it, the classes are still defined, but cannot be instantiated.
+"""
+
+__docformat__ = 'epytext en'
+__all__       = ('VariableArray', 'ConditionArray')
+
+
+import weakref
+
+from cnotify.base cimport AbstractValueObject, note_value_read
+from cnotify.condition cimport AbstractCondition
+from cnotify.gc        import AbstractGCProtector
+from cnotify.signal    import CleanSignal, Signal
+from cnotify.utils     import is_callable
+from cnotify.variable  import AbstractVariable
+
+try:
+    import numpy
+except ImportError:
+    # Ignore, arrays will not be usable.
+    numpy = None
+
+
+
+#-- Variable arrays ---------------------------------------------------
+
+class VariableArray (AbstractValueObject):
+
+    """
+    A value object holding a one-dimensional NumPy array.  Unlike a list of
+    C{L{Variable <variable.Variable>}} objects, changing any number of elements costs one
+    vectorized comparison and one emission of C{L{elements_changed}} signal.
+
+    Value of the array, as returned from C{L{get}}, is a read-only NumPy array.  It is
+    never modified in place: every change creates a new array, so a value obtained
+    earlier stays valid.  The shape of the array cannot be changed.
+
+    Elements can also be accessed as separate variables, with C{array[index]}.  These are
+    created on demand and are normal C{L{AbstractVariable <variable.AbstractVariable>}}
+    instances, so they can be used with any code that expects a variable.  Their
+    ‘changed’ signals are emitted when corresponding element changes.
+
+    Note that NumPy arrays cannot be compared with C{!=} operator as a whole, so when
+    changes of a variable array are frozen, coalesced or grouped in a transaction, its
+    values are compared with C{numpy.array_equal} instead (see C{L{values_differ}}).
+    """
+
+    __slots__ = ('__values', '__elements', '__elements_changed')
+
+
+    def __init__(self, values, dtype = None):
+        """
+        Create a new array holding a copy of C{values}.
+
+        @param  values:     initial values, anything accepted by C{numpy.array}.
+        @param  dtype:      NumPy data type of the array; if C{None}, it is deduced from
+                            C{values}.
+
+        @raises ImportError: if NumPy is not installed.
+        @raises ValueError:  if C{values} is not one-dimensional.
+        """
+
+        if numpy is None:
+            raise ImportError ("'VariableArray' requires NumPy")
+
+        super (VariableArray, self).__init__()
+
+        values = numpy.array (values, dtype = dtype)
+        if values.ndim != 1:
+            raise ValueError ('array values must be one-dimensional')
+
+        values.flags.writeable = False
+
+        self.__values           = values
+        self.__elements         = weakref.WeakValueDictionary ()
+        self.__elements_changed = None
+
+
+    def get (self):
+        """
+        Get the current values of the array.
+
+        @rtype: read-only C{numpy.ndarray}
+        """
+
+        note_value_read (self)
+        return self.__values
+
+    def set (self, values):
+        """
+        Replace all values of the array.  The values are compared with the current ones in
+        one vectorized operation and, if any of them differ, C{L{elements_changed}}
+        signal is emitted once with all changed indices, followed by ‘changed’ signal.
+
+        @param  values:     new values, anything accepted by C{numpy.array} that has the
+                            same length as the array.
+
+        @rtype:             C{bool}
+        @returns:           Whether any element changed as a result.
+
+        @raises ValueError: if C{values} has a different shape.
+        """
+
+        values = numpy.array (values, dtype = self.__values.dtype)
+        if values.shape != self.__values.shape:
+            raise ValueError ('cannot change shape of the array from %s to %s'
+                              % (self.__values.shape, values.shape))
+
+        indices = numpy.flatnonzero (values != self.__values)
+        if len (indices) == 0:
+            return False
+
+        values.flags.writeable = False
+        self.__values          = values
+
+        return self.__elements_have_changed (indices)
+
+
+    def _is_mutable (self):
+        return True
+
+
+    def values_differ (self, old_value, new_value):
+        return not numpy.array_equal (old_value, new_value)
+
+
+    def set_elements (self, indices, values):
+        """
+        Change values of some elements of the array.  Like with C{L{set}}, notification
+        is done once, for all elements that actually changed.
+
+        @param  indices: any NumPy index into the array: an integer, a slice, a sequence
+                         of integers or a boolean mask.
+        @param  values:  new values for these elements; broadcast as in NumPy
+                         assignment.
+
+        @rtype:          C{bool}
+        @returns:        Whether any element changed as a result.
+        """
+
+        old_values = self.__values
+        new_values = old_values.copy ()
+
+        new_values[indices] = values
+
+        # Normalize any index to sorted unique integers, then drop those whose value is
+        # the same (e.g. when the same index is given several times.)
+        indices = numpy.unique (numpy.arange (len (old_values)) [indices])
+        indices = indices[new_values[indices] != old_values[indices]]
+
+        if len (indices) == 0:
+            return False
+
+        new_values.flags.writeable = False
+        self.__values              = new_values
+
+        return self.__elements_have_changed (indices)
+
+
+    def __elements_have_changed (self, indices):
+        values = self.__values
+
+        if self.__elements_changed is not None:
+            self.__elements_changed.emit (indices, values[indices])
+
+        _notify_elements (self.__elements, values, indices)
+        return self._value_changed (values)
+
+
+    def _get_element (self, index):
+        return self.__values[index].item ()
+
+
+    def __len__(self):
+        return len (self.__values)
+
+    def __getitem__(self, index):
+        """
+        Get a variable standing for C{index}th element of the array.  The same variable
+        is returned for the same element as long as it is referenced.
+
+        @rtype:             C{L{AbstractVariable <variable.AbstractVariable>}}
+
+        @raises IndexError: if C{index} is out of range.
+        """
+
+        index   = _normalize_index (index, len (self.__values))
+        element = self.__elements.get (index)
+
+        if element is None:
+            element                = _VariableArrayElement (self, index)
+            self.__elements[index] = element
+
+        return element
+
+
+    def __get_elements_changed (self):
+        if self.__elements_changed is None:
+            self.__elements_changed = Signal ()
+
+        return self.__elements_changed
+
+    elements_changed = property (__get_elements_changed,
+                                 doc = ("""
+                                        The signal emitted when any elements of the array
+                                        change.  Handlers are called with two arguments:
+                                        sorted array of changed indices and array of new
+                                        values of these elements.  Unlike ‘changed’, this
+                                        signal is not affected by freezing.
+
+                                        @type: C{L{Signal <signal.Signal>}}
+                                        """))
+
+
+    def predicate (self, predicate):
+        """
+        Construct a condition array, whose states are always given C{predicate} over
+        values of this array.  C{predicate} must be vectorized: it is called with a NumPy
+        array of values and must return an array of booleans of the same length, e.g.
+        C{lambda values: values > 10}.  When elements of this array change, it is called
+        once, with values of the changed elements only.
+
+        @param  predicate: a vectorized callable computing states of the returned
+                           condition array.
+
+        @rtype:            C{L{ConditionArray}}
+
+        @raises TypeError: if C{predicate} is not callable.
+        """
+
+        return ConditionArray (predicate, self)
+
+
+    def _additional_description (self, formatter):
+        return (['%d elements' % len (self.__values)]
+                + super (VariableArray, self)._additional_description (formatter))
+
+
+    def _generate_derived_type_dictionary (cls, options):
+        raise TypeError ("'VariableArray' doesn't support derive_type() method")
+
+    _generate_derived_type_dictionary = classmethod (_generate_derived_type_dictionary)
+
+
+
+class ConditionArray (AbstractValueObject):
+
+    """
+    A value object holding a one-dimensional array of boolean states, each being a
+    predicate over corresponding element of a C{L{VariableArray}}.  Condition arrays are
+    normally created with C{L{VariableArray.predicate}} method.
+
+    Condition array follows its variable array only while it is in use, i.e. while its
+    ‘changed’ or C{L{elements_changed}} signal or ‘changed’ signal of any of its element
+    conditions exists.  Then, each change of the variable array results in one call to
+    the predicate and one emission of C{L{elements_changed}} signal, for elements whose
+    state has flipped only.  Otherwise, the predicate is called when the states are read,
+    and only if the variable array has changed since the last time.
+
+    Elements can be accessed as separate conditions, with C{array[index]}, similarly to
+    C{L{VariableArray}} elements.
+    """
+
+    __slots__ = ('__predicate', '__array', '__states', '__array_values', '__num_uses',
+                 '__elements', '__elements_changed')
+
+
+    def __init__(self, predicate, array):
+        """
+        Create a new condition array computing its states with C{predicate} over values
+        of C{array}.
+
+        @raises TypeError: if C{predicate} is not callable or C{array} is not a
+                           C{L{VariableArray}}.
+        """
+
+        if not is_callable (predicate):
+            raise TypeError ('predicate must be callable')
+        if not isinstance (array, VariableArray):
+            raise TypeError ("'array' must be a VariableArray")
+
+        super (ConditionArray, self).__init__()
+
+        self.__predicate        = predicate
+        self.__array            = array
+        self.__states           = None
+        self.__array_values     = None
+        self.__num_uses         = 0
+        self.__elements         = weakref.WeakValueDictionary ()
+        self.__elements_changed = None
+
+
+    def get (self):
+        """
+        Get the current states of the condition array.
+
+        @rtype: read-only C{numpy.ndarray} of booleans
+        """
+
+        note_value_read (self)
+        return self.__get_states ()
+
+
+    def values_differ (self, old_value, new_value):
+        return not numpy.array_equal (old_value, new_value)
+
+
+    def __get_states (self):
+        if self.__num_uses == 0:
+            return self.__compute ()
+        else:
+            return self.__states
+
+    def __compute (self):
+        values = self.__array.get ()
+
+        if values is not self.__array_values:
+            # Variable arrays never modify their values in place, so identity check is
+            # enough to know if we are up-to-date.
+            states = numpy.array (self.__predicate (values), dtype = bool)
+            if states.shape != values.shape:
+                raise ValueError ('predicate returned %s states for %s values'
+                                  % (states.shape, values.shape))
+
+            states.flags.writeable = False
+
+            self.__states       = states
+            self.__array_values = values
+
+        return self.__states
+
+
+    def __update (self, indices, values):
+        states = numpy.asarray (self.__predicate (values), dtype = bool)
+        if states.shape != indices.shape:
+            raise ValueError ('predicate returned %s states for %s values'
+                              % (states.shape, indices.shape))
+
+        old_states          = self.__states
+        self.__array_values = self.__array.get ()
+
+        flipped = states != old_states[indices]
+        if not flipped.any ():
+            return
+
+        indices = indices[flipped]
+        states  = states[flipped]
+
+        new_states          = old_states.copy ()
+        new_states[indices] = states
+
+        new_states.flags.writeable = False
+        self.__states              = new_states
+
+        if self.__elements_changed is not None:
+            signal = self.__elements_changed ()
+            if signal is not None:
+                signal.emit (indices, states)
+
+        _notify_elements (self.__elements, new_states, indices)
+        self._value_changed (new_states)
+
+
+    # Any ‘changed’ or `elements_changed' signal (own or of element conditions) counts as
+    # a use.  Condition array only follows its variable array while it is used, and keeps
+    # itself alive meanwhile, since nothing else might reference it.
+
+    def _add_use (self):
+        self.__num_uses += 1
+
+        if self.__num_uses == 1:
+            self.__compute ()
+            self.__array.elements_changed.connect (self.__update)
+            AbstractGCProtector.default.protect (self)
+
+    def _remove_use (self):
+        self.__num_uses -= 1
+
+        if self.__num_uses == 0:
+            self.__array.elements_changed.disconnect (self.__update)
+            AbstractGCProtector.default.unprotect (self)
+
+
+    def _get_element (self, index):
+        return self.__get_states () [index].item ()
+
+
+    def __len__(self):
+        return len (self.__array)
+
+    def __getitem__(self, index):
+        """
+        Get a condition standing for C{index}th element of the array.  The same condition
+        is returned for the same element as long as it is referenced.
+
+        @rtype:             C{L{AbstractCondition <condition.AbstractCondition>}}
+
+        @raises IndexError: if C{index} is out of range.
+        """
+
+        index   = _normalize_index (index, len (self.__array))
+        element = self.__elements.get (index)
+
+        if element is None:
+            element                = _ConditionArrayElement (self, index)
+            self.__elements[index] = element
+
+        return element
+
+
+    def _create_signal (self):
+        self._add_use ()
+
+        signal = CleanSignal (self)
+        return signal, weakref.ref (signal, self.__on_usage_change)
+
+
+    def __on_usage_change (self, object):
+        if self._remove_signal (object):
+            self._remove_use ()
+
+
+    def __get_elements_changed (self):
+        if self.__elements_changed is not None:
+            signal = self.__elements_changed ()
+            if signal is not None:
+                return signal
+
+        self._add_use ()
+
+        signal                  = CleanSignal (self)
+        self.__elements_changed = weakref.ref (signal, self.__on_elements_changed_usage_change)
+
+        return signal
+
+
+    def __on_elements_changed_usage_change (self, object):
+        if object is self.__elements_changed:
+            self.__elements_changed = None
+            self._remove_use ()
+
+
+    elements_changed = property (__get_elements_changed,
+                                 doc = ("""
+                                        The signal emitted when states of any elements of
+                                        the array flip.  Handlers are called with two
+                                        arguments: sorted array of indices of flipped
+                                        elements and array of their new states.
+
+                                        @type: C{L{CleanSignal <signal.CleanSignal>}}
+                                        """))
+
+
+    def _additional_description (self, formatter):
+        return (['predicate: %s' % formatter (self.__predicate)]
+                + super (ConditionArray, self)._additional_description (formatter))
+
+
+    def _generate_derived_type_dictionary (cls, options):
+        raise TypeError ("'ConditionArray' doesn't support derive_type() method")
+
+    _generate_derived_type_dictionary = classmethod (_generate_derived_type_dictionary)
+
+
+
+#-- Internals ---------------------------------------------------------
+
+def _normalize_index (index, length):
+    index = int (index)
+    if index < 0:
+        index += length
+
+    if not 0 <= index < length:
+        raise IndexError ('array index out of range')
+
+    return index
+
+
+def _notify_elements (elements, values, indices):
+    # Emit ‘changed’ signals of existing element objects for changed `indices'.  Only
+    # changed indices are looked at, so the cost doesn't depend on the array size.
+    if len (elements) > 0:
+        for index in indices.tolist ():
+            element = elements.get (index)
+            if element is not None:
+                element._value_changed (values[index].item ())
+
+
+
+class _VariableArrayElement (AbstractVariable):
+
+    __slots__ = ('__array', '__index')
+
+
+    def __init__(self, array, index):
+        super (_VariableArrayElement, self).__init__()
+
+        self.__array = array
+        self.__index = index
+
+
+    def get (self):
+        note_value_read (self)
+        return self.__array._get_element (self.__index)
+
+    def set (self, value):
+        return self.__array.set_elements (self.__index, value)
+
+    def _is_mutable (self):
+        return True
+
+
+    def __get_index (self):
+        return self.__index
+
+    index = property (__get_index)
+
+
+    # The array only references its elements weakly, so an element must be kept alive
+    # while it has a ‘changed’ signal, else the signal would not get emitted.
+
+    def _create_signal (self):
+        AbstractGCProtector.default.protect (self)
+
+        signal = CleanSignal (self)
+        return signal, weakref.ref (signal, self.__on_usage_change)
+
+
+    def __on_usage_change (self, object):
+        if self._remove_signal (object):
+            AbstractGCProtector.default.unprotect (self)
+
+
+    def _additional_description (self, formatter):
+        return (['index: %d' % self.__index]
+                + super (_VariableArrayElement, self)._additional_description (formatter))
+
+
+
+class _ConditionArrayElement (AbstractCondition):
+
+    __slots__ = ('__array', '__index')
+
+
+    def __init__(self, array, index):
+        super (_ConditionArrayElement, self).__init__()
+
+        self.__array = array
+        self.__index = index
+
+
+    def get (self):
+        note_value_read (self)
+        return self.__array._get_element (self.__index)
+
+
+    def __get_index (self):
+        return self.__index
+
+    index = property (__get_index)
+
+
+    # Besides keeping itself alive, as variable array elements do, an element condition
+    # makes its array follow the variable array while it has a ‘changed’ signal.
+
+    def _create_signal (self):
+        AbstractGCProtector.default.protect (self)
+        self.__array._add_use ()
+
+        signal = CleanSignal (self)
+        return signal, weakref.ref (signal, self.__on_usage_change)
+
+
+    def __on_usage_change (self, object):
+        if self._remove_signal (object):
+            self.__array._remove_use ()
+            AbstractGCProtector.default.unprotect (self)
+
+
+    def _additional_description (self, formatter):
+        return (['index: %d' % self.__index]
+                + super (_ConditionArrayElement, self)._additional_description (formatter))
+
+
+
+# Local variables:
+# mode: python
+# python-indent: 4
+# indent-tabs-mode: nil
+# fill-column: 90
+# End:
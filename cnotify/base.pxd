@@ -4,13 +4,61 @@ from cnotify.signal cimport Signal
 cdef class AbstractValueObject(object):
 	cdef __weakref__
 	
-	cdef Signal __signal
+	cdef object __signal
 	cdef int __flags
+	cdef int _height
+	cdef bint _has_dependents
 	
 	cpdef object get(AbstractValueObject self)
 	cpdef int set(AbstractValueObject self, object value) except? -1
 	cpdef int _is_mutable(AbstractValueObject self)
+	cpdef bint values_differ(AbstractValueObject self, object old_value, object new_value) except -1
 	
 	cdef Signal __get_changed_signal(AbstractValueObject self)
-	cdef tuple _create_signal(AbstractValueObject self)
+	cpdef tuple _create_signal(AbstractValueObject self)
+	cdef _emit_changed(AbstractValueObject self, new_value)
+	cdef bint _is_frozen(AbstractValueObject self)
+	cdef object _get_previous_value(AbstractValueObject self, new_value)
 	
+
+cdef class ChangeCoalescer(object):
+	cdef __weakref__
+	
+	cdef dict __values
+	cdef list __dirty
+	cdef set __dirty_set
+	cdef object __schedule
+	cdef bint __flush_scheduled
+	cdef object __reference
+	
+	cdef _mark_dirty(ChangeCoalescer self, AbstractValueObject value_object)
+	cdef _flush_object(ChangeCoalescer self, AbstractValueObject value_object)
+
+cdef class ChangeTransaction(object):
+	cdef list __touched
+	cdef dict __original_values
+	cdef bint __owner
+	
+	cdef _record(ChangeTransaction self, AbstractValueObject value_object, new_value)
+	cdef _note_original_value(ChangeTransaction self, AbstractValueObject value_object, value)
+	cdef _commit(ChangeTransaction self)
+
+cdef class _PropagationScheduler(object):
+	cdef list __queue
+	cdef dict __original_values
+	cdef Py_ssize_t __serial
+	cdef bint _active
+	
+	cdef _schedule(_PropagationScheduler self, AbstractValueObject value_object, original_value)
+	cdef _run(_PropagationScheduler self, AbstractValueObject initiator, new_value)
+
+cdef class _ThreadState(object):
+	cdef ChangeTransaction transaction
+	cdef _PropagationScheduler scheduler
+	cdef list read_objects
+
+cdef note_value_changing(AbstractValueObject value_object, old_value)
+cdef note_value_read(AbstractValueObject value_object)
+cdef list start_tracking_reads()
+cdef list stop_tracking_reads(list outer_read_objects)
+cdef set_height_above(AbstractValueObject value_object, sources)
@@ -29,10 +29,16 @@ needed, but almost always conditions or variables is what you need.
 """
 
 __docformat__ = 'epytext en'
-__all__       = ('AbstractValueObject',)
+__all__       = ('AbstractValueObject', 'ChangeCoalescer', 'ChangeTransaction')
 
 
 import sys
+import threading
+import weakref
+
+from heapq import heappop, heappush
+
+cimport cython
 
 from cnotify.mediator import AbstractMediator
 #from  cnotify.signal   import AbstractSignal, Signal
@@ -86,7 +92,7 @@ cdef class AbstractValueObject (object):
     _additional_description
     """
     
-    __slots__ = ('__weakref__', '__signal', '__flags')
+    __slots__ = ('__weakref__', '__signal', '__flags', '_height')
 
 
     # Implementation note: `__flags' are a sum of following values:
@@ -99,6 +105,10 @@ cdef class AbstractValueObject (object):
     # need to combine with the first.
     #
     # We rely on Python's caching of small integers, otherwise this does waste memory.
+    #
+    # `_height' is 0 for objects that don't depend on other value objects and is greater
+    # than heights of all sources for derived ones.  `_has_dependents' is set while other
+    # objects are derived from this one.  See `_PropagationScheduler'.
 
     def __init__(self):
         """
@@ -112,8 +122,10 @@ cdef class AbstractValueObject (object):
         # For optimization reasons, `__signal' is created only when it is needed for the
         # first time.  This may improve memory consumption if there are many unused
         # properties.
-        self.__signal = None
-        self.__flags  = 0
+        self.__signal        = None
+        self.__flags         = 0
+        self._height         = 0
+        self._has_dependents = False
 
 
     cpdef object get (self):
@@ -159,6 +171,33 @@ cdef class AbstractValueObject (object):
         return self.set is not AbstractValueObject.set
 #        return self.set.im_func is not AbstractValueObject.set.im_func
 
+
+    cpdef bint values_differ (self, object old_value, object new_value) except -1:
+        """
+        Determine if C{new_value} is a change compared to C{old_value}, i.e. if going
+        from one to the other must emit ‘changed’ signal.  This is used whenever the value
+        before a series of changes is compared to the final one: when changes are
+        L{frozen <with_changes_frozen>}, L{coalesced <ChangeCoalescer>}, grouped in a
+        L{transaction <ChangeTransaction>} or propagated through derived objects.
+        Value-tracking variables also use it when their value is set.
+
+        Default implementation compares values with C{!=} operator.  Override this method
+        if that comparison is not meaningful for the values of your class or if it costs
+        more than the emission.  Variables can also be created with a different
+        comparison using C{L{derive_type <variable.AbstractValueTrackingVariable>}}
+        options C{change_detection} and C{change_key}.
+
+        @param old_value: the value before the changes.
+        @type  old_value: C{object}
+
+        @param new_value: the value after the changes.
+        @type  new_value: C{object}
+
+        @rtype:           C{bool}
+        """
+
+        return old_value != new_value
+
     #if sys.version_info[0] >= 3:
     #    def temp (self):
     #        return self.set.__func__ is not AbstractValueObject.set
@@ -184,9 +223,9 @@ cdef class AbstractValueObject (object):
         flags = self.__flags
         if flags & 3:
             if flags & 1:
-                return self.__signal
+                return <Signal> self.__signal
             else:
-                return self.__signal ()
+                return <Signal> self.__signal ()
         
         cdef Signal signal
         signal, self.__signal = self._create_signal ()
@@ -198,7 +237,7 @@ cdef class AbstractValueObject (object):
         return signal
 
 
-    cdef tuple _create_signal (self):
+    cpdef tuple _create_signal (self):
         """
         Create the signal that will be returned by C{L{changed}} property.  Default
         implementation returns an instance of C{L{Signal <signal.Signal>}} class without
@@ -561,15 +600,51 @@ cdef class AbstractValueObject (object):
 
         @rtype:           C{bool}
         @returns:         Always C{True}.
+
+        @see:             C{L{ChangeCoalescer}}
+        @see:             C{L{ChangeTransaction}}
         """
 
+        cdef _ThreadState          state
+        cdef _PropagationScheduler scheduler
+
+        if _num_active_scopes == 0 and not self._has_dependents:
+            # Nothing to defer and nothing to propagate to.
+            _dispatch_value_changed (self, new_value)
+            return True
+
+        state     = _get_thread_state ()
+        scheduler = state.scheduler
+
+        if state.transaction is not None:
+            state.transaction._record (self, new_value)
+            return True
+
+        if scheduler._active:
+            if self._height:
+                scheduler._schedule (self, self._get_previous_value (new_value))
+            else:
+                _dispatch_value_changed (self, new_value)
+        else:
+            scheduler._run (self, new_value)
+
+        return True
+
+    cdef _emit_changed (self, new_value):
         flags = self.__flags
         if flags == 1:
             self.__signal.emit (new_value)
         elif flags == 2:
             self.__signal ().emit (new_value)
 
-        return True
+    cdef bint _is_frozen (self):
+        return self.__flags < 0
+
+    cdef object _get_previous_value (self, new_value):
+        # Called from _value_changed() during transactions and propagation, i.e. after
+        # the value has changed already.  Subclasses return the previous value if they
+        # can deduce it.
+        return _UNKNOWN_VALUE
 
 
     def is_frozen (self):
@@ -635,7 +710,7 @@ cdef class AbstractValueObject (object):
                 self.__flags += 4
                 new_value     = self.get ()
 
-                if new_value != original_value:
+                if self.values_differ (original_value, new_value):
                     self._value_changed (new_value)
         else:
             return callback (*arguments, **keywords)
@@ -925,6 +1000,7 @@ cdef class AbstractValueObject (object):
             yield function
 
 
+    @staticmethod
     def _get_object (options):
         """
         Return Python expression for object that should be passed to various user
@@ -947,6 +1023,7 @@ cdef class AbstractValueObject (object):
             return 'self'
 
 
+    @staticmethod
     def _filter_options (options, *names):
         """
         Return a subset of C{options} including only those listed in C{names}.  This is a
@@ -973,8 +1050,563 @@ cdef class AbstractValueObject (object):
 
     derive_type                       = classmethod  (derive_type)
     _generate_derived_type_dictionary = classmethod  (_generate_derived_type_dictionary)
-    _get_object                       = staticmethod (_get_object)
-    _filter_options                   = staticmethod (_filter_options)
+
+
+
+#-- Coalescing changes of many objects --------------------------------
+
+cdef class ChangeCoalescer (object):
+
+    """
+    An object that postpones ‘changed’ signal emission for a set of value objects until
+    C{L{flush}} is called.  Only the final value of each object is then emitted, and
+    objects whose value is back to what it was at the previous flush don’t emit at all.
+    In this sense, it is like C{L{with_changes_frozen
+    <AbstractValueObject.with_changes_frozen>}} for many objects at once and without
+    limiting the changes to a single callback.
+
+    Flushing can be done explicitly or, if a C{schedule} callable is passed to the
+    constructor, once per event loop turn:
+
+        >>> import gobject
+        ... coalescer = ChangeCoalescer (gobject.idle_add)
+        ... coalescer.add (variable)
+
+    Note that the coalescer references added objects strongly, until they are removed.
+    An object can only be added to one coalescer at a time.  If the coalescer itself is
+    garbage-collected, its objects are released and emit their changes normally again,
+    but changes that had not been flushed by then are never emitted.
+    """
+
+    __slots__ = ('__weakref__', '__values', '__dirty', '__dirty_set', '__schedule',
+                 '__flush_scheduled', '__reference')
+
+
+    def __init__(self, schedule = None):
+        """
+        Create a new coalescer.  If C{schedule} is not C{None}, it will be called with
+        C{L{flush}} method as the only argument once an added object changes and no flush
+        is scheduled yet.  It is supposed to arrange for the argument to be called later,
+        e.g. on the next event loop turn.  C{asyncio} loop’s C{call_soon} and
+        C{gobject.idle_add} can be used as is.
+
+        @param  schedule:  optional callable for scheduling automatic flushes.
+
+        @raises TypeError: if C{schedule} is not callable.
+        """
+
+        if schedule is not None and not is_callable (schedule):
+            raise TypeError ("'schedule' must be callable")
+
+        self.__values          = {}
+        self.__dirty           = []
+        self.__dirty_set       = set ()
+        self.__schedule        = schedule
+        self.__flush_scheduled = False
+        self.__reference       = weakref.ref (self, _forget_coalescer)
+
+
+    def add (self, value_object):
+        """
+        Start coalescing ‘changed’ signal emissions of C{value_object}.  Its current value
+        is remembered as the original one.
+
+        @param  value_object: the object to add.
+        @type   value_object: C{L{AbstractValueObject}}
+
+        @rtype:               C{bool}
+        @returns:             C{False} if the object was already added to this coalescer.
+
+        @raises TypeError:    if C{value_object} is not an C{AbstractValueObject}.
+        @raises ValueError:   if C{value_object} is added to a different coalescer.
+        """
+
+        if not isinstance (value_object, AbstractValueObject):
+            raise TypeError ("'value_object' must be an AbstractValueObject")
+
+        coalescer = _get_coalescer (value_object)
+        if coalescer is self:
+            return False
+        if coalescer is not None:
+            raise ValueError ('%r is already added to another coalescer' % value_object)
+
+        self.__values[value_object] = value_object.get ()
+        _coalescers[value_object]   = self.__reference
+
+        return True
+
+
+    def remove (self, value_object):
+        """
+        Stop coalescing ‘changed’ signal emissions of C{value_object}.  If the object has
+        pending changes, they are flushed first.
+
+        @rtype:   C{bool}
+        @returns: C{False} if the object was not added to this coalescer.
+        """
+
+        if _get_coalescer (value_object) is not self:
+            return False
+
+        if value_object in self.__dirty_set:
+            self.__dirty_set.remove (value_object)
+            self.__dirty.remove (value_object)
+
+            self._flush_object (value_object)
+
+        del _coalescers[value_object]
+        del self.__values[value_object]
+
+        return True
+
+
+    def flush (self):
+        """
+        Emit ‘changed’ signal of each object that changed since the previous flush.
+        Objects are processed in the order they first changed.  If handlers change other
+        added objects, these are flushed too, before this method returns.
+
+        Objects that are L{frozen <AbstractValueObject.is_frozen>} at the moment are left
+        for the next flush.
+
+        @rtype:   C{bool}
+        @returns: Whether any signal was emitted.
+        """
+
+        cdef bint any_emitted = False
+
+        self.__flush_scheduled = False
+        postponed              = []
+
+        while self.__dirty:
+            dirty            = self.__dirty
+            self.__dirty     = []
+            self.__dirty_set = set ()
+
+            for value_object in dirty:
+                if (<AbstractValueObject> value_object)._is_frozen ():
+                    postponed.append (value_object)
+                elif self._flush_object (value_object):
+                    any_emitted = True
+
+        for value_object in postponed:
+            self._mark_dirty (value_object)
+
+        return any_emitted
+
+
+    cdef _mark_dirty (self, AbstractValueObject value_object):
+        if value_object not in self.__dirty_set:
+            self.__dirty_set.add (value_object)
+            self.__dirty.append (value_object)
+
+            if self.__schedule is not None and not self.__flush_scheduled:
+                self.__flush_scheduled = True
+                self.__schedule (self.flush)
+
+    cdef _flush_object (self, AbstractValueObject value_object):
+        new_value = value_object.get ()
+
+        if value_object.values_differ (self.__values[value_object], new_value):
+            self.__values[value_object] = new_value
+            value_object._emit_changed (new_value)
+            return True
+        else:
+            return False
+
+
+    def __repr__(self):
+        return ('<%s.%s at 0x%x: %d objects, %d changed>'
+                % (type (self).__module__, type (self).__name__, id (self),
+                   len (self.__values), len (self.__dirty)))
+
+
+# Maps value objects to weak references to their coalescers, so that a coalescer dropped
+# without removing its objects doesn't keep them coalesced forever.  As long as it is
+# empty, _value_changed() doesn't need to look anything up.
+cdef dict _coalescers = {}
+
+
+cdef ChangeCoalescer _get_coalescer (value_object):
+    reference = _coalescers.get (value_object)
+    if reference is not None:
+        return <ChangeCoalescer> reference ()
+    else:
+        return None
+
+
+def _forget_coalescer (reference):
+    for value_object in [value_object for value_object, _reference in _coalescers.items ()
+                         if _reference is reference]:
+        del _coalescers[value_object]
+
+
+cdef _dispatch_value_changed (AbstractValueObject value_object, new_value):
+    # Like _value_changed(), but ignoring transactions and propagation.
+    if _coalescers:
+        coalescer = _get_coalescer (value_object)
+        if coalescer is not None:
+            (<ChangeCoalescer> coalescer)._mark_dirty (value_object)
+            return
+
+    value_object._emit_changed (new_value)
+
+
+
+#-- Propagation through derived objects -------------------------------
+
+# Derived objects (e.g. `condition1 & condition2' or `variable.transform (...)') update
+# themselves from handlers of their sources' `changed' signals.  If they emitted right
+# away, then in a diamond-shaped graph a shared descendant would be notified once per
+# path, and handlers could observe intermediate states.  Instead, while a change is being
+# propagated, derived objects only update their value and get scheduled here.  Scheduled
+# objects are processed in order of increasing height, so each emits at most once, after
+# all its sources are final.  Objects without sources (height 0) that change meanwhile,
+# e.g. from a handler, still emit immediately.  Each thread propagates its own changes
+# with its own scheduler, see `_ThreadState'.
+#
+# Heights are computed when a derived object gets its sources (set_height_above()).  A
+# source's height can grow later, e.g. when a computed variable starts reading a deeper
+# object or a watcher switches to one.  Objects derived from it are then raised as well,
+# so that they are still processed after it.
+#
+# Most changes happen outside of any transaction or propagation, to objects nothing is
+# derived from.  These are emitted right away, without looking up the thread state, as
+# long as the counter below is zero.
+
+# Number of open transactions and active propagations, in all threads.
+cdef int _num_active_scopes = 0
+
+# Only referenced from its thread's state, so never part of a reference cycle.
+@cython.no_gc
+cdef class _PropagationScheduler (object):
+
+    __slots__ = ('__queue', '__original_values', '__serial', '_active')
+
+
+    def __init__(self):
+        self.__queue           = []
+        self.__original_values = {}
+        self.__serial          = 0
+        self._active           = False
+
+
+    cdef _schedule (self, AbstractValueObject value_object, original_value):
+        if value_object not in self.__original_values:
+            self.__original_values[value_object] = original_value
+
+            # Serial number keeps the order stable and avoids comparing objects.
+            heappush (self.__queue, (value_object._height, self.__serial, value_object))
+            self.__serial += 1
+
+
+    cdef _run (self, AbstractValueObject initiator, new_value):
+        global _num_active_scopes
+
+        cdef AbstractValueObject value_object
+        cdef list                queue = self.__queue
+
+        self._active        = True
+        _num_active_scopes += 1
+
+        try:
+            if initiator is not None:
+                _dispatch_value_changed (initiator, new_value)
+
+            while queue:
+                value_object   = heappop (queue)[2]
+                original_value = self.__original_values.pop (value_object)
+
+                new_value = value_object.get ()
+                if (   original_value is _UNKNOWN_VALUE
+                    or value_object.values_differ (original_value, new_value)):
+                    _dispatch_value_changed (value_object, new_value)
+        finally:
+            self._active        = False
+            _num_active_scopes -= 1
+
+            if queue:
+                del queue[:]
+                self.__original_values.clear ()
+
+            self.__serial = 0
+
+
+# Weakly map value objects to the objects derived from them and back.  Only used to
+# update heights, so nothing is kept alive by these.
+_dependents = weakref.WeakKeyDictionary ()
+_sources    = weakref.WeakKeyDictionary ()
+
+
+cdef set_height_above (AbstractValueObject value_object, sources):
+    # Must be called by derived objects whenever their set of sources changes.
+    cdef int height     = 0
+    cdef int old_height = value_object._height
+
+    old_sources = _sources.pop (value_object, None)
+    if old_sources is not None:
+        for source in old_sources:
+            if source not in sources:
+                dependents = _dependents[source]
+                dependents.discard (value_object)
+
+                # Dependents that are garbage-collected are not noticed, so the flag
+                # may stay set.  That only disables the shortcut in _value_changed().
+                if not dependents:
+                    (<AbstractValueObject> source)._has_dependents = False
+
+    if sources:
+        _sources[value_object] = weakref.WeakSet (sources)
+
+    for source in sources:
+        if (<AbstractValueObject> source)._height >= height:
+            height = (<AbstractValueObject> source)._height + 1
+
+        dependents = _dependents.get (source)
+        if dependents is None:
+            dependents = _dependents[source] = weakref.WeakSet ()
+
+        dependents.add (value_object)
+        (<AbstractValueObject> source)._has_dependents = True
+
+    value_object._height = height
+
+    if height > old_height:
+        _raise_dependents (value_object)
+
+
+cdef _raise_dependents (AbstractValueObject value_object):
+    # Make sure that every object (transitively) derived from `value_object' is higher
+    # than its sources.  Done depth-first, keeping the current path, so that a cycle
+    # (e.g. a watcher watching something derived from itself) is skipped instead of
+    # raising heights forever.
+    cdef AbstractValueObject source
+    cdef AbstractValueObject dependent
+
+    path  = set ((value_object,))
+    stack = [(value_object, iter (list (_dependents.get (value_object, ()))))]
+
+    while stack:
+        source, dependents = stack[-1]
+
+        for dependent in dependents:
+            if dependent._height <= source._height and dependent not in path:
+                dependent._height = source._height + 1
+
+                path.add (dependent)
+                stack.append ((dependent, iter (list (_dependents.get (dependent, ())))))
+                break
+        else:
+            stack.pop ()
+            path.discard (source)
+
+
+
+#-- Transactions ------------------------------------------------------
+
+cdef class ChangeTransaction (object):
+
+    """
+    A context manager that freezes ‘changed’ signals of I{all} value objects while it is
+    active:
+
+        >>> with ChangeTransaction ():
+        ...     for variable, value in zip (variables, values):
+        ...         variable.value = value
+
+    When the transaction ends, each object that changed emits its ‘changed’ signal once,
+    with its final value, unless it is the same as the value before the transaction.
+    Objects derived from changed ones (e.g. C{~condition}) are then updated and emit
+    their own signals, each at most once and only after all their sources.
+
+    Transactions can be nested, but only the outermost one has any effect.  Changes are
+    committed even if the block raises an exception.  A transaction only affects changes
+    made in the thread that entered it; other threads keep emitting as usual.
+
+    @see: C{L{AbstractValueObject.with_changes_frozen}}
+    """
+
+    __slots__ = ('__touched', '__original_values', '__owner')
+
+
+    def __init__(self):
+        self.__touched         = []
+        self.__original_values = {}
+        self.__owner           = False
+
+
+    def __enter__(self):
+        global _num_active_scopes
+
+        cdef _ThreadState state = _get_thread_state ()
+
+        if state.transaction is None:
+            state.transaction   = self
+            self.__owner        = True
+            _num_active_scopes += 1
+
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        if self.__owner:
+            self.__owner = False
+            self._commit ()
+
+        return False
+
+
+    cdef _record (self, AbstractValueObject value_object, new_value):
+        if value_object not in self.__original_values:
+            self.__original_values[value_object] = value_object._get_previous_value (new_value)
+            self.__touched.append (value_object)
+
+    cdef _note_original_value (self, AbstractValueObject value_object, value):
+        if value_object not in self.__original_values:
+            self.__original_values[value_object] = value
+            self.__touched.append (value_object)
+
+    cdef _commit (self):
+        global _num_active_scopes
+
+        cdef _ThreadState          state     = _get_thread_state ()
+        cdef _PropagationScheduler scheduler = state.scheduler
+
+        touched         = self.__touched
+        original_values = self.__original_values
+
+        state.transaction      = None
+        _num_active_scopes    -= 1
+        self.__touched         = []
+        self.__original_values = {}
+
+        # Hand everything to the scheduler, so that derived objects are processed in the
+        # same pass.  If a propagation is in progress already (transaction committed from
+        # a handler), it will pick the objects up.
+        for value_object in touched:
+            scheduler._schedule (value_object, original_values[value_object])
+
+        if not scheduler._active:
+            scheduler._run (None, None)
+
+
+    def __repr__(self):
+        return ('<%s.%s at 0x%x: %s>'
+                % (type (self).__module__, type (self).__name__, id (self),
+                   self.__owner and 'active' or 'inactive'))
+
+
+# Stands for a value that was not recorded.
+_UNKNOWN_VALUE = object ()
+
+
+cdef note_value_changing (AbstractValueObject value_object, old_value):
+    # For value objects that know their value before a change, e.g. tracking variables.
+    # Allows transactions and propagation to skip emission if the value is changed back.
+    cdef _ThreadState state
+
+    if _num_active_scopes == 0:
+        return
+
+    state = _get_thread_state ()
+
+    if state.transaction is not None:
+        state.transaction._note_original_value (value_object, old_value)
+    elif value_object._height and state.scheduler._active:
+        state.scheduler._schedule (value_object, old_value)
+
+
+
+# Reads are tracked per thread, in `_ThreadState.read_objects': a list of value objects
+# read since start_tracking_reads() or None if reads are not being tracked.  Used by
+# computed variables to discover their dependencies.  This counts threads that track
+# reads, so that get() doesn't need to look up its thread's state otherwise.
+cdef int _num_tracking_threads = 0
+
+
+cdef note_value_read (AbstractValueObject value_object):
+    # For value objects that return their value from get() without reading other objects.
+    cdef list read_objects
+
+    if _num_tracking_threads:
+        read_objects = _get_thread_state ().read_objects
+        if read_objects is not None:
+            read_objects.append (value_object)
+
+
+cdef list start_tracking_reads ():
+    # Returns the list to be passed to stop_tracking_reads() later, so that tracking can
+    # be nested.
+    global _num_tracking_threads
+
+    cdef _ThreadState state = _get_thread_state ()
+
+    outer_read_objects = state.read_objects
+    state.read_objects = []
+
+    if outer_read_objects is None:
+        _num_tracking_threads += 1
+
+    return outer_read_objects
+
+
+cdef list stop_tracking_reads (list outer_read_objects):
+    # Returns value objects read since the matching start_tracking_reads() call, each
+    # object only once, in order of first reading.
+    global _num_tracking_threads
+
+    cdef _ThreadState state        = _get_thread_state ()
+    cdef list         read_objects = state.read_objects
+    cdef list         unique       = []
+    cdef set          seen         = set ()
+
+    state.read_objects = outer_read_objects
+
+    if outer_read_objects is None:
+        _num_tracking_threads -= 1
+
+    for value_object in read_objects:
+        if id (value_object) not in seen:
+            seen.add (id (value_object))
+            unique.append (value_object)
+
+    return unique
+
+
+
+#-- Per-thread state --------------------------------------------------
+
+# Transactions and propagation only concern changes made in the thread that started them.
+# Otherwise, changes made concurrently in other threads would be recorded or scheduled and
+# then emitted from the wrong thread (or dropped if that thread's propagation fails.)
+# Likewise, reads made by other threads are not dependencies of a computed variable.
+
+# Only referenced from `_thread_local', so never part of a reference cycle.  Not being
+# tracked by the garbage collector also means a finished thread's state doesn't linger
+# in gc.get_objects() until the thread is fully cleaned up.
+@cython.no_gc
+cdef class _ThreadState (object):
+
+    __slots__ = ('transaction', 'scheduler', 'read_objects')
+
+
+    def __init__(self):
+        self.transaction  = None
+        self.scheduler    = _PropagationScheduler ()
+        self.read_objects = None
+
+
+_thread_local = threading.local ()
+
+
+cdef _ThreadState _get_thread_state ():
+    try:
+        return <_ThreadState> _thread_local.state
+    except AttributeError:
+        state = _thread_local.state = _ThreadState ()
+        return state
+
+# Create the state of the importing (normally main) thread right away.
+_get_thread_state ()
 
 
 
@@ -0,0 +1,27 @@
+cdef class Binding(object):
+	cdef object _object
+	cdef object _function
+	cdef object _class
+	cdef tuple _arguments
+	cdef object _keywords
+	cdef Py_hash_t _hash
+	cdef bint _hashable
+	
+	cpdef _get_object(self)
+	cpdef _get_function(self)
+	cpdef _get_class(self)
+	cpdef _get_arguments(self)
+	cpdef _get_keywords(self)
+	
+	cdef _invoke(self, tuple arguments, dict keywords)
+	cdef Py_hash_t _compute_hash(self) except? -1
+	
+	cdef str __to_string(self, class_name, strict)
+
+cdef class WeakBinding(Binding):
+	cdef object __callback
+	
+	cpdef _call_after_garbage_collecting(self)
+
+cdef class RaisingWeakBinding(WeakBinding):
+	pass
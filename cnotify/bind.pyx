@@ -70,6 +70,8 @@ import sys
 from types        import FunctionType, MethodType
 import weakref
 
+from cnotify._call cimport call_prefixed
+
 from cnotify.utils import is_callable, frozendict, DummyReference
 
 
@@ -88,7 +90,7 @@ _PY3K = (sys.version_info[0] >= 3)
 #
 # Conclusion: let's not use it at all.
 
-class Binding (object):
+cdef class Binding (object):
 
     """
     Bindings are a kind of callables with advanced comparing capabilities.  More
@@ -97,7 +99,8 @@ class Binding (object):
     callables and with equal argument lists, will be equal.
     """
 
-    __slots__ = ('_object', '_function', '_class', '_arguments', '_keywords')
+    __slots__ = ('_object', '_function', '_class', '_arguments', '_keywords',
+                 '_hash', '_hashable')
 
 
     def __init__(self, callable_object, arguments = (), keywords = None):
@@ -151,6 +154,15 @@ class Binding (object):
         self._arguments = arguments
         self._keywords  = keywords
 
+        # Bindings are looked up in signal handler lists and the like all the time, so the
+        # hash is computed only once.  Note that it is computed from fields, not getters,
+        # because weak bindings replace `_object' after this.
+        try:
+            self._hash     = self._compute_hash ()
+            self._hashable = True
+        except TypeError:
+            self._hashable = False
+
 
     def wrap (cls, callable_object, arguments = (), keywords = None):
         """
@@ -190,7 +202,7 @@ class Binding (object):
     wrap = classmethod (wrap)
 
 
-    def _get_object (self):
+    cpdef _get_object (self):
         """
         Return object associated with this binding.  This is the internal getter method
         for C{L{im_self}} property and outside code should use the property, not this
@@ -203,7 +215,7 @@ class Binding (object):
 
         return self._object
 
-    def _get_function (self):
+    cpdef _get_function (self):
         """
         Return raw function associated with this binding.  This is the internal getter
         method for C{L{im_func}} property and outside code should use the property, not
@@ -216,7 +228,7 @@ class Binding (object):
 
         return self._function
 
-    def _get_class (self):
+    cpdef _get_class (self):
         """
         Return the class associated with this binding.  This is the internal getter method
         for C{L{im_class}} property and outside code should use the property, not this
@@ -229,7 +241,7 @@ class Binding (object):
 
         return self._class
 
-    def _get_arguments (self):
+    cpdef _get_arguments (self):
         """
         Get the arguments of this binding.  This is the internal getter method for
         C{L{im_args}} property and outside code should use the property, not this method
@@ -242,7 +254,7 @@ class Binding (object):
 
         return self._arguments
 
-    def _get_keywords (self):
+    cpdef _get_keywords (self):
         return self._keywords
 
 
@@ -260,8 +272,12 @@ class Binding (object):
         @raises exception: whatever wrapped method raises, if anything.
         """
 
-        # NOTE: If, for some reason, you change this, don't forget to adjust
-        #       `WeakBinding.__call__' accordingly.
+        return self._invoke (arguments, keywords)
+
+
+    cdef _invoke (self, tuple arguments, dict keywords):
+        # Does the real work for __call__().  Signals call this directly for bindings of
+        # standard types.  Keyword arguments may be None.
         if keywords:
             fixed_keywords = self._get_keywords ()
             if fixed_keywords:
@@ -272,13 +288,14 @@ class Binding (object):
         else:
             all_keywords = self._get_keywords ()
 
+        # Arguments are passed to the function without intermediate tuples, using
+        # vectorcall protocol where available.
         if self._get_class () is not None:
-            return self._get_function () (self._get_object (),
-                                          *(self._get_arguments () + arguments),
-                                          **all_keywords)
+            return call_prefixed (self._get_function (), self._get_object (), True,
+                                  self._get_arguments (), arguments, all_keywords)
         else:
-            return self._get_function () (*(self._get_arguments () + arguments),
-                                          **all_keywords)
+            return call_prefixed (self._get_function (), None, False,
+                                  self._get_arguments (), arguments, all_keywords)
 
 
     def __eq__(self, other):
@@ -293,25 +310,34 @@ class Binding (object):
         if self is other:
             return True
 
-        if isinstance (other, BindingCompatibleTypes):
+        if isinstance (other, Binding):
+            # Most comparisons are between unequal bindings and cached hashes (nearly)
+            # always tell those apart without looking further.
+            if (    self._hashable
+                and (<Binding> other)._hashable
+                and self._hash != (<Binding> other)._hash):
+                return False
+
+            return (    self._get_object    () is other._get_object   ()
+                    and self._get_function  () is other._get_function ()
+                    and (_PY3K or self._get_class () is other._get_class ())
+                    and self._get_arguments () == other._get_arguments ()
+                    and self._get_keywords  () == other._get_keywords  ())
+
+        elif isinstance (other, MethodType):
+            if self._get_arguments () or self._get_keywords ():
+                return False
+
             if _PY3K:
-                if (self._get_object      () is not other.__self__
-                    or self._get_function () is not other.__func__):
-                    return False
-            else:
-                if (self._get_object      () is not other.im_self
-                    or self._get_function () is not other.im_func
-                    or self._get_class    () is not other.im_class):
-                    return False
-
-            if isinstance (other, Binding):
-                return (self    ._get_arguments () == other._get_arguments ()
-                        and self._get_keywords  () == other._get_keywords  ())
+                return (    self._get_object   () is other.__self__
+                        and self._get_function () is other.__func__)
             else:
-                return not self._get_arguments () and not self._get_keywords ()
+                return (    self._get_object   () is other.im_self
+                        and self._get_function () is other.im_func
+                        and self._get_class    () is other.im_class)
 
         elif isinstance (other, FunctionType):
-            return (self    ._get_function () is other
+            return (    self._get_function () is other
                     and self._get_object   () is None
                     and self._get_class    () is None
                     and not self._get_arguments ()
@@ -337,20 +363,28 @@ class Binding (object):
 
 
     def __hash__(self):
-        _class    = self._get_class     ()
-        object    = self._get_object    ()
-        arguments = self._get_arguments ()
-        keywords  = self._get_keywords  ()
+        if self._hashable:
+            return self._hash
+        else:
+            # Let it raise the real error.
+            return self._compute_hash ()
 
-        if _class is not None or object is not None:
-            _hash = hash (MethodType (self._get_function (), object, _class))
+    cdef Py_hash_t _compute_hash (self) except? -1:
+        # Must be the same as hash of an equal method or function.
+        cdef Py_hash_t _hash
+
+        if self._class is not None or self._object is not None:
+            if _PY3K:
+                _hash = hash (MethodType (self._function, self._object))
+            else:
+                _hash = hash (MethodType (self._function, self._object, self._class))
         else:
-            _hash = hash (self._get_function ())
+            _hash = hash (self._function)
 
-        if arguments:
-            _hash ^= hash (arguments)
-        if keywords:
-            _hash ^= hash (keywords)
+        if self._arguments:
+            _hash ^= hash (self._arguments)
+        if self._keywords:
+            _hash ^= hash (self._keywords)
 
         return _hash
 
@@ -367,10 +401,6 @@ class Binding (object):
 
         return True
 
-    if _PY3K:
-        __bool__ = __nonzero__
-        del __nonzero__
-
 
     im_self  = property (lambda self: self._get_object (),
                          doc = ("""
@@ -422,28 +452,23 @@ class Binding (object):
 
     im_kwds  = property (lambda self: self._get_keywords ())
 
-
-    if _PY3K:
-        __self__ = im_self
-        __func__ = im_func
-        __cls__  = im_class
-        __args__ = im_args
-        __kwds__ = im_kwds
-
-        del im_self
-        del im_func
-        del im_class
-        del im_args
-        del im_kwds
+    # Python 3 names.  Cython types cannot drop attributes conditionally, so both sets of
+    # names are always available.
+    __self__ = im_self
+    __func__ = im_func
+    __cls__  = im_class
+    __args__ = im_args
+    __kwds__ = im_kwds
 
 
     def __repr__(self):
-        return self.__to_string ('%s.%s' % (self.__module__, self.__class__.__name__), True)
+        return self.__to_string ('%s.%s' % (type (self).__module__, type (self).__name__),
+                                 True)
 
     def __str__(self):
         return self.__to_string (self.__class__.__name__, False)
 
-    def __to_string (self, class_name, strict):
+    cdef str __to_string (self, class_name, strict):
         if strict:
             formatter = repr
         else:
@@ -513,7 +538,7 @@ itself uses the variable several times in calls to C{isinstance} function.
 # (i.e. not for a method, or for a static method.)  None indicates that the binding was
 # created with an object, but it has been garbage-collected.
 
-class WeakBinding (Binding):
+cdef class WeakBinding (Binding):
 
     """
     A kind of L{binding <Binding>} which refers to its object weakly.  In other words,
@@ -533,7 +558,7 @@ class WeakBinding (Binding):
     @see:  RaisingWeakBinding
     """
 
-    __slots__ = ('__callback', '__hash')
+    __slots__ = ('__callback',)
 
 
     def __init__(self, callable_object, arguments = (), callback = None, keywords = None):
@@ -581,8 +606,6 @@ class WeakBinding (Binding):
         else:
             self._object = _NONE_REFERENCE
 
-        self.__hash = None
-
 
     def wrap (cls, callable_object, arguments = (), callback = None, keywords = None):
         # Inherit documentation somehow?
@@ -605,7 +628,7 @@ class WeakBinding (Binding):
     wrap = classmethod (wrap)
 
 
-    def _get_object (self):
+    cpdef _get_object (self):
         reference = self._object
 
         if reference is not None:
@@ -626,17 +649,17 @@ class WeakBinding (Binding):
         @raises exception: whatever wrapped method raises, if anything.
         """
 
-        reference = self._object
+        return self._invoke (arguments, keywords)
 
-        if reference is not None:
-            # FIXME: Resurrect 0.2 optimization of inlining super method once that is more
-            #        stable.  It is an _important_ optimization.
-            return super (WeakBinding, self).__call__(*arguments, **keywords)
+
+    cdef _invoke (self, tuple arguments, dict keywords):
+        if self._object is not None:
+            return Binding._invoke (self, arguments, keywords)
         else:
             return self._call_after_garbage_collecting ()
 
 
-    def _call_after_garbage_collecting (self):
+    cpdef _call_after_garbage_collecting (self):
         """
         Method called if the binding is called after its object has been
         garbage-collected.  Default implementation just returns C{None}.  Note that the
@@ -661,18 +684,6 @@ class WeakBinding (Binding):
             callback (reference)
 
 
-    def __hash__(self):
-        if self.__hash is None:
-            if self:
-                self.__hash = super (WeakBinding, self).__hash__()
-            else:
-                raise TypeError (("%s's object had been garbage-collected "
-                                  "before first call to __hash__()")
-                                 % self.__class__.__name__)
-
-        return self.__hash
-
-
     def __nonzero__(self):
         """
         C{True} if method’s object hasn’t been garbage-collected.  More precisely, C{True}
@@ -684,16 +695,12 @@ class WeakBinding (Binding):
 
         return self._object is not None
 
-    if _PY3K:
-        __bool__ = __nonzero__
-        del __nonzero__
-
 
 _NONE_REFERENCE = DummyReference (None)
 
 
 
-class RaisingWeakBinding (WeakBinding):
+cdef class RaisingWeakBinding (WeakBinding):
 
     """
     A variation of L{weak binding <WeakBinding>} which raises C{L{GarbageCollectedError}}
@@ -705,7 +712,7 @@ class RaisingWeakBinding (WeakBinding):
     __slots__    = ()
 
 
-    def _call_after_garbage_collecting (self):
+    cpdef _call_after_garbage_collecting (self):
         raise GarbageCollectedError
 
 
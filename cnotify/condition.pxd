@@ -2,5 +2,5 @@
 from cnotify.base cimport AbstractValueObject
 
 cdef class AbstractCondition(AbstractValueObject):
-	pass
+	cdef object _get_previous_value(AbstractCondition self, new_value)
 
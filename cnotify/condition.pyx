@@ -31,14 +31,16 @@ G{classtree AbstractCondition}
 
 __docformat__ = 'epytext en'
 __all__       = ('AbstractCondition', 'AbstractStateTrackingCondition',
-                 'Condition', 'PredicateCondition', 'WatcherCondition')
+                 'Condition', 'PredicateCondition', 'WatcherCondition',
+                 'all_of', 'any_of', 'at_least')
 
 
+import numbers
 import sys
 import weakref
 
 #from  cnotify.base   import AbstractValueObject
-from cnotify.base cimport AbstractValueObject
+from cnotify.base cimport AbstractValueObject, note_value_read, set_height_above
 from cnotify.gc     import AbstractGCProtector
 #from  cnotify.signal import CleanSignal
 from cnotify.signal cimport CleanSignal
@@ -83,6 +85,11 @@ cdef class AbstractCondition (AbstractValueObject):
                              """))
 
 
+    cdef object _get_previous_value (self, new_value):
+        # Conditions only have two states and report real changes only.
+        return not new_value
+
+
     def to_constant (state):
         """
         Return either C{L{TRUE}} or C{L{FALSE}}, depending on C{state} argument.  In other
@@ -311,6 +318,7 @@ class AbstractStateTrackingCondition (AbstractCondition):
         @rtype: C{bool}
         """
 
+        note_value_read (self)
         return self.__state
 
     def _set (self, value):
@@ -603,9 +611,11 @@ class WatcherCondition (AbstractStateTrackingCondition):
 
         if condition_to_watch is not None:
             self.__watched_condition = weakref.ref (condition_to_watch, self.__on_usage_change)
+            set_height_above (self, (condition_to_watch,))
             condition_to_watch.store (self._set)
         else:
             self.__watched_condition = None
+            set_height_above (self, ())
             self._set (False)
 
         if self._has_signal ():
@@ -800,6 +810,7 @@ class _Not (AbstractCondition):
         self.__state             = not negated_condition
         self.__negated_condition = weakref.ref (negated_condition, self.__on_usage_change)
 
+        set_height_above (self, (negated_condition,))
         negated_condition.changed.connect (self.__on_negated_condition_change)
 
 
@@ -868,6 +879,7 @@ class _Binary (AbstractCondition):
         self.__condition2 = weakref.ref (condition2, on_usage_change)
         self._term_state  = condition1.get () + 2 * condition2.get ()
 
+        set_height_above (self, (condition1, condition2))
         condition1.changed.connect (self._on_term1_change)
         condition2.changed.connect (self._on_term2_change)
 
@@ -1016,6 +1028,7 @@ class _IfElse (AbstractCondition):
         self.__else       = weakref.ref (_else, on_usage_change)
         self.__term_state = (_if.get () * 4 + _then.get () * 2 + _else.get ())
 
+        set_height_above (self, (_if, _then, _else))
         _if  .changed.connect (self.__on_if_term_change)
         _then.changed.connect (self.__on_then_term_change)
         _else.changed.connect (self.__on_else_term_change)
@@ -1099,8 +1112,262 @@ class _IfElse (AbstractCondition):
 
 
 
-_TRUE_REFERENCE  = DummyReference (AbstractCondition.TRUE)
-_FALSE_REFERENCE = DummyReference (AbstractCondition.FALSE)
+class _Counting (AbstractCondition):
+
+    # State is determined by the number of true terms compared with a threshold, so that
+    # any term change is handled in constant time, regardless of the number of terms.
+    # Each term is connected with its index, which is only needed to replace references
+    # to garbage-collected terms with constant ones.
+
+    __slots__ = ('__terms', '__term_states', '__num_alive', '__num_true', '__threshold')
+
+
+    def __init__(self, threshold, conditions):
+        super (_Counting, self).__init__()
+
+        on_usage_change    = self.__on_usage_change
+        self.__terms       = [weakref.ref (condition, on_usage_change)
+                              for condition in conditions]
+        self.__term_states = [condition.get () for condition in conditions]
+        self.__num_alive   = len (conditions)
+        self.__num_true    = self.__term_states.count (True)
+        self.__threshold   = threshold
+
+        set_height_above (self, conditions)
+
+        on_term_change = self.__on_term_change
+        for index, condition in enumerate (conditions):
+            condition.changed.connect (on_term_change, index)
+
+
+    def get (self):
+        return self.__num_true >= self.__threshold
+
+
+    def __on_term_change (self, index, new_state):
+        self.__term_states[index] = new_state
+
+        if new_state:
+            self.__num_true += 1
+            if self.__num_true == self.__threshold:
+                self._value_changed (True)
+        else:
+            self.__num_true -= 1
+            if self.__num_true == self.__threshold - 1:
+                self._value_changed (False)
+
+
+    def _create_signal (self):
+        if self.__num_alive > 0:
+            AbstractGCProtector.default.protect (self)
+
+        signal = CleanSignal (self)
+        return signal, weakref.ref (signal, self.__on_usage_change)
+
+
+    def __on_usage_change (self, object):
+        if self._remove_signal (object):
+            if self.__num_alive > 0:
+                AbstractGCProtector.default.unprotect (self)
+        else:
+            # Only happens when a term is garbage-collected, so linear search is fine.
+            index                = self.__terms.index (object)
+            self.__terms[index]  = _get_dummy_reference (self.__term_states[index])
+            self.__num_alive    -= 1
+
+            if self._has_signal () and self.__num_alive == 0:
+                AbstractGCProtector.default.unprotect (self)
+
+
+    def _get_operator_name (self):
+        raise_not_implemented_exception (self)
+
+    def __repr__(self):
+        return '<%s: %s (%s)>' % (self.get (), self._get_operator_name (),
+                                  ', '.join ([repr (term ()) for term in self.__terms]))
+
+    def __str__(self):
+        return '<%s: %s (%s)>' % (self.get (), self._get_operator_name (),
+                                  ', '.join ([str (term ()) for term in self.__terms]))
+
+
+
+class _AllOf (_Counting):
+
+    __slots__ = ()
+
+
+    def __init__(self, conditions):
+        super (_AllOf, self).__init__(len (conditions), conditions)
+
+
+    def _get_operator_name (self):
+        return 'all of'
+
+
+
+class _AnyOf (_Counting):
+
+    __slots__ = ()
+
+
+    def __init__(self, conditions):
+        super (_AnyOf, self).__init__(1, conditions)
+
+
+    def _get_operator_name (self):
+        return 'any of'
+
+
+
+class _AtLeast (_Counting):
+
+    __slots__ = ('__num_required',)
+
+
+    def __init__(self, num_required, conditions):
+        super (_AtLeast, self).__init__(num_required, conditions)
+        self.__num_required = num_required
+
+
+    def _get_operator_name (self):
+        return 'at least %d of' % self.__num_required
+
+
+
+def all_of (*conditions):
+    """
+    Return a condition, whose state is always logical ‘and’ function of all C{conditions}
+    states.  This is similar to C{condition1 & condition2 & ...}, but doesn’t create a
+    chain of intermediate conditions, and updating the state on a term change doesn’t
+    depend on the number of terms.
+
+    @note:
+    There is no guarantee on the returned object except as noted above about its state
+    and that it is an instance of C{AbstractCondition} or a subclass.  In particular, the
+    returned object may or may not be identical to an existing one.
+
+    @rtype:            C{AbstractCondition}
+
+    @raises TypeError: if any of C{conditions} is not an instance of C{AbstractCondition}.
+    """
+
+    terms = _get_counted_terms (conditions, _AC_TRUE, _AC_FALSE)
+
+    if terms is _AC_FALSE:
+        return terms
+    elif not terms:
+        return _AC_TRUE
+    elif len (terms) == 1:
+        return terms[0]
+    else:
+        return _AllOf (terms)
+
+
+def any_of (*conditions):
+    """
+    Return a condition, whose state is always logical ‘or’ function of all C{conditions}
+    states.  This is similar to C{condition1 | condition2 | ...}, but doesn’t create a
+    chain of intermediate conditions, and updating the state on a term change doesn’t
+    depend on the number of terms.
+
+    @note:
+    There is no guarantee on the returned object except as noted above about its state
+    and that it is an instance of C{AbstractCondition} or a subclass.  In particular, the
+    returned object may or may not be identical to an existing one.
+
+    @rtype:            C{AbstractCondition}
+
+    @raises TypeError: if any of C{conditions} is not an instance of C{AbstractCondition}.
+    """
+
+    terms = _get_counted_terms (conditions, _AC_FALSE, _AC_TRUE)
+
+    if terms is _AC_TRUE:
+        return terms
+    elif not terms:
+        return _AC_FALSE
+    elif len (terms) == 1:
+        return terms[0]
+    else:
+        return _AnyOf (terms)
+
+
+def at_least (num_required, conditions):
+    """
+    Return a condition, which is true as long as at least C{num_required} of
+    C{conditions} are true.  The state is updated in constant time on any term change and
+    ‘changed’ signal is only emitted when the number of true terms crosses the threshold.
+
+    As special cases, the returned condition is C{L{AbstractCondition.TRUE}} if
+    C{num_required} is not positive and C{L{AbstractCondition.FALSE}} if it exceeds the
+    number of conditions.
+
+    @note:
+    There is no guarantee on the returned object except as noted above about its state
+    and that it is an instance of C{AbstractCondition} or a subclass.  In particular, the
+    returned object may or may not be identical to an existing one.
+
+    @param num_required: minimal number of true conditions.
+    @type  num_required: C{int}
+
+    @param conditions:   conditions to count.
+    @type  conditions:   iterable
+
+    @rtype:              C{AbstractCondition}
+
+    @raises TypeError:   if C{num_required} is not an integer or any of C{conditions} is
+                         not an instance of C{AbstractCondition}.
+    """
+
+    if not isinstance (num_required, numbers.Integral):
+        raise TypeError ("'num_required' must be an integer")
+
+    terms = []
+
+    for condition in conditions:
+        if not isinstance (condition, AbstractCondition):
+            raise TypeError ("'%s' is not a condition" % (condition,))
+
+        if condition is _AC_TRUE:
+            num_required -= 1
+        elif condition is not _AC_FALSE:
+            terms.append (condition)
+
+    if num_required <= 0:
+        return _AC_TRUE
+    elif num_required > len (terms):
+        return _AC_FALSE
+    elif len (terms) == 1:
+        return terms[0]
+    elif num_required == len (terms):
+        return _AllOf (terms)
+    elif num_required == 1:
+        return _AnyOf (terms)
+    else:
+        return _AtLeast (num_required, terms)
+
+
+def _get_counted_terms (conditions, neutral, absorbing):
+    # Returns `absorbing' if it is among `conditions', else the list of conditions other
+    # than `neutral'.
+    terms = []
+
+    for condition in conditions:
+        if not isinstance (condition, AbstractCondition):
+            raise TypeError ("'%s' is not a condition" % (condition,))
+
+        if condition is absorbing:
+            return absorbing
+        elif condition is not neutral:
+            terms.append (condition)
+
+    return terms
+
+
+
+_TRUE_REFERENCE  = DummyReference (_AC_TRUE)
+_FALSE_REFERENCE = DummyReference (_AC_FALSE)
 
 
 
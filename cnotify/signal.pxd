@@ -1,6 +1,7 @@
 
 cdef class _AbstractAccumulator(object):
-	pass
+	cdef object _accumulate(self, accumulated_value, value_to_add)
+	cdef bint _should_continue(self, accumulated_value) except -1
 
 cdef class _AnyAcceptsAccumulator(_AbstractAccumulator):
 	pass
@@ -22,6 +23,8 @@ cdef class AbstractSignal(object):
 	
 	cdef do_connect(self, handler)
 	cdef int do_connect_safe(self, handler)
+	cdef _do_connect_with_id(self, handler)
+	cdef _do_connect_with_priority(self, handler, int priority, long connection_id)
 	
 	cdef int _get_emission_level(self)
 	cdef int _is_emission_stopped(self)
@@ -35,11 +38,115 @@ cdef class AbstractSignal(object):
 	cpdef str __to_string(self, strict)
 	
 
+cdef class _ConnectionIndex(object):
+	cdef list keys
+	cdef dict id_keys
+	cdef dict key_ids
+	cdef long next_id
+	cdef long next_sequence
+	cdef int num_tombstones
+	
+	cdef long reserve(self)
+	cdef object make_key(self, int priority)
+	cdef place(self, long connection_id, key)
+	cdef discard(self, Py_ssize_t index)
+	cdef Py_ssize_t find(self, long connection_id) except -2
+	cdef list compact(self, list handlers)
+
+cdef class _BlockedHandlers(object):
+	cdef dict counts
+	cdef list unhashable
+	cdef Py_ssize_t size
+	
+	cdef bint contains(self, handler) except -1
+	cdef add(self, handler)
+	cdef bint remove_one(self, handler) except -1
+	cdef remove_all(self, handler)
+
 cdef class Signal(AbstractSignal):
 	cdef list _handlers
-	cdef object _blocked_handlers
+	cdef object _lone_handler
+	cdef _BlockedHandlers _blocked_handlers
 	cdef object __accumulator
 	cdef int __emission_level
+	cdef _ConnectionIndex _connections
+	cdef list _deferred_handlers
+	
+	cdef bint _is_empty(self)
+	cdef list _materialize(self)
+	cdef _remove_lone_handler(self)
+	cdef _ConnectionIndex _index_connections(self)
+	cdef _insert_handler(self, handler, int priority, long connection_id)
+	cdef _remove_handler_at(self, Py_ssize_t index)
+	cdef _compact_handlers(self)
+	cdef _unblock_all(self, handler)
+	cdef _set_emission_level(self, int level)
+	cdef _call_handlers(self, list handlers, tuple arguments, dict keywords, accumulator, value, bint *might_have_garbage, Py_ssize_t start=*)
+	cdef _call_lone_handler(self, tuple arguments, dict keywords, accumulator, value, bint *might_have_garbage)
+	cdef _call_handlers_positional(self, list handlers, tuple arguments, bint *might_have_garbage)
 
 cdef class CleanSignal(Signal):
-	pass
+	cdef object __parent
+
+cdef class signal_property(object):
+	cdef object __accumulator
+	cdef bint __clean
+	cdef object __attribute
+	
+	cdef object __get_attribute(self, owner)
+
+cdef class ThreadSafeSignal(AbstractSignal):
+	cdef tuple _handlers
+	cdef _BlockedHandlers _blocked_handlers
+	cdef object __accumulator
+	cdef object __lock
+	cdef object __local
+	cdef dict _connections
+	cdef long __next_connection_id
+	
+	cdef bint __remove_handler(self, handler, bint identical) except -1
+	cdef __forget_handler(self, handler)
+	cdef __call_handlers(self, tuple handlers, tuple arguments, dict keywords, bint *might_have_garbage)
+
+cdef class ExecutorSignal(Signal):
+	cdef object __executor
+	
+	cdef list __submit(self, tuple arguments, dict keywords)
+	cdef __collect(self, list submitted)
+
+cdef class AsyncSignal(Signal):
+	cdef int __num_emissions
+	cdef long __num_stops
+	cdef int __num_stopped_emissions
+	
+	cdef int __get_handler_status(self, handler, long num_stops) except -1
+
+cdef class SignalFactory(object):
+	cdef dict _signals
+	cdef object _accumulator
+	cdef frozenset __names
+	cdef Signal __empty_signal
+	cdef long __next_connection_id
+	
+	cdef Signal _get_signal(self, name)
+	cdef _release_signal(self, name, Signal signal)
+	cdef Signal _get_empty_signal(self)
+
+cdef class _NamedSignal(AbstractSignal):
+	cdef SignalFactory _factory
+	cdef object _name
+	
+	cdef Signal __get_signal(self)
+
+cdef class _TopicNode(object):
+	cdef dict children
+	cdef Signal signal
+	cdef object pattern
+
+cdef class TopicSignalFactory(SignalFactory):
+	cdef _TopicNode __root
+	
+	cdef list _match(self, list segments)
+
+cdef class _TopicSignal(_NamedSignal):
+	cdef list __segments
@@ -88,9 +88,11 @@ Brief Comparison With GObject Signals
       - Py-cnotify signal handlers are not type-safe.  This is a result of native Pythonic
         implementation.  (PyGObject wraps C signals from U{GLib <http://gtk.org/>}.)
 
-      - There are no connection IDs, handlers can be disconnected only by passing the same
-        handler to C{L{disconnect <AbstractSignal.disconnect>}} method.  This is less
-        efficient, but easier to use.
+      - Connection IDs are optional.  Normally, handlers are disconnected by passing the
+        same handler to C{L{disconnect <AbstractSignal.disconnect>}} method.  This is
+        less efficient, but easier to use.  If you need to disconnect many handlers
+        quickly, connect them with C{L{connect_with_id <AbstractSignal.connect_with_id>}}
+        instead.
 
       - Py-cnotify signals are U{slower <http://home.gna.org/py-notify/benchmark.html>}.
         This may be important in time-critical code if you use signals heavily.
@@ -102,13 +104,20 @@ G{classtree AbstractSignal}
 """
 
 __docformat__ = 'epytext en'
-__all__       = ('AbstractSignal', 'Signal', 'CleanSignal')
+__all__       = ('AbstractSignal', 'Signal', 'CleanSignal', 'ThreadSafeSignal',
+                 'ExecutorSignal', 'AsyncSignal', 'SignalConnection', 'SignalFactory',
+                 'TopicSignalFactory', 'signal_property')
 
 
 import sys
+import threading
 import weakref
 
-from cnotify.bind  import Binding, WeakBinding
+from bisect    import bisect_left, bisect_right
+from functools import partial
+
+from cnotify._call cimport call_positional, PyFunction_Check, PyMethod_Check, PyCFunction_Check
+from cnotify.bind  cimport Binding, WeakBinding
 from cnotify.gc    import AbstractGCProtector
 from cnotify.utils import is_callable, raise_not_implemented_exception, DummyReference
 
@@ -201,6 +210,18 @@ cdef class _AbstractAccumulator (object):
         return accumulated_value
 
 
+    # C-level entry points used by signal emission.  For built-in accumulators they are
+    # overriden to avoid Python method dispatch for each handler.  Emission only calls
+    # them for instances of exactly built-in types (see _get_builtin_accumulator()),
+    # since Python subclasses can override only the Python-level methods.
+
+    cdef object _accumulate (self, accumulated_value, value_to_add):
+        return self.accumulate_value (accumulated_value, value_to_add)
+
+    cdef bint _should_continue (self, accumulated_value) except -1:
+        return self.should_continue (accumulated_value)
+
+
 cdef class _AnyAcceptsAccumulator (_AbstractAccumulator):
 
     """
@@ -225,6 +246,13 @@ cdef class _AnyAcceptsAccumulator (_AbstractAccumulator):
         return not accumulated_value
 
 
+    cdef object _accumulate (self, accumulated_value, value_to_add):
+        return value_to_add
+
+    cdef bint _should_continue (self, accumulated_value) except -1:
+        return not accumulated_value
+
+
 cdef class _AllAcceptAccumulator (_AbstractAccumulator):
 
     """
@@ -249,6 +277,13 @@ cdef class _AllAcceptAccumulator (_AbstractAccumulator):
         return accumulated_value
 
 
+    cdef object _accumulate (self, accumulated_value, value_to_add):
+        return value_to_add
+
+    cdef bint _should_continue (self, accumulated_value) except -1:
+        return bool (accumulated_value)
+
+
 cdef class _LastValueAccumulator (_AbstractAccumulator):
 
     """
@@ -263,6 +298,13 @@ cdef class _LastValueAccumulator (_AbstractAccumulator):
         return value_to_add
 
 
+    cdef object _accumulate (self, accumulated_value, value_to_add):
+        return value_to_add
+
+    cdef bint _should_continue (self, accumulated_value) except -1:
+        return True
+
+
 cdef class _ValueListAccumulator (_AbstractAccumulator):
 
     """
@@ -281,20 +323,42 @@ cdef class _ValueListAccumulator (_AbstractAccumulator):
         return accumulated_value
 
 
+    cdef object _accumulate (self, accumulated_value, value_to_add):
+        (<list> accumulated_value).append (value_to_add)
+        return accumulated_value
+
+    cdef bint _should_continue (self, accumulated_value) except -1:
+        return True
+
+
+cdef _AbstractAccumulator _get_builtin_accumulator (accumulator):
+    # Return `accumulator' if its C-level methods can be called directly, else None.
+    accumulator_type = type (accumulator)
+
+    if (   accumulator_type is _AnyAcceptsAccumulator
+        or accumulator_type is _AllAcceptAccumulator
+        or accumulator_type is _LastValueAccumulator
+        or accumulator_type is _ValueListAccumulator):
+        return accumulator
+    else:
+        return None
+
+
 cdef class AbstractSignal (object):
 
     """
     Abstract interface all signal classes must implement.
 
     @group Connecting Handlers:
-    is_connected, connect, connect_safe, do_connect, do_connect_safe, disconnect,
-    disconnect_all, connecting, connecting_safely
+    is_connected, connect, connect_safe, connect_with_id, connect_with_priority,
+    do_connect, do_connect_safe, disconnect, disconnect_all, disconnect_by_id,
+    connecting, connecting_safely
 
     @group Blocking Handlers:
     is_blocked, block, unblock, blocking
 
     @group Emission:
-    __call__, emit, stop_emission, emission_level, emission_stopped
+    __call__, emit, emit_many, stop_emission, emission_level, emission_stopped
 
     @group Handler List Maintenance:
     has_handlers, __nonzero__, count_handlers, collect_garbage
@@ -306,10 +370,11 @@ cdef class AbstractSignal (object):
     _get_emission_level, _is_emission_stopped, __to_string
 
     @sort:
-    is_connected, connect, connect_safe, do_connect, do_connect_safe, disconnect,
-    disconnect_all, connecting, connecting_safely,
+    is_connected, connect, connect_safe, connect_with_id, connect_with_priority,
+    do_connect, do_connect_safe, disconnect, disconnect_all, disconnect_by_id,
+    connecting, connecting_safely,
     is_blocked, block, unblock, blocking,
-    __call__, emit, stop_emission, emission_level, emission_stopped,
+    __call__, emit, emit_many, stop_emission, emission_level, emission_stopped,
     has_handlers, __nonzero__, count_handlers, collect_garbage,
     _wrap_handler, _additional_description
     """
@@ -444,6 +509,48 @@ cdef class AbstractSignal (object):
         else:
             return False
 
+    def connect_with_id (self, handler, *arguments, **keywords):
+        """
+        Connect C{handler} with C{arguments} to the signal and return a handle of the new
+        connection.  Apart from the return value, this method behaves identically to
+        C{L{connect}}.
+
+        The returned C{L{SignalConnection}} can be used to cancel exactly this connection
+        later, either by calling its C{L{disconnect <SignalConnection.disconnect>}}
+        method or by passing its C{L{id <SignalConnection.id>}} to
+        C{L{disconnect_by_id}}.  Unlike C{L{disconnect}}, this doesn’t involve comparing
+        handlers, so it takes constant time regardless of the number of connected
+        handlers.
+
+        @rtype: C{L{SignalConnection}}
+        """
+
+        return self._do_connect_with_id (self._wrap_handler (handler, *arguments, **keywords))
+
+    def connect_with_priority (self, priority, handler, *arguments, **keywords):
+        """
+        Connect C{handler} with C{arguments} to the signal so that it is called before
+        all handlers with lower C{priority}.  Handlers with equal priority are called in
+        the order of connection; handlers connected with C{L{connect}} have priority 0.
+        Otherwise this method behaves identically to C{L{connect}}.
+
+        Running important handlers first is mostly useful with accumulators that can stop
+        emission early, like C{L{ANY_ACCEPTS}}: the less important handlers are then
+        often not called at all.
+
+        Priority is a separate argument rather than a keyword of C{L{connect}}, since all
+        keywords of that method are passed to the handler.
+
+        @param  priority: integer priority of the handler; the higher, the earlier it is
+                          called.
+        @type   priority: C{int}
+
+        @raises NotImplementedError: if the signal class doesn’t support priorities.
+        """
+
+        self._do_connect_with_priority (self._wrap_handler (handler, *arguments, **keywords),
+                                        priority, 0)
+
 
     def _wrap_handler (self, handler, *arguments, **keywords):
         """
@@ -497,6 +604,26 @@ cdef class AbstractSignal (object):
         else:
             return False
 
+    cdef _do_connect_with_id (self, handler):
+        """
+        Connect C{handler} to the signal without any further modifications and return a
+        C{L{SignalConnection}} for it.  See C{L{connect_with_id}} method for details.
+
+        @rtype: C{L{SignalConnection}}
+        """
+
+        raise_not_implemented_exception (self)
+
+    cdef _do_connect_with_priority (self, handler, int priority, long connection_id):
+        """
+        Connect C{handler} with given C{priority} to the signal without any further
+        modifications.  See C{L{connect_with_priority}} method for details.  Nonzero
+        C{connection_id} is a L{reserved <_ConnectionIndex.reserve>} identifier the new
+        connection should be registered under.
+        """
+
+        raise_not_implemented_exception (self)
+
 
     def disconnect (self, handler, *arguments, **keywords):
         """
@@ -545,6 +672,27 @@ cdef class AbstractSignal (object):
         else:
             return False
 
+    def disconnect_by_id (self, connection_id):
+        """
+        Cancel the connection with given C{connection_id}, as made by
+        C{L{connect_with_id}}.  Other connections of equal handlers, if any, are not
+        affected.  Note that disconnecting by identifier is also possible during
+        emission, with the same effect as calling C{L{disconnect}}.
+
+        Usually, it is more convenient to call C{L{disconnect <SignalConnection.disconnect>}}
+        method of the connection handle instead.
+
+        @param  connection_id: value of C{L{SignalConnection.id}} property.
+        @type   connection_id: C{int}
+
+        @rtype:                C{bool}
+        @returns:              C{True} if the connection has been cancelled; C{False} if
+                               it had been cancelled already (including the case of
+                               garbage-collected handler) or the identifier is unknown.
+        """
+
+        raise_not_implemented_exception (self)
+
 
     def block (self, handler, *arguments, **keywords):
         """
@@ -569,13 +717,13 @@ cdef class AbstractSignal (object):
         """
         Unblock a C{handler} with C{arguments}.  If the C{handler} is not connected or is
         not blocked, do nothing and return C{False}.  Else decrement its ‘block counter’
-        and return C{True} only if it becomes non-blocked as a result.  Note that handlers
-        must be unblocked exactly the same number of times as blocked, to become
-        non-blocked again.
+        and return C{True}.  Note that handlers must be unblocked exactly the same number
+        of times as blocked, to become non-blocked again; use C{L{is_blocked}} to find out
+        if the handler is still blocked.
 
         @rtype:   C{bool}
-        @returns: C{True} if C{handler} becomes non-blocked; C{False} if it is not even
-                  connected or still remains blocked.
+        @returns: C{True} if C{handler}’s block counter has been decremented; C{False} if it
+                  is not even connected or not blocked.
         """
 
         raise_not_implemented_exception (self)
@@ -600,6 +748,24 @@ cdef class AbstractSignal (object):
 
         raise_not_implemented_exception (self)
 
+    def emit_many (self, argument_tuples):
+        """
+        Emit the signal once for each tuple of arguments in C{argument_tuples}.  This is
+        semantically equivalent to calling C{L{emit}} in a loop, but can be more efficient
+        for derived classes.  In particular, C{L{stop_emission}} only stops emission for
+        the current item, not the whole batch.
+
+        Default implementation just calls C{emit} repeatedly.
+
+        @param argument_tuples: iterable of argument sequences, one per emission.
+
+        @rtype:   C{list} or C{None}
+        @returns: List of values C{emit} returned for each item.  Standard signals
+                  return C{None} instead if they have no accumulator.
+        """
+
+        return [self.emit (*arguments) for arguments in argument_tuples]
+
     def __call__(self, *arguments, **keywords):
         """
         Same as C{L{emit}} method.
@@ -669,41 +835,40 @@ cdef class AbstractSignal (object):
         pass
 
 
-    emission_level   = property (lambda self: self._get_emission_level (),
-                                 doc = ("""
-                                 The number of unfinished calls to C{L{emit}} method of
-                                 this signal.  For instance, if this signal hasn’t been
-                                 emitted at all, the return value will be 0.  If called
-                                 from a handler, return value will be at least 1—more if
-                                 in recursive emission.
+    property emission_level:
+        """
+        The number of unfinished calls to C{L{emit}} method of this signal.  For instance,
+        if this signal hasn’t been emitted at all, the return value will be 0.  If called
+        from a handler, return value will be at least 1—more if in recursive emission.
 
-                                 Note that stopping an emission doesn’t cause emission
-                                 level to change instantly.  Even though the latest
-                                 emission will not invoke handlers anymore, it is still
-                                 considered ‘in progress’ until the call to C{L{emit}}
-                                 returns.
+        Note that stopping an emission doesn’t cause emission level to change instantly.
+        Even though the latest emission will not invoke handlers anymore, it is still
+        considered ‘in progress’ until the call to C{L{emit}} returns.
 
-                                 @type: int
-                                 """))
+        @type: int
+        """
 
-    emission_stopped = property (lambda self: self._is_emission_stopped (),
-                                 doc = ("""
-                                 Flag indicating if the latest emission in progress has
-                                 been stopped with C{L{stop_emission}} method.  In
-                                 particular, it is C{False} if (but not only if) the
-                                 signal is not being emitted at all.
+        def __get__(self):
+            return self._get_emission_level ()
 
-                                 Note that this property only considers I{the latest}
-                                 emission.  For instance, immediately after a call to
-                                 C{stop_emission} it is C{True}, but if you start another
-                                 one—letting or not the stopped to finish—it will become
-                                 C{False}.  In other words, C{False} doesn’t mean there is
-                                 no stopped emission in progress, it only means that the
-                                 latest emission is not stopped, or the signal is not
-                                 being emitted at all.
+    property emission_stopped:
+        """
+        Flag indicating if the latest emission in progress has been stopped with
+        C{L{stop_emission}} method.  In particular, it is C{False} if (but not only if)
+        the signal is not being emitted at all.
+
+        Note that this property only considers I{the latest} emission.  For instance,
+        immediately after a call to C{stop_emission} it is C{True}, but if you start
+        another one—letting or not the stopped to finish—it will become C{False}.  In
+        other words, C{False} doesn’t mean there is no stopped emission in progress, it
+        only means that the latest emission is not stopped, or the signal is not being
+        emitted at all.
+
+        @type: bool
+        """
 
-                                 @type: bool
-                                 """))
+        def __get__(self):
+            return bool (self._is_emission_stopped ())
 
 
     if sys.version_info[:3] >= (2, 5):
@@ -903,6 +1068,203 @@ cdef class AbstractSignal (object):
 #AbstractSignal.VALUE_LIST = ValueListAccumulator()
 
 
+#-- Connection handles -----------------------------------------------
+
+class SignalConnection (object):
+
+    """
+    A handle for a handler connected with C{L{AbstractSignal.connect_with_id}}.  The
+    handle only stores the signal and connection identifier, so keeping it around doesn’t
+    prevent anything from being garbage-collected except the signal itself.
+    """
+
+    __slots__ = ('__signal', '__id')
+
+
+    def __init__(self, signal, connection_id):
+        self.__signal = signal
+        self.__id     = connection_id
+
+
+    signal = property (lambda self: self.__signal,
+                       doc = ("""
+                       The signal the handler is (or was) connected to.
+
+                       @type: AbstractSignal
+                       """))
+
+    id = property (lambda self: self.__id,
+                   doc = ("""
+                   Connection identifier, as accepted by
+                   C{L{AbstractSignal.disconnect_by_id}}.  Identifiers are unique for
+                   one signal only.
+
+                   @type: int
+                   """))
+
+
+    def disconnect (self):
+        """
+        Disconnect the handler this object stands for.  Same as calling
+        C{L{disconnect_by_id <AbstractSignal.disconnect_by_id>}} on the signal.
+
+        @rtype:   C{bool}
+        @returns: Whether the handler was still connected.
+        """
+
+        return self.__signal.disconnect_by_id (self.__id)
+
+
+    def __repr__(self):
+        return '<%s.%s %d of %r>' % (self.__module__, self.__class__.__name__,
+                                     self.__id, self.__signal)
+
+
+
+cdef class _ConnectionIndex (object):
+
+    # Keeps a sort key for each handler in signal's `_handlers' list, in a parallel
+    # `keys' list.  A key combines negated priority with insertion sequence number, so
+    # the list is sorted in ascending order and bisect_right() of a new key finds the
+    # position after all handlers with the same priority.  Keys never change, so
+    # connection identifiers are mapped to keys rather than to list positions and
+    # inserting or deleting handlers doesn't renumber anything.  Handlers without an
+    # identifier are simply not present in the mappings.
+
+    def __init__(self, Py_ssize_t num_handlers = 0):
+        # Handlers connected before the index was needed all get priority 0.
+        self.keys           = list (range (num_handlers))
+        self.id_keys        = {}
+        self.key_ids        = {}
+        self.next_id        = 1
+        self.next_sequence  = num_handlers
+        self.num_tombstones = 0
+
+
+    cdef long reserve (self):
+        # Allocate an identifier for a connection whose handler is not inserted yet.
+        cdef long connection_id = self.next_id
+
+        self.next_id += 1
+        return connection_id
+
+    cdef object make_key (self, int priority):
+        key = -priority * _KEY_SEQUENCE_SPAN + self.next_sequence
+
+        self.next_sequence += 1
+        return key
+
+    cdef place (self, long connection_id, key):
+        self.id_keys[connection_id] = key
+        self.key_ids[key]           = connection_id
+
+    cdef discard (self, Py_ssize_t index):
+        connection_id = self.key_ids.pop (self.keys[index], None)
+        if connection_id is not None:
+            del self.id_keys[connection_id]
+
+    cdef Py_ssize_t find (self, long connection_id) except -2:
+        # Forget the identifier and return position of its handler, or -1 if it is not
+        # (yet) in the list.
+        key = self.id_keys.pop (connection_id, None)
+        if key is None:
+            return -1
+
+        del self.key_ids[key]
+        return bisect_left (self.keys, key)
+
+    cdef list compact (self, list handlers):
+        # Sort keys are compacted in step with `handlers'.
+        cdef Py_ssize_t index
+        cdef list       compacted = []
+        cdef list       keys      = self.keys
+        cdef list       kept_keys = []
+
+        for index, handler in enumerate (handlers):
+            if handler is not None and (not isinstance (handler, WeakBinding) or handler):
+                compacted.append (handler)
+                kept_keys.append (keys[index])
+            else:
+                connection_id = self.key_ids.pop (keys[index], None)
+                if connection_id is not None:
+                    del self.id_keys[connection_id]
+
+        self.keys           = kept_keys
+        self.num_tombstones = 0
+
+        return compacted
+
+
+# Larger than any realistic number of connections made to one signal, so that keys of
+# handlers with different priorities never interleave.
+_KEY_SEQUENCE_SPAN = 1 << 40
+
+
+cdef bint _is_alive (handler) except -1:
+    # Whether `handler' can still be called, i.e. is not a weak binding to a
+    # garbage-collected object.
+    return not isinstance (handler, WeakBinding) or bool (handler)
+
+
+
+cdef class _BlockedHandlers (object):
+
+    # Block counts of a signal's handlers.  Hashable handlers (practically all) are looked
+    # up in a dictionary.  Unhashable ones, e.g. bindings with keyword arguments, are kept
+    # in a list, one item per block, since there is nothing better to do for them.
+
+    def __init__(self):
+        self.counts     = {}
+        self.unhashable = None
+        self.size       = 0
+
+
+    cdef bint contains (self, handler) except -1:
+        try:
+            return handler in self.counts
+        except TypeError:
+            return self.unhashable is not None and handler in self.unhashable
+
+    cdef add (self, handler):
+        try:
+            self.counts[handler] = self.counts.get (handler, 0) + 1
+        except TypeError:
+            if self.unhashable is None:
+                self.unhashable = []
+
+            self.unhashable.append (handler)
+
+        self.size += 1
+
+    cdef bint remove_one (self, handler) except -1:
+        try:
+            count = self.counts.pop (handler, None)
+        except TypeError:
+            if self.unhashable is None or handler not in self.unhashable:
+                return False
+
+            self.unhashable.remove (handler)
+        else:
+            if count is None:
+                return False
+            if count > 1:
+                self.counts[handler] = count - 1
+
+        self.size -= 1
+        return True
+
+    cdef remove_all (self, handler):
+        try:
+            self.size -= self.counts.pop (handler, 0)
+        except TypeError:
+            if self.unhashable is not None:
+                unhashable      = [_handler for _handler in self.unhashable
+                                   if _handler != handler]
+                self.size      -= len (self.unhashable) - len (unhashable)
+                self.unhashable = unhashable
+
+
+
 #-- Standard signal classes ------------------------------------------
 
 cdef class Signal (AbstractSignal):
@@ -918,7 +1280,8 @@ cdef class Signal (AbstractSignal):
     interested in C{L{CleanSignal}}.
     """
 
-    __slots__ = ('_handlers', '_blocked_handlers', '__accumulator', '__emission_level')
+    __slots__ = ('_handlers', '_lone_handler', '_blocked_handlers', '__accumulator',
+                 '__emission_level', '_connections', '_deferred_handlers')
 
     def __init__(self, accumulator = None):
         """
@@ -938,24 +1301,38 @@ cdef class Signal (AbstractSignal):
 
         super (Signal, self).__init__()
 
-        self._handlers         = None
-        self._blocked_handlers = _EMPTY_TUPLE
-        self.__accumulator     = accumulator
-        self.__emission_level  = 0
+        self._handlers          = None
+        self._lone_handler      = None
+        self._blocked_handlers  = None
+        self.__accumulator      = accumulator
+        self.__emission_level   = 0
+        self._connections       = None
+        self._deferred_handlers = None
 
 
-    accumulator = property (lambda self: self.__accumulator,
-                            doc = ("""
-                            The L{accumulator <AbstractAccumulator>} this signal was
-                            created with or C{None}.  Accumulator cannot be changed, it
-                            can only be specified at signal creation time.
+    property accumulator:
+        """
+        The L{accumulator <AbstractAccumulator>} this signal was created with or C{None}.
+        Accumulator cannot be changed, it can only be specified at signal creation time.
+
+        @type: AbstractAccumulator
+        """
+
+        def __get__(self):
+            return self.__accumulator
 
-                            @type: AbstractAccumulator
-                            """))
 
+    # Implementation note: most signals have zero or one handler.  A lone handler is
+    # stored in `_lone_handler' while `_handlers' is None; the list is only created when
+    # a second handler is connected.  Less common operations (connection identifiers,
+    # priorities) first convert the signal to list storage with _materialize().
 
     cpdef int has_handlers (self):
         if self._handlers is None:
+            handler = self._lone_handler
+            if handler is not None and (not isinstance (handler, WeakBinding) or handler):
+                return True
+
             return False
 
         for handler in self._handlers:
@@ -972,51 +1349,191 @@ cdef class Signal (AbstractSignal):
                 if handler is not None and (not isinstance (handler, WeakBinding) or handler):
                     num_handlers += 1
 
+        elif self._lone_handler is not None:
+            handler = self._lone_handler
+            if not isinstance (handler, WeakBinding) or handler:
+                num_handlers = 1
+
         return num_handlers
 
 
     def is_connected (self, handler, *arguments, **keywords):
-        if self._handlers is not None and is_callable (handler):
-            if arguments or keywords:
-                handler = Binding (handler, arguments, keywords)
+        if self._is_empty () or not is_callable (handler):
+            return False
 
-            return handler in self._handlers
+        if arguments or keywords:
+            handler = Binding (handler, arguments, keywords)
 
+        if self._handlers is not None:
+            return handler in self._handlers
         else:
-            return False
+            return self._lone_handler == handler
 
 
     def is_blocked (self, handler, *arguments, **keywords):
-        if self._blocked_handlers is not _EMPTY_TUPLE and is_callable (handler):
+        if self._blocked_handlers is not None and is_callable (handler):
             if arguments or keywords:
                 handler = Binding (handler, arguments, keywords)
 
-            return handler in self._blocked_handlers
+            return self._blocked_handlers.contains (handler)
 
         else:
             return False
 
 
     cdef do_connect (self, handler):
-        if self._handlers is not None:
+        if self._connections is not None:
+            self._insert_handler (handler, 0, 0)
+        elif self._handlers is not None:
             self._handlers.append (handler)
+        elif self._lone_handler is not None:
+            self._handlers     = [self._lone_handler, handler]
+            self._lone_handler = None
+        else:
+            self._lone_handler = handler
+
+    cdef _do_connect_with_id (self, handler):
+        cdef long connection_id = self._index_connections ().reserve ()
+
+        self._insert_handler (handler, 0, connection_id)
+        return SignalConnection (self, connection_id)
+
+    cdef _do_connect_with_priority (self, handler, int priority, long connection_id):
+        self._index_connections ()
+        self._insert_handler (handler, priority, connection_id)
+
+
+    cdef _insert_handler (self, handler, int priority, long connection_id):
+        cdef list             handlers    = self._handlers
+        cdef _ConnectionIndex connections = self._connections
+        cdef Py_ssize_t       index
+
+        if handlers is None:
+            handlers = self._handlers = []
+
+        key   = connections.make_key (priority)
+        index = bisect_right (connections.keys, key)
+
+        if index == len (handlers):
+            handlers.append (handler)
+            connections.keys.append (key)
+
+        elif self.__emission_level == 0:
+            handlers.insert (index, handler)
+            connections.keys.insert (index, key)
+
+        else:
+            # Inserting would shift handlers under the running emission loop, so this
+            # is postponed until the emission is over.  See _compact_handlers().
+            if self._deferred_handlers is None:
+                self._deferred_handlers = []
+
+            self._deferred_handlers.append ((handler, priority, connection_id))
+            return
+
+        if connection_id != 0:
+            connections.place (connection_id, key)
+
+
+    cdef bint _is_empty (self):
+        return self._handlers is None and self._lone_handler is None
+
+    cdef list _materialize (self):
+        # Switch from inline storage of a lone handler to the list.  The lone handler
+        # stays first, which emission of it relies on.
+        if self._lone_handler is not None:
+            self._handlers     = [self._lone_handler]
+            self._lone_handler = None
+
+        return self._handlers
+
+    cdef _remove_lone_handler (self):
+        # If the lone handler is being emitted, leave a tombstone instead, so that
+        # emission can tell handlers connected meanwhile from it.
+        if self.__emission_level == 0:
+            self._lone_handler = None
         else:
-            self._handlers = [handler]
+            self._handlers     = [None]
+            self._lone_handler = None
+
+    cdef _ConnectionIndex _index_connections (self):
+        # Identifiers and priorities are only tracked once they are used, so that signals
+        # with plain connections don't pay for them.  From then on, all handlers are kept
+        # in the list, each with its sort key.
+        if self._connections is None:
+            handlers          = self._materialize ()
+            self._connections = _ConnectionIndex (len (handlers) if handlers is not None else 0)
+
+        return self._connections
 
 
     # Implementation note: we set disconnected (or garbage-collected) handlers to None,
     # instead of removing them right away.  This is done to prevent spoiling
     # disconnections made when emission is in effect.
 
+    cdef _remove_handler_at (self, Py_ssize_t index):
+        cdef _ConnectionIndex connections = self._connections
+
+        if connections is not None:
+            connections.discard (index)
+
+        if self.__emission_level == 0:
+            del self._handlers[index]
+            if connections is not None:
+                del connections.keys[index]
+        else:
+            self._handlers[index] = None
+
+    cdef _compact_handlers (self):
+        # Unlike collect_garbage(), this doesn't check emission level and is never
+        # overriden, so it is safe to call from other methods of this class.
+        if self._connections is not None:
+            if self._handlers is not None:
+                self._handlers = self._connections.compact (self._handlers)
+
+            if self._deferred_handlers is not None:
+                deferred_handlers       = self._deferred_handlers
+                self._deferred_handlers = None
+
+                for handler, priority, connection_id in deferred_handlers:
+                    self._insert_handler (handler, priority, connection_id)
+
+            if not self._handlers:
+                self._handlers = None
+
+        elif self._handlers is not None:
+            handlers = [handler for handler in self._handlers
+                        if handler is not None and (not isinstance (handler, WeakBinding)
+                                                    or handler)]
+
+            if len (handlers) > 1:
+                self._handlers = handlers
+            else:
+                self._handlers     = None
+                self._lone_handler = handlers[0] if handlers else None
+
+        elif isinstance (self._lone_handler, WeakBinding) and not self._lone_handler:
+            self._lone_handler = None
+
 
     def disconnect (self, handler, *arguments, **keywords):
-        handlers = self._handlers
-        if handlers is None or not is_callable (handler):
+        if self._is_empty () or not is_callable (handler):
             return False
 
         if arguments or keywords:
             handler = Binding (handler, arguments, keywords)
 
+        handlers = self._handlers
+        if handlers is None:
+            if self._lone_handler != handler:
+                return False
+
+            self._remove_lone_handler ()
+            if self._blocked_handlers is not None:
+                self._unblock_all (handler)
+
+            return True
+
         # Note: we must disconnect _last_ of equal connected handlers, in order to make
         # connect()/disconnect() a no-op.  We use a custom loop because of that (and since
         # reversed() only appeared in 2.4.)
@@ -1026,20 +1543,13 @@ cdef class Signal (AbstractSignal):
             if handlers[index] != handler:
                 index -= 1
             else:
-                if self.__emission_level == 0:
-                    del handlers[index]
-                else:
-                    handlers[index] = None
+                self._remove_handler_at (index)
 
-                if (    self._blocked_handlers is not _EMPTY_TUPLE
+                if (    self._blocked_handlers is not None
                     and handler not in handlers[:index]):
                     # This is the last handler, need to make sure it is not listed in
                     # `_blocked_handlers'.
-                    self._blocked_handlers = [_handler for _handler in self._blocked_handlers
-                                              if _handler != handler]
-
-                    if not self._blocked_handlers:
-                        self._blocked_handlers = _EMPTY_TUPLE
+                    self._unblock_all (handler)
 
                 if not handlers:
                     self._handlers = None
@@ -1052,13 +1562,18 @@ cdef class Signal (AbstractSignal):
     # Overriden for efficiency.
 
     def disconnect_all (self, handler, *arguments, **keywords):
-        if self._handlers is None or not is_callable (handler):
+        if self._is_empty () or not is_callable (handler):
             return False
 
         if arguments or keywords:
             handler = Binding (handler, arguments, keywords)
 
-        if self.__emission_level == 0:
+        if self._handlers is None:
+            any_removed = (self._lone_handler == handler)
+            if any_removed:
+                self._remove_lone_handler ()
+
+        elif self.__emission_level == 0 and self._connections is None:
             old_length     = len (self._handlers)
             self._handlers = [_handler for _handler in self._handlers if _handler != handler]
             any_removed    = (len (self._handlers) != old_length)
@@ -1074,112 +1589,131 @@ cdef class Signal (AbstractSignal):
                     self._handlers[index] = None
                     any_removed           = True
 
-        if any_removed and self._blocked_handlers is not _EMPTY_TUPLE:
-            self._blocked_handlers = [_handler for _handler in self._blocked_handlers
-                                      if _handler != handler]
+                    if self._connections is not None:
+                        self._connections.discard (index)
 
-            if not self._blocked_handlers:
-                self._blocked_handlers = _EMPTY_TUPLE
+            if any_removed and self.__emission_level == 0:
+                self._compact_handlers ()
+
+        if any_removed and self._blocked_handlers is not None:
+            self._unblock_all (handler)
 
         return any_removed
 
 
-    # Note: we rely on the way remove() works to fulfill our blocking obligations.
+    def disconnect_by_id (self, connection_id):
+        cdef _ConnectionIndex connections = self._connections
+        if connections is None:
+            return False
+
+        index = connections.find (connection_id)
+        if index < 0:
+            # The connection may still be waiting for an emission to finish.
+            if self._deferred_handlers is not None:
+                for index, deferred in enumerate (self._deferred_handlers):
+                    if deferred[2] == connection_id:
+                        del self._deferred_handlers[index]
+                        return _is_alive (deferred[0])
+
+            return False
+
+        handlers        = self._handlers
+        handler         = handlers[index]
+        handlers[index] = None
+
+        # Only a blocked handler needs to know whether an equal one is still connected,
+        # so the common case never scans the list.
+        if (    self._blocked_handlers is not None
+            and handler is not None
+            and self._blocked_handlers.contains (handler)
+            and handler not in handlers):
+            self._unblock_all (handler)
+
+        # Removed handlers are only marked, so the list is compacted once they make up
+        # half of it.  This keeps the cost of disconnection amortized constant.
+        connections.num_tombstones += 1
+        if self.__emission_level == 0 and 2 * connections.num_tombstones >= len (handlers):
+            self._compact_handlers ()
+
+        # A garbage-collected handler is merely waiting to be collected, so there was no
+        # connection to cancel.
+        return handler is not None and _is_alive (handler)
+
+
+    # Note: blocked handlers are counted, so that each block() call must be matched by an
+    # unblock() one before the handler is called again.
 
 
     def block (self, handler, *arguments, **keywords):
-        if is_callable (handler) and self._handlers is not None:
+        if is_callable (handler) and not self._is_empty ():
             if arguments or keywords:
                 handler = Binding (handler, arguments, keywords)
 
-            if handler in self._handlers:
-                if self._blocked_handlers is not _EMPTY_TUPLE:
-                    self._blocked_handlers.append (handler)
-                else:
-                    self._blocked_handlers = [handler]
+            if (handler in self._handlers if self._handlers is not None
+                else self._lone_handler == handler):
+                if self._blocked_handlers is None:
+                    self._blocked_handlers = _BlockedHandlers ()
 
+                self._blocked_handlers.add (handler)
                 return True
 
         return False
 
 
     def unblock (self, handler, *arguments, **keywords):
-        if self._blocked_handlers is _EMPTY_TUPLE or not is_callable (handler):
+        if self._blocked_handlers is None or not is_callable (handler):
             return False
 
         if arguments or keywords:
             handler = Binding (handler, arguments, keywords)
 
-        try:
-            self._blocked_handlers.remove (handler)
-
-            if not self._blocked_handlers:
-                self._blocked_handlers = _EMPTY_TUPLE
+        if self._blocked_handlers.remove_one (handler):
+            if self._blocked_handlers.size == 0:
+                self._blocked_handlers = None
 
             return True
 
-        except ValueError:
+        else:
             # It is not blocked to begin with.
             return False
 
 
+    cdef _unblock_all (self, handler):
+        self._blocked_handlers.remove_all (handler)
+        if self._blocked_handlers.size == 0:
+            self._blocked_handlers = None
+
+
     def emit (self, *arguments, **keywords):
+        cdef bint might_have_garbage = False
+
         # Speed optimization.
         handlers    = self._handlers
         accumulator = self.__accumulator
+        value       = None
 
         if accumulator is not None:
             value = accumulator.get_initial_value ()
 
-        if handlers is not None:
-            try:
-                saved_emission_level  = self.__emission_level
-                self.__emission_level = abs (saved_emission_level) + 1
-                might_have_garbage    = False
-
-                for handler in handlers:
-                    # Disconnected while in emission handlers are temporary set to None.
-                    if handler is None:
-                        might_have_garbage = True
-                        continue
-
-                    if self.__emission_level < 0:
-                        might_have_garbage = True
-                        break
-
-                    # We need to refetch that blocked handlers list before processing each
-                    # handler, because it may change during emission.
-                    if handler in self._blocked_handlers:
-                        continue
+        if handlers is not None or self._lone_handler is not None:
+            saved_emission_level  = self.__emission_level
+            self.__emission_level = abs (saved_emission_level) + 1
 
-                    # This somewhat illogical transposition of terms is for speed
-                    # optimization.  `not handler' must be side-effect free anyway, so it
-                    # doesn't matter which term is evaluated first.
-                    if not handler and isinstance (handler, WeakBinding):
-                        # Handler will be removed in collect_garbage(), don't bother now.
-                        might_have_garbage = True
-                        continue
+            try:
+                if handlers is None:
+                    value = self._call_lone_handler (arguments, keywords,
+                                                     accumulator, value, &might_have_garbage)
 
-                    # Another speed optimization, check if we even need that
-                    # `handler_value' first.
-                    if accumulator is None:
-                        try:
-                            handler (*arguments, **keywords)
-                        except:
-                            AbstractSignal.exception_handler (self, sys.exc_info () [1], handler)
-                    else:
-                        try:
-                            handler_value = handler (*arguments, **keywords)
-                        except:
-                            AbstractSignal.exception_handler (self, sys.exc_info () [1], handler)
-                        else:
-                            value = accumulator.accumulate_value (value, handler_value)
-                            if not accumulator.should_continue (value):
-                                might_have_garbage = True
-                                break
+                # This is by far the most common case, so it gets its own loop.
+                elif accumulator is None and self._blocked_handlers is None and not keywords:
+                    self._call_handlers_positional (handlers, arguments, &might_have_garbage)
+                else:
+                    value = self._call_handlers (handlers, arguments, keywords,
+                                                 accumulator, value, &might_have_garbage)
             finally:
                 self.__emission_level = saved_emission_level
-                if might_have_garbage and saved_emission_level == 0:
+                if (    saved_emission_level == 0
+                    and (might_have_garbage or self._deferred_handlers is not None)):
                     self.collect_garbage ()
 
         if accumulator is None:
@@ -1188,11 +1722,223 @@ cdef class Signal (AbstractSignal):
             return accumulator.post_process_value (value)
 
 
-    cdef int _get_emission_level (self):
-        return abs (self.__emission_level)
-
-    cdef int _is_emission_stopped (self):
-        return self.__emission_level < 0
+    def emit_many (self, argument_tuples):
+        cdef bint might_have_garbage = False
+        cdef dict no_keywords        = {}
+
+        accumulator = self.__accumulator
+        if accumulator is not None:
+            values = []
+        else:
+            values = None
+
+        saved_emission_level = self.__emission_level
+        emission_level       = abs (saved_emission_level) + 1
+
+        try:
+            for arguments in argument_tuples:
+                if type (arguments) is not tuple:
+                    arguments = tuple (arguments)
+
+                # Reset emission level each time, so that stop_emission() only affects
+                # the current item.
+                self.__emission_level = emission_level
+
+                # Handlers may connect to a signal that had none in the previous item.
+                handlers = self._handlers
+
+                if accumulator is None:
+                    if handlers is not None:
+                        if self._blocked_handlers is None:
+                            self._call_handlers_positional (handlers, arguments,
+                                                            &might_have_garbage)
+                        else:
+                            self._call_handlers (handlers, arguments, no_keywords,
+                                                 None, None, &might_have_garbage)
+                    elif self._lone_handler is not None:
+                        self._call_lone_handler (arguments, no_keywords,
+                                                 None, None, &might_have_garbage)
+                else:
+                    value = accumulator.get_initial_value ()
+                    if handlers is not None:
+                        value = self._call_handlers (handlers, arguments, no_keywords,
+                                                     accumulator, value, &might_have_garbage)
+                    elif self._lone_handler is not None:
+                        value = self._call_lone_handler (arguments, no_keywords,
+                                                         accumulator, value, &might_have_garbage)
+
+                    values.append (accumulator.post_process_value (value))
+        finally:
+            self.__emission_level = saved_emission_level
+            if (    saved_emission_level == 0
+                and (might_have_garbage or self._deferred_handlers is not None)):
+                self.collect_garbage ()
+
+        return values
+
+
+    cdef _call_handlers (self, list handlers, tuple arguments, dict keywords,
+                         accumulator, value, bint *might_have_garbage,
+                         Py_ssize_t start = 0):
+        # The emission loop.  Caller must set up emission level and collect garbage
+        # afterwards if told so.  Returns the accumulated value.  The list is indexed
+        # so that emission can start in the middle; its length is checked on each step,
+        # since handlers may be appended during emission.
+        cdef Py_ssize_t           index   = start
+        cdef _AbstractAccumulator builtin = _get_builtin_accumulator (accumulator)
+        cdef bint                 proceed
+
+        while index < len (handlers):
+            handler = handlers[index]
+            index  += 1
+
+            # Disconnected while in emission handlers are temporary set to None.
+            if handler is None:
+                might_have_garbage[0] = True
+                continue
+
+            if self.__emission_level < 0:
+                might_have_garbage[0] = True
+                break
+
+            # We need to refetch blocked handlers before processing each handler, because
+            # they may change during emission.
+            if (    self._blocked_handlers is not None
+                and self._blocked_handlers.contains (handler)):
+                continue
+
+            if isinstance (handler, WeakBinding) and not handler:
+                # Handler will be removed in collect_garbage(), don't bother now.
+                might_have_garbage[0] = True
+                continue
+
+            # Another speed optimization, check if we even need that `handler_value'
+            # first.
+            if accumulator is None:
+                try:
+                    handler (*arguments, **keywords)
+                except:
+                    AbstractSignal.exception_handler (self, sys.exc_info () [1], handler)
+            else:
+                try:
+                    handler_value = handler (*arguments, **keywords)
+                except:
+                    AbstractSignal.exception_handler (self, sys.exc_info () [1], handler)
+                else:
+                    if builtin is not None:
+                        value    = builtin._accumulate (value, handler_value)
+                        proceed  = builtin._should_continue (value)
+                    else:
+                        value    = accumulator.accumulate_value (value, handler_value)
+                        proceed  = accumulator.should_continue (value)
+
+                    if not proceed:
+                        might_have_garbage[0] = True
+                        break
+
+        return value
+
+    cdef _call_lone_handler (self, tuple arguments, dict keywords, accumulator, value,
+                             bint *might_have_garbage):
+        # Same as _call_handlers(), for a handler stored inline.  If the handler connects
+        # others, storage is converted to a list with the lone handler first, so the rest
+        # of the list is then emitted as usual.
+        cdef _AbstractAccumulator builtin
+        cdef bint                 proceed
+
+        handler = self._lone_handler
+
+        if (    self._blocked_handlers is not None
+            and self._blocked_handlers.contains (handler)):
+            pass
+
+        elif isinstance (handler, WeakBinding) and not handler:
+            might_have_garbage[0] = True
+
+        elif accumulator is None:
+            # Like in _call_handlers_positional(), avoid packing arguments where possible,
+            # since a lone handler is the most common case of all.
+            try:
+                if keywords:
+                    handler (*arguments, **keywords)
+                elif type (handler) is WeakBinding or type (handler) is Binding:
+                    (<Binding> handler)._invoke (arguments, None)
+                else:
+                    call_positional (handler, arguments)
+            except:
+                AbstractSignal.exception_handler (self, sys.exc_info () [1], handler)
+
+        else:
+            try:
+                handler_value = handler (*arguments, **keywords)
+            except:
+                AbstractSignal.exception_handler (self, sys.exc_info () [1], handler)
+            else:
+                builtin = _get_builtin_accumulator (accumulator)
+                if builtin is not None:
+                    value   = builtin._accumulate (value, handler_value)
+                    proceed = builtin._should_continue (value)
+                else:
+                    value   = accumulator.accumulate_value (value, handler_value)
+                    proceed = accumulator.should_continue (value)
+
+                if not proceed:
+                    return value
+
+        if self._handlers is not None:
+            might_have_garbage[0] = True
+            value = self._call_handlers (self._handlers, arguments, keywords,
+                                         accumulator, value, might_have_garbage, 1)
+
+        return value
+
+    cdef _call_handlers_positional (self, list handlers, tuple arguments,
+                                    bint *might_have_garbage):
+        # Same as _call_handlers(), specialized for signals without an accumulator, for
+        # emissions without keyword arguments and for the case when no handlers are
+        # blocked when the emission starts.
+        for handler in handlers:
+            if handler is None:
+                might_have_garbage[0] = True
+                continue
+
+            if self.__emission_level < 0:
+                might_have_garbage[0] = True
+                break
+
+            # A handler may block other handlers, but checking for that is cheap.
+            if (    self._blocked_handlers is not None
+                and self._blocked_handlers.contains (handler)):
+                continue
+
+            # Plain functions and methods cannot be garbage, don't waste time on them.
+            if not (   PyFunction_Check  (handler)
+                    or PyMethod_Check    (handler)
+                    or PyCFunction_Check (handler)):
+                if isinstance (handler, WeakBinding) and not handler:
+                    might_have_garbage[0] = True
+                    continue
+
+            try:
+                # Bindings of standard types are invoked without packing arguments once
+                # again.  Derived types might override __call__().
+                if type (handler) is WeakBinding or type (handler) is Binding:
+                    (<Binding> handler)._invoke (arguments, None)
+                else:
+                    call_positional (handler, arguments)
+            except:
+                AbstractSignal.exception_handler (self, sys.exc_info () [1], handler)
+
+
+    cdef int _get_emission_level (self):
+        return abs (self.__emission_level)
+
+    cdef int _is_emission_stopped (self):
+        return self.__emission_level < 0
+
+    cdef _set_emission_level (self, int level):
+        # For subclasses with their own emission loops.
+        self.__emission_level = level
 
     cpdef int stop_emission (self):
         # Check if we are in emission at all or if emission is not stopped already.
@@ -1209,11 +1955,8 @@ cdef class Signal (AbstractSignal):
 
         # Don't remove disconnected or garbage-collected handlers if in nested emission,
         # it will spoil emit() calls completely.
-        if self._handlers is not None and self.__emission_level == 0:
-            self._handlers = ([handler for handler in self._handlers
-                               if handler is not None and (not isinstance (handler, WeakBinding)
-                                                           or handler)]
-                              or None)
+        if not self._is_empty () and self.__emission_level == 0:
+            self._compact_handlers ()
 
 
     cpdef object _additional_description (self, formatter):
@@ -1263,7 +2006,14 @@ cdef class CleanSignal (Signal):
             self.__parent = _NONE_REFERENCE
 
 
-    parent = property (lambda self: self.__parent ())
+    property parent:
+        """
+        The object this signal protects from garbage collection while it has handlers or
+        C{None}.
+        """
+
+        def __get__(self):
+            return self.__parent ()
 
 
     def orphan (self):
@@ -1278,23 +2028,30 @@ cdef class CleanSignal (Signal):
             self.__orphan ()
 
     def __orphan (self, reference = None):
-        if self._handlers is not None:
+        if not self._is_empty ():
             AbstractGCProtector.default.unprotect (self)
 
 
     cdef do_connect (self, handler):
         parent = self.__parent ()
-        if self._handlers is None and parent is not None:
+        if self._is_empty () and parent is not None:
+            AbstractGCProtector.default.protect (self)
+
+        Signal.do_connect (self, handler)
+
+    cdef _do_connect_with_priority (self, handler, int priority, long connection_id):
+        parent = self.__parent ()
+        if self._is_empty () and parent is not None:
             AbstractGCProtector.default.protect (self)
 
-        super (CleanSignal, self).do_connect (handler)
+        Signal._do_connect_with_priority (self, handler, priority, connection_id)
 
 
     def disconnect (self, handler, *arguments, **keywords):
         if super (CleanSignal, self).disconnect (handler, *arguments, **keywords):
             parent = self.__parent ()
             if (self._get_emission_level () == 0
-                and self._handlers is None
+                and self._is_empty ()
                 and parent is not None):
                 AbstractGCProtector.default.unprotect (self)
 
@@ -1307,7 +2064,20 @@ cdef class CleanSignal (Signal):
         if super (CleanSignal, self).disconnect_all (handler, *arguments, **keywords):
             parent = self.__parent ()
             if (self._get_emission_level () == 0
-                and self._handlers is None
+                and self._is_empty ()
+                and parent is not None):
+                AbstractGCProtector.default.unprotect (self)
+
+            return True
+
+        else:
+            return False
+
+    def disconnect_by_id (self, connection_id):
+        if super (CleanSignal, self).disconnect_by_id (connection_id):
+            parent = self.__parent ()
+            if (self._get_emission_level () == 0
+                and self._is_empty ()
                 and parent is not None):
                 AbstractGCProtector.default.unprotect (self)
 
@@ -1328,18 +2098,15 @@ cdef class CleanSignal (Signal):
 
 
     cpdef collect_garbage (self):
-        if self._handlers is not None and self._get_emission_level () == 0:
+        if not self._is_empty () and self._get_emission_level () == 0:
             # NOTE: This is essentially inlined method of the superclass.  While calling
             #       that method would be more proper, inlining it gives significant speed
             #       improvement.  Since it makes no difference for derivatives, we
             #       sacrifice "do what is right" principle in this case.
 
-            self._handlers = [handler for handler in self._handlers
-                              if handler is not None and (not isinstance (handler, WeakBinding)
-                                                          or handler)]
+            self._compact_handlers ()
 
-            if not self._handlers:
-                self._handlers = None
+            if self._is_empty ():
                 parent         = self.__parent ()
                 if parent is not None:
                     AbstractGCProtector.default.unprotect (self)
@@ -1359,10 +2126,1488 @@ _NONE_REFERENCE = DummyReference (None)
 
 
 
-#-- Internal variables -----------------------------------------------
+#-- Lazy signal descriptor -------------------------------------------
+
+cdef class signal_property (object):
+
+    """
+    A descriptor for signals of many instances, only few of which will ever be observed.
+    The signal is created on first access and stored in an attribute of the instance, so
+    unobserved instances don’t have any signal at all:
+
+        >>> class Model (object):
+        ...     __slots__ = ('_created_signal', '__weakref__')
+        ...     created   = signal_property ()
+
+    Signals are stored in attribute named C{_I{name}_signal}, where C{I{name}} is the
+    name of the descriptor in its class.  If the class defines C{__slots__}, it must
+    include that attribute.  Alternatively, the attribute name can be given explicitly.
+
+    Code that only needs to know about handlers or to emit the signal should use
+    C{L{has_handlers}} and C{L{emit}} methods of the descriptor itself (i.e. read from
+    the class), since they never create a signal.
+
+    @group Instance Signals: __get__, has_handlers, emit
+    @group Properties:       accumulator, clean
+    """
+
+    __slots__ = ('__accumulator', '__clean', '__attribute')
+
+
+    def __init__(self, accumulator = None, clean = True, attribute = None):
+        """
+        Create a new descriptor.  Signals will be created with given C{accumulator}.  If
+        C{clean} is true, they are instances of C{L{CleanSignal}} with the instance as
+        parent, i.e. instances are protected from garbage collection while their signals
+        have handlers; this requires that instances can be weakly referenced.  Otherwise,
+        plain C{L{Signal}} objects are created.
+
+        @param  attribute: name of the instance attribute to store signals in; by default,
+                           it is derived from descriptor name.
+        @type   attribute: C{basestring} or C{None}
+
+        @raises TypeError: if C{accumulator} is not C{None} and not an instance of
+                           C{L{AbstractSignal.AbstractAccumulator}}.
+        """
+
+        if not (accumulator is None
+                or isinstance (accumulator, AbstractSignal.AbstractAccumulator)):
+            raise TypeError ("you must provide a 'Signal.AbstractAccumulator' or None")
+
+        self.__accumulator = accumulator
+        self.__clean       = clean
+        self.__attribute   = attribute
+
+
+    property accumulator:
+        """
+        The accumulator of created signals or C{None}.
+
+        @type: AbstractSignal.AbstractAccumulator
+        """
+
+        def __get__(self):
+            return self.__accumulator
+
+    property clean:
+        """
+        Whether created signals are instances of C{L{CleanSignal}}.
+
+        @type: bool
+        """
+
+        def __get__(self):
+            return self.__clean
+
+
+    def __set_name__(self, owner, name):
+        if self.__attribute is None:
+            self.__attribute = '_%s_signal' % name
+
+    cdef object __get_attribute (self, owner):
+        # Without __set_name__() support, find out the name on first use.
+        if self.__attribute is None:
+            for _class in getattr (owner, '__mro__', (owner,)):
+                for name, value in _class.__dict__.items ():
+                    if value is self:
+                        self.__attribute = '_%s_signal' % name
+                        return self.__attribute
+
+            raise TypeError ("cannot find signal_property in class '%s'" % owner.__name__)
+
+        return self.__attribute
+
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        attribute = self.__get_attribute (owner)
+        signal    = getattr (instance, attribute, None)
+
+        if signal is None:
+            if self.__clean:
+                signal = CleanSignal (instance, self.__accumulator)
+            else:
+                signal = Signal (self.__accumulator)
+
+            setattr (instance, attribute, signal)
+
+        return signal
+
+    def __set__(self, instance, value):
+        raise AttributeError ("signals cannot be reassigned")
+
+
+    def has_handlers (self, instance):
+        """
+        Determine if the signal of C{instance} has any handlers.  Unlike reading the
+        signal and calling its C{L{has_handlers <AbstractSignal.has_handlers>}}, this
+        doesn’t create a signal if there is none yet.
+
+        @rtype: C{bool}
+        """
+
+        signal = getattr (instance, self.__get_attribute (type (instance)), None)
+        return signal is not None and signal.has_handlers ()
+
+    def emit (self, instance, *arguments, **keywords):
+        """
+        Emit the signal of C{instance} with given C{arguments} and C{keywords}.  If the
+        signal hasn’t been created yet, it has no handlers, so nothing is called and the
+        value is what accumulator gives for no handlers.
+
+        @rtype:   C{object}
+        @returns: Value returned by C{L{emit <AbstractSignal.emit>}} of the signal.
+        """
+
+        signal = getattr (instance, self.__get_attribute (type (instance)), None)
+        if signal is not None:
+            return signal.emit (*arguments, **keywords)
+
+        accumulator = self.__accumulator
+        if accumulator is None:
+            return None
+        else:
+            return accumulator.post_process_value (accumulator.get_initial_value ())
+
+
+
+#-- Thread-safe signal class -----------------------------------------
+
+cdef class ThreadSafeSignal (AbstractSignal):
+
+    """
+    Implementation of C{L{AbstractSignal}} interface that can be used from several threads
+    at once.  Semantics are the same as of C{L{Signal}}, with the following differences:
+
+      - Handlers are stored in a tuple, which is replaced on each modification.  Emission
+        iterates over the tuple current when it starts and so needs no locking.  As a
+        consequence, handlers connected or disconnected during an emission only take
+        effect for subsequent emissions.
+
+      - Modifications take a lock, but only for the time needed to build a new tuple.
+
+      - Emission level and stopping emission are tracked per thread.  For instance,
+        C{L{stop_emission}} only affects emission in the calling thread.
+
+    Connecting and disconnecting handlers costs time proportional to the number of
+    handlers, so this class is suited for signals that are emitted much more often than
+    modified.
+    """
+
+    __slots__ = ('_handlers', '_blocked_handlers', '__accumulator', '__lock', '__local',
+                 '_connections', '__next_connection_id')
+
+
+    def __init__(self, accumulator = None):
+        """
+        Create a new C{ThreadSafeSignal} with specified C{accumulator}.  See
+        C{L{Signal.__init__}} for details.
+
+        @raises TypeError: if C{accumulator} is not C{None} and not an instance of
+                           C{AbstractAccumulator}.
+        """
+
+        if not (accumulator is None or isinstance (accumulator, Signal.AbstractAccumulator)):
+            raise TypeError ("you must provide a 'Signal.AbstractAccumulator' or None")
+
+        super (ThreadSafeSignal, self).__init__()
+
+        self._handlers             = ()
+        self._blocked_handlers     = None
+        self.__accumulator         = accumulator
+        self.__lock                = threading.Lock ()
+        self.__local               = threading.local ()
+        self._connections          = None
+        self.__next_connection_id  = 1
+
+
+    property accumulator:
+        """
+        The L{accumulator <AbstractAccumulator>} this signal was created with or C{None}.
+
+        @type: AbstractAccumulator
+        """
+
+        def __get__(self):
+            return self.__accumulator
+
+
+    cpdef int has_handlers (self):
+        for handler in self._handlers:
+            if not isinstance (handler, WeakBinding) or handler:
+                return True
+
+        return False
+
+    cpdef int count_handlers (self):
+        num_handlers = 0
+
+        for handler in self._handlers:
+            if not isinstance (handler, WeakBinding) or handler:
+                num_handlers += 1
+
+        return num_handlers
+
+
+    def is_connected (self, handler, *arguments, **keywords):
+        if is_callable (handler):
+            if arguments or keywords:
+                handler = Binding (handler, arguments, keywords)
+
+            return handler in self._handlers
+
+        else:
+            return False
+
+
+    def is_blocked (self, handler, *arguments, **keywords):
+        cdef _BlockedHandlers blocked_handlers = self._blocked_handlers
+
+        if blocked_handlers is not None and is_callable (handler):
+            if arguments or keywords:
+                handler = Binding (handler, arguments, keywords)
+
+            return blocked_handlers.contains (handler)
+
+        else:
+            return False
+
+
+    cdef do_connect (self, handler):
+        with self.__lock:
+            self._handlers = self._handlers + (handler,)
+
+    cdef _do_connect_with_id (self, handler):
+        with self.__lock:
+            connection_id              = self.__next_connection_id
+            self.__next_connection_id += 1
+
+            if self._connections is None:
+                self._connections = {}
+
+            self._connections[connection_id] = handler
+            self._handlers                   = self._handlers + (handler,)
+
+        return SignalConnection (self, connection_id)
+
+
+    def disconnect (self, handler, *arguments, **keywords):
+        if not is_callable (handler):
+            return False
+
+        if arguments or keywords:
+            handler = Binding (handler, arguments, keywords)
+
+        return self.__remove_handler (handler, False)
+
+    def disconnect_all (self, handler, *arguments, **keywords):
+        if not is_callable (handler):
+            return False
+
+        if arguments or keywords:
+            handler = Binding (handler, arguments, keywords)
+
+        with self.__lock:
+            handlers = tuple ([existing for existing in self._handlers
+                               if existing != handler])
+
+            if len (handlers) == len (self._handlers):
+                return False
+
+            self._handlers = handlers
+            self.__forget_handler (handler)
+
+        return True
+
+    def disconnect_by_id (self, connection_id):
+        if self._connections is None:
+            return False
+
+        with self.__lock:
+            handler = self._connections.pop (connection_id, None)
+
+        if handler is None:
+            return False
+
+        return self.__remove_handler (handler, True)
+
+
+    cdef bint __remove_handler (self, handler, bint identical) except -1:
+        # Removes the last handler equal (or identical) to `handler'.
+        with self.__lock:
+            handlers = self._handlers
+            index    = len (handlers) - 1
+
+            while index >= 0:
+                if (handlers[index] is handler if identical else handlers[index] == handler):
+                    break
+                index -= 1
+            else:
+                return False
+
+            removed        = handlers[index]
+            handlers       = handlers[:index] + handlers[index + 1:]
+            self._handlers = handlers
+
+            if removed not in handlers:
+                self.__forget_handler (removed)
+
+        return True
+
+    cdef __forget_handler (self, handler):
+        # Must be called with the lock held.
+        if self._blocked_handlers is not None:
+            self._blocked_handlers.remove_all (handler)
+            if self._blocked_handlers.size == 0:
+                self._blocked_handlers = None
+
+        if self._connections is not None:
+            for connection_id, connected in list (self._connections.items ()):
+                if connected == handler:
+                    del self._connections[connection_id]
+
+
+    # Note: blocked handlers are counted, so that each block() call must be matched by an
+    # unblock() one before the handler is called again.  Block counts are changed in place
+    # under the lock; emission only looks them up.
+
+    def block (self, handler, *arguments, **keywords):
+        if not is_callable (handler):
+            return False
+
+        if arguments or keywords:
+            handler = Binding (handler, arguments, keywords)
+
+        with self.__lock:
+            if handler not in self._handlers:
+                return False
+
+            if self._blocked_handlers is None:
+                self._blocked_handlers = _BlockedHandlers ()
+
+            self._blocked_handlers.add (handler)
+
+        return True
+
+    def unblock (self, handler, *arguments, **keywords):
+        if self._blocked_handlers is None or not is_callable (handler):
+            return False
+
+        if arguments or keywords:
+            handler = Binding (handler, arguments, keywords)
+
+        with self.__lock:
+            if self._blocked_handlers is None or not self._blocked_handlers.remove_one (handler):
+                # It is not blocked to begin with.
+                return False
+
+            if self._blocked_handlers.size == 0:
+                self._blocked_handlers = None
+
+        return True
+
+
+    def emit (self, *arguments, **keywords):
+        cdef bint might_have_garbage = False
+
+        value = self.__call_handlers (self._handlers, arguments, keywords,
+                                      &might_have_garbage)
 
-# It is not guaranteed to be a singleton, although it probably always is.
-_EMPTY_TUPLE = ()
+        # Emissions iterate over immutable tuples, so there is no need to wait until they
+        # all finish.
+        if might_have_garbage:
+            self.collect_garbage ()
+
+        return value
+
+
+    def emit_many (self, argument_tuples):
+        """
+        Emit the signal once for each tuple of arguments in C{argument_tuples}.  See
+        C{L{AbstractSignal.emit_many}} for details.  Handlers are taken once for the whole
+        batch, so handlers connected or disconnected meanwhile only take effect for
+        subsequent emissions.
+
+        @rtype:   C{list} or C{None}
+        @returns: List of values C{emit} would return for each item or C{None} if the
+                  signal has no accumulator.
+        """
+
+        cdef bint might_have_garbage = False
+        cdef dict no_keywords        = {}
+
+        handlers = self._handlers
+
+        if self.__accumulator is not None:
+            values = []
+        else:
+            values = None
+
+        try:
+            for arguments in argument_tuples:
+                if type (arguments) is not tuple:
+                    arguments = tuple (arguments)
+
+                value = self.__call_handlers (handlers, arguments, no_keywords,
+                                              &might_have_garbage)
+                if values is not None:
+                    values.append (value)
+        finally:
+            if might_have_garbage:
+                self.collect_garbage ()
+
+        return values
+
+
+    cdef __call_handlers (self, tuple handlers, tuple arguments, dict keywords,
+                          bint *might_have_garbage):
+        # One emission over the given handler tuple.  Caller must collect garbage
+        # afterwards if told so.  Returns what emit() should.
+        cdef int              saved_emission_level
+        cdef _BlockedHandlers blocked_handlers
+
+        accumulator = self.__accumulator
+        value       = None
+
+        if accumulator is not None:
+            value = accumulator.get_initial_value ()
+
+        if handlers:
+            local                = self.__local
+            saved_emission_level = getattr (local, 'emission_level', 0)
+            local.emission_level = abs (saved_emission_level) + 1
+
+            try:
+                for handler in handlers:
+                    if local.emission_level < 0:
+                        break
+
+                    # Refetched each time, since handlers may block others.
+                    blocked_handlers = self._blocked_handlers
+                    if blocked_handlers is not None and blocked_handlers.contains (handler):
+                        continue
+
+                    if isinstance (handler, WeakBinding) and not handler:
+                        might_have_garbage[0] = True
+                        continue
+
+                    if accumulator is None:
+                        try:
+                            handler (*arguments, **keywords)
+                        except:
+                            AbstractSignal.exception_handler (self, sys.exc_info () [1], handler)
+                    else:
+                        try:
+                            handler_value = handler (*arguments, **keywords)
+                        except:
+                            AbstractSignal.exception_handler (self, sys.exc_info () [1], handler)
+                        else:
+                            value = accumulator.accumulate_value (value, handler_value)
+                            if not accumulator.should_continue (value):
+                                break
+            finally:
+                local.emission_level = saved_emission_level
+
+        if accumulator is None:
+            return None
+        else:
+            return accumulator.post_process_value (value)
+
+
+    cdef int _get_emission_level (self):
+        return abs (getattr (self.__local, 'emission_level', 0))
+
+    cdef int _is_emission_stopped (self):
+        return getattr (self.__local, 'emission_level', 0) < 0
+
+    cpdef int stop_emission (self):
+        emission_level = getattr (self.__local, 'emission_level', 0)
+        if emission_level > 0:
+            self.__local.emission_level = -emission_level
+            return True
+        else:
+            return False
+
+
+    cpdef collect_garbage (self):
+        with self.__lock:
+            handlers = tuple ([handler for handler in self._handlers
+                               if not isinstance (handler, WeakBinding) or handler])
+
+            if len (handlers) != len (self._handlers):
+                for handler in self._handlers:
+                    if isinstance (handler, WeakBinding) and not handler:
+                        self.__forget_handler (handler)
+
+                self._handlers = handlers
+
+
+    cpdef object _additional_description (self, formatter):
+        if self.__accumulator is not None:
+            descriptions = ['accumulator: %s' % formatter (self.__accumulator)]
+        else:
+            descriptions = []
+
+        return descriptions + super (ThreadSafeSignal, self)._additional_description (formatter)
+
+
+
+#-- Executor-backed signal class -------------------------------------
+
+cdef class ExecutorSignal (Signal):
+
+    """
+    Subclass of C{L{Signal}} that runs its handlers in an executor, e.g. a
+    C{concurrent.futures.ThreadPoolExecutor} or C{ProcessPoolExecutor}.  Any object with
+    a compatible C{submit} method can be used.  This is useful if handlers are
+    CPU-intensive or perform blocking I/O.
+
+    There are two ways to emit such a signal:
+
+      - C{L{emit}} (or calling the signal) submits all handlers at once and waits until
+        they finish.  Handler return values are then fed to the accumulator, if any, in
+        order of connection.  If the accumulator stops the emission, handlers that are
+        not running yet are cancelled.
+
+      - C{L{emit_detached}} only submits the handlers and returns immediately.
+
+    In both cases exceptions raised by handlers are passed to
+    C{L{AbstractSignal.exception_handler}}.  When emitting detached, it is called from
+    whatever thread the executor completes futures in.
+
+    Handlers are submitted as they are stored by the signal, so with process pools they
+    must be picklable, e.g. module-level functions connected without arguments.  Note
+    that C{L{stop_emission}} is only effective if called before all handlers have been
+    submitted, which normally means never, unless the executor runs them synchronously.
+    """
+
+    __slots__ = ('__executor',)
+
+
+    def __init__(self, executor, accumulator = None):
+        """
+        Create a new C{ExecutorSignal} that submits handlers to C{executor}.
+
+        @param  executor:    executor to run handlers in.
+        @type   executor:    C{concurrent.futures.Executor} or compatible object
+
+        @raises TypeError:   if C{accumulator} is not C{None} and not an instance of
+                             C{AbstractAccumulator}.
+        """
+
+        super (ExecutorSignal, self).__init__(accumulator)
+        self.__executor = executor
+
+
+    property executor:
+        """
+        The executor handlers of this signal are submitted to.
+        """
+
+        def __get__(self):
+            return self.__executor
+
+
+    def emit (self, *arguments, **keywords):
+        return self.__collect (self.__submit (arguments, keywords))
+
+
+    def emit_many (self, argument_tuples):
+        """
+        Emit the signal once for each tuple of arguments in C{argument_tuples}, as
+        C{L{emit}} does.  Handlers for an item are submitted only after those for the
+        previous item finish.  See C{L{AbstractSignal.emit_many}} for details.
+
+        @rtype:   C{list} or C{None}
+        @returns: List of values C{emit} would return for each item or C{None} if the
+                  signal has no accumulator.
+        """
+
+        cdef dict no_keywords = {}
+
+        if self.accumulator is not None:
+            values = []
+        else:
+            values = None
+
+        for arguments in argument_tuples:
+            if type (arguments) is not tuple:
+                arguments = tuple (arguments)
+
+            value = self.__collect (self.__submit (arguments, no_keywords))
+            if values is not None:
+                values.append (value)
+
+        return values
+
+
+    cdef __collect (self, list submitted):
+        # Waits for (handler, future) pairs returned by __submit() and returns what emit()
+        # should.
+        accumulator = self.accumulator
+        value       = None
+
+        if accumulator is not None:
+            value = accumulator.get_initial_value ()
+
+        for index, (handler, future) in enumerate (submitted):
+            try:
+                handler_value = future.result ()
+            except:
+                if not future.cancelled ():
+                    AbstractSignal.exception_handler (self, sys.exc_info () [1], handler)
+                continue
+
+            if accumulator is not None:
+                value = accumulator.accumulate_value (value, handler_value)
+                if not accumulator.should_continue (value):
+                    for handler, future in submitted[index + 1:]:
+                        if not future.cancel ():
+                            # Already running, still report its errors.
+                            future.add_done_callback (partial (_report_handler_exception,
+                                                               self, handler))
+                    break
+
+        if accumulator is None:
+            return None
+        else:
+            return accumulator.post_process_value (value)
+
+
+    def emit_detached (self, *arguments, **keywords):
+        """
+        Submit non-blocked handlers to the executor and return without waiting for them.
+        Handler return values are discarded, regardless of accumulator.
+        """
+
+        for handler, future in self.__submit (arguments, keywords):
+            future.add_done_callback (partial (_report_handler_exception, self, handler))
+
+
+    cdef list __submit (self, tuple arguments, dict keywords):
+        # Returns a list of (handler, future) pairs.
+        cdef bint might_have_garbage = False
+        cdef int  saved_emission_level
+        cdef list submitted          = []
+
+        handlers = self._materialize ()
+        if handlers is None:
+            return submitted
+
+        submit               = self.__executor.submit
+        saved_emission_level = self._get_emission_level ()
+
+        if self._is_emission_stopped ():
+            saved_emission_level = -saved_emission_level
+
+        self._set_emission_level (abs (saved_emission_level) + 1)
+
+        try:
+            for handler in handlers:
+                if handler is None:
+                    might_have_garbage = True
+                    continue
+
+                if self._is_emission_stopped ():
+                    might_have_garbage = True
+                    break
+
+                if (    self._blocked_handlers is not None
+                    and self._blocked_handlers.contains (handler)):
+                    continue
+
+                if isinstance (handler, WeakBinding) and not handler:
+                    might_have_garbage = True
+                    continue
+
+                submitted.append ((handler, submit (handler, *arguments, **keywords)))
+        finally:
+            self._set_emission_level (saved_emission_level)
+            if (    saved_emission_level == 0
+                and (might_have_garbage or self._deferred_handlers is not None)):
+                self.collect_garbage ()
+
+        return submitted
+
+
+    cpdef object _additional_description (self, formatter):
+        return (['executor: %s' % formatter (self.__executor)]
+                + super (ExecutorSignal, self)._additional_description (formatter))
+
+
+
+def _report_handler_exception (signal, handler, future):
+    if not future.cancelled ():
+        try:
+            future.result ()
+        except:
+            AbstractSignal.exception_handler (signal, sys.exc_info () [1], handler)
+
+
+
+#-- Asynchronous signal class ----------------------------------------
+
+cdef enum:
+    _CALL_HANDLER
+    _SKIP_HANDLER
+    _SKIP_GARBAGE
+    _STOP_EMISSION
+
+
+cdef class AsyncSignal (Signal):
+
+    """
+    Subclass of C{L{Signal}} for use with coroutines.  Its C{L{emit}} method (and so
+    calling the signal) returns an awaitable:
+
+        >>> await signal.emit (some, arguments)
+
+    Handlers may be plain functions or coroutine functions (or, more generally, return
+    awaitables.)  Plain handlers are called right away, just like with C{Signal}.  If the
+    signal has no accumulator, awaitables returned by handlers run concurrently, using
+    C{asyncio.gather} if C{asyncio} is loaded.  Otherwise, since an accumulator needs
+    handler values in order, each is awaited before the next handler is called.
+
+    Weak handler bindings and blocking work as with C{Signal}.  Exceptions raised by
+    handlers, including from awaitables, are passed to
+    C{L{AbstractSignal.exception_handler}}.  Note that C{L{stop_emission}} stops all
+    emissions currently in progress on the signal, but has no effect on handlers already
+    running concurrently.  Accordingly, C{L{emission_stopped}} is C{True} while any of the
+    stopped emissions is still in progress.
+    """
+
+    __slots__ = ('__num_emissions', '__num_stops', '__num_stopped_emissions')
+
+
+    def __init__(self, accumulator = None):
+        super (AsyncSignal, self).__init__(accumulator)
+
+        self.__num_emissions         = 0
+        self.__num_stops             = 0
+        self.__num_stopped_emissions = 0
+
+
+    async def emit (self, *arguments, **keywords):
+        """
+        Invoke non-blocked handlers connected to C{self} and await their results.  See
+        the class description for details.
+
+        @rtype:   C{object}
+        @returns: Value as determined by the accumulator, or C{None} if there is none.
+        """
+
+        cdef int  status
+        cdef long num_stops          = self.__num_stops
+        cdef bint might_have_garbage = False
+
+        handlers    = self._materialize ()
+        accumulator = self.accumulator
+        value       = None
+
+        if accumulator is not None:
+            value = accumulator.get_initial_value ()
+
+        if handlers is not None:
+            # Several emissions can be in progress at once, interleaved.  Handlers are
+            # only removed when all of them are finished.
+            self.__num_emissions += 1
+            self._set_emission_level (self.__num_emissions)
+
+            try:
+                if accumulator is None:
+                    pending = []
+
+                    for handler in handlers:
+                        status = self.__get_handler_status (handler, num_stops)
+                        if status != _CALL_HANDLER:
+                            if status == _SKIP_HANDLER:
+                                continue
+
+                            might_have_garbage = True
+                            if status == _STOP_EMISSION:
+                                break
+                            else:
+                                continue
+
+                        try:
+                            handler_value = handler (*arguments, **keywords)
+                        except:
+                            AbstractSignal.exception_handler (self, sys.exc_info () [1], handler)
+                        else:
+                            if _is_awaitable (handler_value):
+                                pending.append (_await_handler (self, handler, handler_value))
+
+                    if pending:
+                        asyncio = sys.modules.get ('asyncio')
+                        if asyncio is not None and len (pending) > 1:
+                            await asyncio.gather (*pending)
+                        else:
+                            for awaitable in pending:
+                                await awaitable
+
+                else:
+                    for handler in handlers:
+                        status = self.__get_handler_status (handler, num_stops)
+                        if status != _CALL_HANDLER:
+                            if status == _SKIP_HANDLER:
+                                continue
+
+                            might_have_garbage = True
+                            if status == _STOP_EMISSION:
+                                break
+                            else:
+                                continue
+
+                        try:
+                            handler_value = handler (*arguments, **keywords)
+                            if _is_awaitable (handler_value):
+                                handler_value = await handler_value
+                        except:
+                            _reraise_if_cancelled ()
+                            AbstractSignal.exception_handler (self, sys.exc_info () [1], handler)
+                        else:
+                            value = accumulator.accumulate_value (value, handler_value)
+                            if not accumulator.should_continue (value):
+                                might_have_garbage = True
+                                break
+            finally:
+                self.__num_emissions -= 1
+                self._set_emission_level (self.__num_emissions)
+
+                if self.__num_stops != num_stops:
+                    self.__num_stopped_emissions -= 1
+
+                if (    self.__num_emissions == 0
+                    and (might_have_garbage or self._deferred_handlers is not None)):
+                    self.collect_garbage ()
+
+        if accumulator is None:
+            return None
+        else:
+            return accumulator.post_process_value (value)
+
+
+    async def emit_many (self, argument_tuples):
+        """
+        Emit the signal once for each tuple of arguments in C{argument_tuples}, awaiting
+        each emission before starting the next one.
+
+        @rtype:   C{list} or C{None}
+        @returns: List of values C{emit} returned for each item or C{None} if the signal
+                  has no accumulator.
+        """
+
+        values = []
+        for arguments in argument_tuples:
+            values.append (await self.emit (*arguments))
+
+        if self.accumulator is not None:
+            return values
+        else:
+            return None
+
+
+    cdef int __get_handler_status (self, handler, long num_stops) except -1:
+        if handler is None:
+            return _SKIP_GARBAGE
+
+        if self.__num_stops != num_stops:
+            return _STOP_EMISSION
+
+        if (    self._blocked_handlers is not None
+            and self._blocked_handlers.contains (handler)):
+            return _SKIP_HANDLER
+
+        if isinstance (handler, WeakBinding) and not handler:
+            return _SKIP_GARBAGE
+
+        return _CALL_HANDLER
+
+
+    cdef int _get_emission_level (self):
+        return self.__num_emissions
+
+    cdef int _is_emission_stopped (self):
+        return self.__num_stopped_emissions > 0
+
+    cpdef int stop_emission (self):
+        # Like with Signal, there must be an emission that is not stopped yet.
+        if self.__num_emissions > self.__num_stopped_emissions:
+            self.__num_stops             += 1
+            self.__num_stopped_emissions  = self.__num_emissions
+            return True
+        else:
+            return False
+
+
+
+async def _await_handler (signal, handler, awaitable):
+    try:
+        await awaitable
+    except:
+        _reraise_if_cancelled ()
+        AbstractSignal.exception_handler (signal, sys.exc_info () [1], handler)
+
+
+def _reraise_if_cancelled ():
+    # Cancellation is not an error of the handler, so it must propagate.
+    asyncio = sys.modules.get ('asyncio')
+    if asyncio is not None and isinstance (sys.exc_info () [1], asyncio.CancelledError):
+        raise
+
+
+try:
+    from inspect import isawaitable as _is_awaitable
+except ImportError:
+    def _is_awaitable (value):
+        return hasattr (value, '__await__')
+
+
+
+
+#-- Named signals ----------------------------------------------------
+
+cdef class SignalFactory (object):
+
+    """
+    A collection of signals distinguished by names.  Signals are obtained with the
+    subscription operator and implement C{L{AbstractSignal}} interface:
+
+        >>> factory = SignalFactory ()
+        >>> factory['create'].connect (handler)
+        >>> factory['create'] (some, list, of, arguments)
+
+    Returned signals are only lightweight proxies consisting of the factory and the name,
+    so two proxies for the same name are interchangeable.  The factory itself stores
+    handlers only for names that have any, so names without handlers cost no memory at
+    all.  This makes factories much cheaper than creating a separate C{L{Signal}} for
+    each name, if objects have many signals of which only a few are actually used.
+
+    Names have no special meaning to the factory, but it can optionally restrict them to
+    a fixed set.
+
+    @group Signals:   __getitem__
+    @group Properties: accumulator, names
+    """
+
+    __slots__ = ('_signals', '_accumulator', '__names', '__empty_signal',
+                 '__next_connection_id')
+
+
+    def __init__(self, accumulator = None, names = None):
+        """
+        Create a new C{SignalFactory}.  All signals of the factory will use the same
+        C{accumulator}.  If C{names} is not C{None}, only names from it will be accepted
+        by C{L{__getitem__}}.
+
+        @param  accumulator: optional accumulator for signal handlers’ return values.
+        @type   accumulator: C{L{AbstractSignal.AbstractAccumulator}} or C{None}
+
+        @param  names:       optional iterable of permitted signal names.
+
+        @raises TypeError:   if C{accumulator} is not C{None} and not an instance of
+                             C{AbstractAccumulator}.
+        """
+
+        # This also validates the accumulator.
+        self.__empty_signal        = Signal (accumulator)
+        self._accumulator         = accumulator
+        self._signals              = {}
+        self.__next_connection_id  = 1
+
+        if names is not None:
+            self.__names = frozenset (names)
+        else:
+            self.__names = None
+
+
+    property accumulator:
+        """
+        The accumulator all signals of this factory use or C{None}.
+
+        @type: AbstractSignal.AbstractAccumulator
+        """
+
+        def __get__(self):
+            return self._accumulator
+
+    property names:
+        """
+        The set of permitted signal names or C{None} if any name is permitted.
+
+        @type: frozenset
+        """
+
+        def __get__(self):
+            return self.__names
+
+
+    def __getitem__(self, name):
+        """
+        Return the signal with given C{name}.
+
+        @rtype:  C{L{AbstractSignal}}
+
+        @raises KeyError: if the factory restricts names and C{name} is not permitted.
+        """
+
+        if self.__names is not None and name not in self.__names:
+            raise KeyError (name)
+
+        return _NamedSignal (self, name)
+
+
+    cdef Signal _get_signal (self, name):
+        cdef Signal signal = self._signals.get (name)
+
+        if signal is None:
+            signal = Signal (self._accumulator)
+
+            # Continue numbering of dropped signals, so that stale connection handles
+            # cannot disconnect new handlers.
+            if self.__next_connection_id > 1:
+                signal._connections         = _ConnectionIndex ()
+                signal._connections.next_id = self.__next_connection_id
+
+            self._signals[name] = signal
+
+        return signal
+
+    cdef _release_signal (self, name, Signal signal):
+        # Forget the signal of `name' once it has no handlers, unless it is being emitted.
+        if signal._is_empty () and signal._get_emission_level () == 0:
+            if (    signal._connections is not None
+                and signal._connections.next_id > self.__next_connection_id):
+                self.__next_connection_id = signal._connections.next_id
+
+            if self._signals.get (name) is signal:
+                del self._signals[name]
+
+    cdef Signal _get_empty_signal (self):
+        return self.__empty_signal
+
+
+
+cdef class _NamedSignal (AbstractSignal):
+
+    """
+    Signal returned by C{L{SignalFactory.__getitem__}}.  All operations are forwarded to
+    handler storage of the factory for the signal name, which only exists while the
+    signal has handlers.
+    """
+
+    __slots__ = ('_factory', '_name')
+
+
+    def __init__(self, factory, name):
+        self._factory = factory
+        self._name    = name
+
+
+    property factory:
+        """
+        The factory this signal belongs to.
+
+        @type: SignalFactory
+        """
+
+        def __get__(self):
+            return self._factory
+
+    property name:
+        """
+        Name of this signal in its factory.
+        """
+
+        def __get__(self):
+            return self._name
+
+
+    cdef Signal __get_signal (self):
+        return self._factory._signals.get (self._name)
+
+
+    cpdef int has_handlers (self):
+        cdef Signal signal = self.__get_signal ()
+        return signal is not None and signal.has_handlers ()
+
+    cpdef int count_handlers (self):
+        cdef Signal signal = self.__get_signal ()
+        if signal is not None:
+            return signal.count_handlers ()
+        else:
+            return 0
+
+
+    def is_connected (self, handler, *arguments, **keywords):
+        cdef Signal signal = self.__get_signal ()
+        return signal is not None and signal.is_connected (handler, *arguments, **keywords)
+
+    def is_blocked (self, handler, *arguments, **keywords):
+        cdef Signal signal = self.__get_signal ()
+        return signal is not None and signal.is_blocked (handler, *arguments, **keywords)
+
+
+    cdef do_connect (self, handler):
+        self._factory._get_signal (self._name).do_connect (handler)
+
+    cdef _do_connect_with_id (self, handler):
+        # Handles must refer to the proxy, since the underlying signal may be dropped.
+        connection = self._factory._get_signal (self._name)._do_connect_with_id (handler)
+        return SignalConnection (self, connection.id)
+
+    cdef _do_connect_with_priority (self, handler, int priority, long connection_id):
+        (self._factory._get_signal (self._name)
+         ._do_connect_with_priority (handler, priority, connection_id))
+
+
+    def disconnect (self, handler, *arguments, **keywords):
+        cdef Signal signal = self.__get_signal ()
+        if signal is None:
+            return False
+
+        result = signal.disconnect (handler, *arguments, **keywords)
+        self._factory._release_signal (self._name, signal)
+
+        return result
+
+    def disconnect_all (self, handler, *arguments, **keywords):
+        cdef Signal signal = self.__get_signal ()
+        if signal is None:
+            return False
+
+        result = signal.disconnect_all (handler, *arguments, **keywords)
+        self._factory._release_signal (self._name, signal)
+
+        return result
+
+    def disconnect_by_id (self, connection_id):
+        cdef Signal signal = self.__get_signal ()
+        if signal is None:
+            return False
+
+        result = signal.disconnect_by_id (connection_id)
+        self._factory._release_signal (self._name, signal)
+
+        return result
+
+
+    def block (self, handler, *arguments, **keywords):
+        cdef Signal signal = self.__get_signal ()
+        return signal is not None and signal.block (handler, *arguments, **keywords)
+
+    def unblock (self, handler, *arguments, **keywords):
+        cdef Signal signal = self.__get_signal ()
+        return signal is not None and signal.unblock (handler, *arguments, **keywords)
+
+
+    def emit (self, *arguments, **keywords):
+        cdef Signal signal = self.__get_signal ()
+        if signal is None:
+            # Produces the accumulator's value for no handlers.
+            return self._factory._get_empty_signal ().emit (*arguments, **keywords)
+
+        result = signal.emit (*arguments, **keywords)
+        if signal._is_empty ():
+            self._factory._release_signal (self._name, signal)
+
+        return result
+
+    def emit_many (self, argument_tuples):
+        cdef Signal signal = self.__get_signal ()
+        if signal is None:
+            return self._factory._get_empty_signal ().emit_many (argument_tuples)
+
+        result = signal.emit_many (argument_tuples)
+        if signal._is_empty ():
+            self._factory._release_signal (self._name, signal)
+
+        return result
+
+
+    cdef int _get_emission_level (self):
+        cdef Signal signal = self.__get_signal ()
+        if signal is not None:
+            return signal._get_emission_level ()
+        else:
+            return 0
+
+    cdef int _is_emission_stopped (self):
+        cdef Signal signal = self.__get_signal ()
+        return signal is not None and signal._is_emission_stopped ()
+
+    cpdef int stop_emission (self):
+        cdef Signal signal = self.__get_signal ()
+        return signal is not None and signal.stop_emission ()
+
+
+    cpdef collect_garbage (self):
+        cdef Signal signal = self.__get_signal ()
+        if signal is not None:
+            signal.collect_garbage ()
+            self._factory._release_signal (self._name, signal)
+
+
+    cpdef object _additional_description (self, formatter):
+        return (['name: %s' % formatter (self._name)]
+                + super (_NamedSignal, self)._additional_description (formatter))
+
+
+
+#-- Topic signals ----------------------------------------------------
+
+cdef class TopicSignalFactory (SignalFactory):
+
+    """
+    A C{L{SignalFactory}} for hierarchical topics.  Signal names are topics made of
+    segments separated with dots, like C{'orders.42.created'}.  Handlers can be
+    connected to I{patterns} containing wildcard segments: C{'*'} matches exactly one
+    segment and C{'#'} matches zero or more segments.  Emitting a topic calls handlers of
+    all patterns matching it, so C{'orders.*.created'} and C{'orders.#'} both receive
+    emissions of C{'orders.42.created'}:
+
+        >>> factory = TopicSignalFactory ()
+        >>> factory['orders.*.created'].connect (handler)
+        >>> factory['orders.42.created'] (order)
+
+    Patterns are kept in a trie, so emission only visits patterns that can match the
+    topic, not all patterns with handlers.  For each matching pattern, handlers are
+    called in connection order; patterns are visited depth-first, with exact segments
+    first, then C{'*'} and then C{'#'}.  A handler is called once per matching pattern
+    it is connected to.
+
+    Otherwise, signals behave like C{L{Signal}}: handlers are weakly bound and can be
+    blocked, and factory accumulator collects values of all called handlers in one
+    emission.  Stopping emission of the pattern a handler is connected to stops the
+    whole emission of the topic.  Only topics without wildcards can be emitted.
+    """
+
+    __slots__ = ('__root',)
+
+
+    def __init__(self, accumulator = None):
+        """
+        Create a new C{TopicSignalFactory}.  All signals of the factory will use the same
+        C{accumulator}.
+
+        @raises TypeError: if C{accumulator} is not C{None} and not an instance of
+                           C{L{AbstractSignal.AbstractAccumulator}}.
+        """
+
+        super (TopicSignalFactory, self).__init__(accumulator)
+        self.__root = _TopicNode ()
+
+
+    def __getitem__(self, name):
+        """
+        Return the signal for given topic or pattern C{name}.
+
+        @rtype:  C{L{AbstractSignal}}
+
+        @raises ValueError: if C{name} is not a valid topic or pattern, i.e. contains
+                            empty segments or wildcards in segments with other
+                            characters.
+        """
+
+        cdef bint is_pattern = False
+
+        segments = name.split ('.')
+        for segment in segments:
+            if segment == '*' or segment == '#':
+                is_pattern = True
+            elif not segment or '*' in segment or '#' in segment:
+                raise ValueError ("invalid topic '%s'" % name)
+
+        return _TopicSignal (self, name, None if is_pattern else segments)
+
+
+    cdef Signal _get_signal (self, name):
+        cdef _TopicNode node
+        cdef _TopicNode child
+        cdef Signal     signal = self._signals.get (name)
+
+        if signal is None:
+            signal = SignalFactory._get_signal (self, name)
+
+            node = self.__root
+            for segment in name.split ('.'):
+                if node.children is None:
+                    node.children = {}
+
+                child = node.children.get (segment)
+                if child is None:
+                    child = node.children[segment] = _TopicNode ()
+
+                node = child
+
+            node.pattern = name
+            node.signal  = signal
+
+        return signal
+
+    cdef _release_signal (self, name, Signal signal):
+        cdef _TopicNode node
+        cdef _TopicNode parent
+        cdef list       path
+
+        if self._signals.get (name) is not signal:
+            return
+
+        SignalFactory._release_signal (self, name, signal)
+        if name in self._signals:
+            return
+
+        segments = name.split ('.')
+        node     = self.__root
+        path     = []
+
+        for segment in segments:
+            path.append (node)
+            node = node.children[segment]
+
+        node.signal  = None
+        node.pattern = None
+
+        # Prune branches that lead to no patterns anymore.
+        for segment in reversed (segments):
+            if node.signal is not None or node.children:
+                break
+
+            parent = path.pop ()
+            del parent.children[segment]
+            node = parent
+
+
+    cdef list _match (self, list segments):
+        cdef list matched = []
+
+        _match_topic (self.__root, segments, 0, matched, set ())
+        return matched
+
+
+
+cdef _match_topic (_TopicNode node, list segments, Py_ssize_t index, list matched,
+                   set seen):
+    # Collect nodes with signals that match `segments[index:]'.  Since `#' can match in
+    # several ways, the same node can be reached more than once; `seen' filters that.
+    cdef Py_ssize_t num_segments = len (segments)
+    cdef Py_ssize_t end_index
+
+    if index == num_segments and node.signal is not None and node not in seen:
+        seen.add (node)
+        matched.append (node)
+
+    if node.children is None:
+        return
+
+    if index < num_segments:
+        child = node.children.get (segments[index])
+        if child is not None:
+            _match_topic (child, segments, index + 1, matched, seen)
+
+        child = node.children.get ('*')
+        if child is not None:
+            _match_topic (child, segments, index + 1, matched, seen)
+
+    child = node.children.get ('#')
+    if child is not None:
+        for end_index in range (index, num_segments + 1):
+            _match_topic (child, segments, end_index, matched, seen)
+
+
+
+cdef class _TopicNode (object):
+
+    __slots__ = ('children', 'signal', 'pattern')
+
+    def __init__(self):
+        self.children = None
+        self.signal   = None
+        self.pattern  = None
+
+
+
+cdef class _TopicSignal (_NamedSignal):
+
+    """
+    Signal returned by C{L{TopicSignalFactory.__getitem__}}.  Connections are made to
+    the pattern itself, while emission reaches handlers of all matching patterns.
+    """
+
+    __slots__ = ('__segments',)
+
+
+    def __init__(self, factory, name, segments):
+        super (_TopicSignal, self).__init__(factory, name)
+        self.__segments = segments
+
+
+    def emit (self, *arguments, **keywords):
+        cdef TopicSignalFactory factory = self._factory
+        cdef _TopicNode         node
+        cdef Signal             signal
+        cdef int                saved_emission_level
+        cdef bint               might_have_garbage
+        cdef bint               stopped            = False
+
+        if self.__segments is None:
+            raise ValueError ("cannot emit pattern '%s'" % self._name)
+
+        accumulator = factory._accumulator
+        value       = None
+
+        if accumulator is not None:
+            value = accumulator.get_initial_value ()
+
+        for node in factory._match (self.__segments):
+            # Handlers of a previous pattern could have disconnected everything here.
+            signal = node.signal
+            if signal is None or signal._is_empty ():
+                continue
+
+            saved_emission_level = signal._get_emission_level ()
+            if signal._is_emission_stopped ():
+                saved_emission_level = -saved_emission_level
+
+            signal._set_emission_level (abs (saved_emission_level) + 1)
+            might_have_garbage = False
+
+            try:
+                if signal._handlers is None:
+                    value = signal._call_lone_handler (arguments, keywords, accumulator,
+                                                       value, &might_have_garbage)
+                else:
+                    value = signal._call_handlers (signal._handlers, arguments, keywords,
+                                                   accumulator, value, &might_have_garbage)
+
+                stopped = (signal._is_emission_stopped ()
+                           or (accumulator is not None
+                               and not accumulator.should_continue (value)))
+            finally:
+                signal._set_emission_level (saved_emission_level)
+                if (    saved_emission_level == 0
+                    and (might_have_garbage or signal._deferred_handlers is not None)):
+                    signal.collect_garbage ()
+
+                factory._release_signal (node.pattern, signal)
+
+            if stopped:
+                break
+
+        if accumulator is None:
+            return None
+        else:
+            return accumulator.post_process_value (value)
+
+    def emit_many (self, argument_tuples):
+        values = [self.emit (*arguments) for arguments in argument_tuples]
+
+        if self._factory._accumulator is not None:
+            return values
+        else:
+            return None
 
 
 
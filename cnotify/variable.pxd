@@ -7,6 +7,7 @@ cdef class AbstractVariable(AbstractValueObject):
 
 cdef class AbstractValueTrackingVariable(AbstractVariable):
 	cdef object __value
+	cdef bint __default_values_differ
 	
 	cpdef object get(AbstractValueTrackingVariable self)
 	cpdef int _set(AbstractValueTrackingVariable self, object value) except? -1
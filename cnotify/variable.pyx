@@ -31,14 +31,15 @@ G{classtree AbstractVariable}
 
 __docformat__ = 'epytext en'
 __all__       = ('AbstractVariable', 'AbstractValueTrackingVariable',
-                 'Variable', 'WatcherVariable')
+                 'Variable', 'WatcherVariable', 'ComputedVariable')
 
 
 import types
 import weakref
 
 #from  cnotify.base      import AbstractValueObject
-from cnotify.base cimport AbstractValueObject
+from cnotify.base cimport AbstractValueObject, note_value_changing, note_value_read, \
+                          set_height_above, start_tracking_reads, stop_tracking_reads
 from cnotify.condition import AbstractStateTrackingCondition
 from cnotify.condition cimport AbstractCondition
 from cnotify.gc        import AbstractGCProtector
@@ -75,6 +76,9 @@ cdef class AbstractVariable (AbstractValueObject):
         Construct a condition, whose state is always given C{predicate} over this variable
         value.
 
+        The condition only tracks this variable while its ‘changed’ signal is in use;
+        otherwise C{predicate} is called on demand, when the condition state is read.
+
         @param  predicate: a callable accepting one argument (current value) which
                            determines the state of the returned condition.
 
@@ -91,6 +95,9 @@ cdef class AbstractVariable (AbstractValueObject):
         Construct a variable, whose state is always given transformation of this variable
         value.
 
+        The variable only tracks this variable while its ‘changed’ signal is in use;
+        otherwise C{transformer} is called on demand, when the value is read.
+
         @param  transformer: a callable accepting one argument (current value) which
                              computes derived value of the returned variable.
 
@@ -144,6 +151,11 @@ cdef class AbstractValueTrackingVariable (AbstractVariable):
         super (AbstractValueTrackingVariable, self).__init__()
         self.__value = initial_value
 
+        # Calling values_differ() costs a method lookup for instances of Python classes,
+        # so _set() compares values itself if the method is not overriden.
+        self.__default_values_differ = (type (self).values_differ
+                                        is (<object> AbstractValueObject).values_differ)
+
 
     cpdef object get (self):
         """
@@ -153,12 +165,14 @@ cdef class AbstractValueTrackingVariable (AbstractVariable):
         @rtype: C{object}
         """
 
+        note_value_read (self)
         return self.__value
 
     cpdef int _set (self, object value) except? -1:
         """
         Set the value of the variable internally.  The C{value} is checked for both
-        equality with the current value and whether it passes C{L{is_allowed_value}} test.
+        being different from the current value (see C{L{values_differ}}) and whether it
+        passes C{L{is_allowed_value}} test.
         So, this method does all that is needed for C{set} method of a mutable variable.
 
         This method I{must not} be used from outside.  For mutable variables, use C{set}
@@ -174,10 +188,17 @@ cdef class AbstractValueTrackingVariable (AbstractVariable):
                             C{L{is_allowed_value}}.
         """
 
-        if self.get () != value:
+        if self.__default_values_differ:
+            differ = self.get () != value
+        else:
+            differ = self.values_differ (self.get (), value)
+
+        if differ:
             if not self.is_allowed_value (value):
                 raise ValueError ("'%s' is not allowed as value of the variable" % value)
 
+            note_value_changing (self, self.__value)
+
             self.__value = value
             return self._value_changed (value)
 
@@ -185,6 +206,25 @@ cdef class AbstractValueTrackingVariable (AbstractVariable):
             return False
 
 
+    def _store_value (self, value):
+        """
+        Store already validated C{value} as the new value of the variable and emit
+        ‘changed’ signal, exactly as C{L{_set}} does after its checks.  This is meant for
+        C{_set} implementations of derived types that have to call their setter in
+        between.
+
+        This method I{must not} be used from outside.
+
+        @rtype:   C{bool}
+        @returns: Always C{True}.
+        """
+
+        note_value_changing (self, self.__value)
+
+        self.__value = value
+        return self._value_changed (value)
+
+
     def is_allowed_value (self, value):
         """
         Determine if C{value} is suitable for this variable.  Default implementation
@@ -204,6 +244,8 @@ cdef class AbstractValueTrackingVariable (AbstractVariable):
     def _generate_derived_type_dictionary (cls, options):
         allowed_values      = options.get ('allowed_values')
         allowed_value_types = options.get ('allowed_value_types')
+        change_detection    = options.get ('change_detection')
+        change_key          = options.get ('change_key')
 
         if allowed_value_types is not None:
             if not isinstance (allowed_value_types, tuple):
@@ -213,6 +255,17 @@ cdef class AbstractValueTrackingVariable (AbstractVariable):
                 if not isinstance (allowed_type, ClassTypes):
                     raise TypeError ("'allowed_value_types' must be a tuple of types and classes")
 
+        if change_detection is not None:
+            if change_key is not None:
+                raise ValueError ("'change_detection' and 'change_key' cannot be used together")
+
+            if (    change_detection not in ('equality', 'identity')
+                and not is_callable (change_detection)):
+                raise ValueError ("'change_detection' must be 'equality', 'identity' or a callable")
+
+        if change_key is not None and not is_callable (change_key):
+            raise TypeError ("'change_key' must be callable")
+
         for attribute in (super (AbstractValueTrackingVariable, cls)
                           ._generate_derived_type_dictionary (options)):
             if attribute[0] not in ('get', 'set'):
@@ -224,6 +277,8 @@ cdef class AbstractValueTrackingVariable (AbstractVariable):
                                                                 'cls',
                                                                 'allowed_values',
                                                                 'allowed_value_types',
+                                                                'change_detection',
+                                                                'change_key',
                                                                 'getter', 'setter',
                                                                 'default_value')
 
@@ -243,16 +298,52 @@ cdef class AbstractValueTrackingVariable (AbstractVariable):
                          '    return isinstance (value, allowed_value_types)',
                          filtered_options, functions)
 
+        if change_detection == 'identity':
+            execute ('def values_differ (self, old_value, new_value):\n'
+                     '    return old_value is not new_value',
+                     filtered_options, functions)
+
+        elif change_detection is not None and change_detection != 'equality':
+            execute ('def values_differ (self, old_value, new_value):\n'
+                     '    return not change_detection (old_value, new_value)',
+                     filtered_options, functions)
+
+        elif change_key is not None:
+            # The key is stored, since values can be modified in place.  It is only stored
+            # if the new value is going to be accepted by _set().  Values other than the
+            # current one (e.g. when coalescing changes) are compared by their keys.
+            yield '__slots__', '_change_key'
+
+            execute ('def values_differ (self, old_value, new_value):\n'
+                     '    key = change_key (new_value)\n'
+                     '    if old_value is not self.get ():\n'
+                     '        return key != change_key (old_value)\n'
+                     '    if key == self._change_key:\n'
+                     '        return False\n'
+                     '    if self.is_allowed_value (new_value):\n'
+                     '        self._change_key = key\n'
+                     '    return True',
+                     filtered_options, functions)
+
+        if change_key is not None:
+            change_key_statement = 'self._change_key = change_key (self.get ())'
+        else:
+            change_key_statement = ''
+
         if 'getter' in options:
             if object is not None:
                 execute (('def __init__(self, %s):\n'
                           '    cls.__init__(self, getter (%s))\n'
-                          '    %s = %s')
-                         % (object, object, AbstractValueObject._get_object (options), object),
+                          '    %s = %s\n'
+                          '    %s\n')
+                         % (object, object, AbstractValueObject._get_object (options), object,
+                            change_key_statement),
                          filtered_options, functions)
             else:
-                execute ('def __init__(self):\n'
-                         '    cls.__init__(self, getter (self))\n',
+                execute (('def __init__(self):\n'
+                          '    cls.__init__(self, getter (self))\n'
+                          '    %s\n')
+                         % change_key_statement,
                          filtered_options, functions)
 
             execute (('def resynchronize_with_backend (self):\n'
@@ -287,26 +378,28 @@ cdef class AbstractValueTrackingVariable (AbstractVariable):
                 execute (('def __init__(self, %s, initial_value%s):\n'
                           '    cls.__init__(self, initial_value)\n'
                           '    %s = %s\n'
+                          '    %s\n'
                           '    %s\n')
                          % (object, initial_default,
-                            AbstractValueObject._get_object (options), object, setter_statement),
+                            AbstractValueObject._get_object (options), object, setter_statement,
+                            change_key_statement),
                          filtered_options, functions)
             else:
                 execute (('def __init__(self, initial_value%s):\n'
                           '    cls.__init__(self, initial_value)\n'
+                          '    %s\n'
                           '    %s\n')
-                         % (initial_default, setter_statement),
+                         % (initial_default, setter_statement, change_key_statement),
                          filtered_options, functions)
 
         if 'setter' in options:
             execute (('def _set (self, value):\n'
-                      '    if self.get () != value:\n'
+                      '    if self.values_differ (self.get (), value):\n'
                       '        if not self.is_allowed_value (value):\n'
                       '            raise ValueError \\\n'
                       '                ("\'%%s\' is not allowed as value of the variable" %% value)\n'
                       '        setter (%s, value)\n'
-                      '        self._AbstractValueTrackingVariable__value = value\n'
-                      '        return self._value_changed (value)\n'
+                      '        return self._store_value (value)\n'
                       '    else:\n'
                       '        return False')
                      % AbstractValueObject._get_object (options),
@@ -444,9 +537,11 @@ class WatcherVariable (AbstractValueTrackingVariable):
 
         if variable_to_watch is not None:
             self.__watched_variable = weakref.ref (variable_to_watch, self.__on_usage_change)
+            set_height_above (self, (variable_to_watch,))
             variable_to_watch.store (self._set)
         else:
             self.__watched_variable = None
+            set_height_above (self, ())
             self._set (None)
 
         if self._has_signal ():
@@ -514,36 +609,223 @@ class WatcherVariable (AbstractValueTrackingVariable):
 
 
 
+class ComputedVariable (AbstractValueTrackingVariable):
+
+    """
+    A variable whose value is the result of calling a function without arguments.  The
+    function may read any number of other value objects; all calls to their C{get} method
+    made while it runs are recorded and these objects become the variable’s
+    I{dependencies}.  The function is called again only when one of the dependencies
+    changes, and dependencies are recorded anew on each call, so they can differ between
+    calls, e.g. depending on a condition.
+
+    The function is called lazily: when one of the dependencies changes and there is no
+    ‘changed’ signal, the cached value is just discarded and the function is not called
+    until the value is read.  If the signal exists, the value is recomputed immediately,
+    so that handlers get notified.
+
+    Only reads through C{get} method of standard variables and conditions (and objects
+    derived from them) are recorded.  Value objects that compute their value without
+    calling C{get} of C{L{AbstractValueTrackingVariable}} or
+    C{L{AbstractStateTrackingCondition <condition.AbstractStateTrackingCondition>}} are
+    not noticed.
+    """
+
+    __slots__ = ('__function', '__dependencies', '__valid', '__computing')
+
+
+    def __init__(self, function):
+        """
+        Create a new computed variable.  C{function} is not called until the variable
+        value is first read or its ‘changed’ signal is created.
+
+        @raises TypeError: if C{function} is not callable.
+        """
+
+        if not is_callable (function):
+            raise TypeError ('function must be callable')
+
+        super (ComputedVariable, self).__init__(None)
+
+        self.__function     = function
+        self.__dependencies = ()
+        self.__valid        = False
+        self.__computing    = False
+
+
+    def get (self):
+        """
+        Get the current value of the variable, calling the function first if the cached
+        value is not valid anymore.
+
+        @rtype: C{object}
+        """
+
+        if not self.__valid and not self.__computing:
+            self.__recompute ()
+
+        return super (ComputedVariable, self).get ()
+
+
+    def invalidate (self):
+        """
+        Discard the cached value, as if one of the dependencies changed.  This is needed
+        only if the function reads something that is not a value object.
+        """
+
+        self.__invalidate ()
+
+
+    def __recompute (self):
+        outer_read_objects = start_tracking_reads ()
+        self.__computing   = True
+
+        try:
+            value = self.__function ()
+        finally:
+            self.__computing = False
+            dependencies     = tuple (dependency
+                                      for dependency in stop_tracking_reads (outer_read_objects)
+                                      if dependency is not self)
+
+        old_dependencies    = self.__dependencies
+        self.__dependencies = dependencies
+        self.__valid        = True
+
+        for dependency in old_dependencies:
+            if dependency not in dependencies:
+                dependency.changed.disconnect (self.__invalidate)
+
+        for dependency in dependencies:
+            if dependency not in old_dependencies:
+                dependency.changed.connect (self.__invalidate)
+
+        set_height_above (self, dependencies)
+        self._set (value)
+
+
+    def __invalidate (self, *ignored):
+        if not self.__valid:
+            return
+
+        if self._has_signal ():
+            self.__recompute ()
+        else:
+            # Nobody is notified about changes, so there is no need to listen to them
+            # until the value is read again.
+            self.__valid = False
+
+            for dependency in self.__dependencies:
+                dependency.changed.disconnect (self.__invalidate)
+
+            self.__dependencies = ()
+
+
+    def __get_dependencies (self):
+        return self.__dependencies
+
+
+    dependencies = property (__get_dependencies,
+                             doc = ("""
+                                    Value objects read by the function the last time
+                                    it was called, as a tuple.  Empty if the cached
+                                    value is not valid.
+
+                                    @type: C{tuple}
+                                    """))
+
+
+    def _create_signal (self):
+        if not self.__valid:
+            self.__recompute ()
+
+        signal = CleanSignal (self)
+        return signal, weakref.ref (signal, self.__on_usage_change)
+
+
+    def __on_usage_change (self, object):
+        self._remove_signal (object)
+
+
+    def _additional_description (self, formatter):
+        return (['function: %s' % formatter (self.__function)]
+                + super (ComputedVariable, self)._additional_description (formatter))
+
+
+    def _generate_derived_type_dictionary (cls, options):
+        raise TypeError ("'ComputedVariable' doesn't support derive_type() method")
+
+    _generate_derived_type_dictionary = classmethod (_generate_derived_type_dictionary)
+
+
+
 #-- Internal variable classes -----------------------------------------
 
 # FIXME: There is code duplication in these classes.  Use multiple inheritance?
 
+# Derived objects below are lazy: they only connect to their variable while their own
+# ‘changed’ signal exists, i.e. while it has handlers or is referenced from outside.
+# Otherwise, get() computes the value on demand, reusing the last result if variable
+# value has not changed since.
+
+_NOT_COMPUTED = object ()
+
+
 class _PredicateOverVariable (AbstractStateTrackingCondition):
 
-    __slots__ = ('__predicate', '__variable')
+    __slots__ = ('__predicate', '__variable', '__attached',
+                 '__variable_value', '__computed_state')
 
 
     def __init__(self, predicate, variable):
         if not is_callable (predicate):
             raise TypeError ('predicate must be callable')
 
-        super (_PredicateOverVariable, self).__init__(predicate (variable.get ()))
+        super (_PredicateOverVariable, self).__init__(False)
 
-        self.__predicate = predicate
-        self.__variable  = weakref.ref (variable, self.__on_usage_change)
+        self.__predicate      = predicate
+        self.__variable       = weakref.ref (variable, self.__on_usage_change)
+        self.__attached       = False
+        self.__variable_value = _NOT_COMPUTED
+        self.__computed_state = False
 
-        variable.changed.connect (self.__update)
+        set_height_above (self, (variable,))
 
     def __get_variable (self):
         return self.__variable ()
 
 
+    def get (self):
+        if self.__attached:
+            return super (_PredicateOverVariable, self).get ()
+        else:
+            return self.__compute ()
+
+    def __compute (self):
+        variable = self.__variable ()
+        if variable is not None:
+            value = variable.get ()
+            if self.__variable_value is _NOT_COMPUTED or self.__variable_value != value:
+                self.__computed_state = bool (self.__predicate (value))
+                self.__variable_value = value
+
+        return self.__computed_state
+
+
     def __update (self, new_value):
-        self._set (self.__predicate (new_value))
+        self.__computed_state = bool (self.__predicate (new_value))
+        self.__variable_value = new_value
+        self._set (self.__computed_state)
 
 
     def _create_signal (self):
-        if self.__variable () is not None:
+        variable = self.__variable ()
+        if variable is not None:
+            state           = self.__compute ()
+            self.__attached = True
+
+            self._set (state)
+            variable.changed.connect (self.__update)
             AbstractGCProtector.default.protect (self)
 
         signal = CleanSignal (self)
@@ -551,10 +833,15 @@ class _PredicateOverVariable (AbstractStateTrackingCondition):
 
 
     def __on_usage_change (self, object):
-        self._remove_signal (object)
+        if self._remove_signal (object) or object is self.__variable:
+            if self.__attached:
+                self.__attached = False
 
-        if self._has_signal () or self.__variable () is not None:
-            AbstractGCProtector.default.unprotect (self)
+                variable = self.__variable ()
+                if variable is not None:
+                    variable.changed.disconnect (self.__update)
+
+                AbstractGCProtector.default.unprotect (self)
 
 
     def _additional_description (self, formatter):
@@ -566,31 +853,60 @@ class _PredicateOverVariable (AbstractStateTrackingCondition):
 
 class _VariableTransformation (AbstractValueTrackingVariable):
 
-    __slots__ = ('__transformer', '__variable')
+    __slots__ = ('__transformer', '__variable', '__attached',
+                 '__variable_value', '__computed_value')
 
 
     def __init__(self, transformer, variable):
         if not is_callable (transformer):
             raise TypeError ('transformer must be callable')
 
-        super (_VariableTransformation, self).__init__(transformer (variable.get ()))
+        super (_VariableTransformation, self).__init__(None)
 
-        self.__transformer = transformer
-        self.__variable    = weakref.ref (variable, self.__on_usage_change)
+        self.__transformer    = transformer
+        self.__variable       = weakref.ref (variable, self.__on_usage_change)
+        self.__attached       = False
+        self.__variable_value = _NOT_COMPUTED
+        self.__computed_value = None
 
-        variable.changed.connect (self.__update)
+        set_height_above (self, (variable,))
 
 
     def __get_variable (self):
         return self.__variable ()
 
 
+    def get (self):
+        if self.__attached:
+            return super (_VariableTransformation, self).get ()
+        else:
+            return self.__compute ()
+
+    def __compute (self):
+        variable = self.__variable ()
+        if variable is not None:
+            value = variable.get ()
+            if self.__variable_value is _NOT_COMPUTED or self.__variable_value != value:
+                self.__computed_value = self.__transformer (value)
+                self.__variable_value = value
+
+        return self.__computed_value
+
+
     def __update (self, new_value):
-        self._set (self.__transformer (new_value))
+        self.__computed_value = self.__transformer (new_value)
+        self.__variable_value = new_value
+        self._set (self.__computed_value)
 
 
     def _create_signal (self):
-        if self.__variable () is not None:
+        variable = self.__variable ()
+        if variable is not None:
+            value           = self.__compute ()
+            self.__attached = True
+
+            self._set (value)
+            variable.changed.connect (self.__update)
             AbstractGCProtector.default.protect (self)
 
         signal = CleanSignal (self)
@@ -598,10 +914,15 @@ class _VariableTransformation (AbstractValueTrackingVariable):
 
 
     def __on_usage_change (self, object):
-        self._remove_signal (object)
+        if self._remove_signal (object) or object is self.__variable:
+            if self.__attached:
+                self.__attached = False
+
+                variable = self.__variable ()
+                if variable is not None:
+                    variable.changed.disconnect (self.__update)
 
-        if self._has_signal () or self.__variable () is not None:
-            AbstractGCProtector.default.unprotect (self)
+                AbstractGCProtector.default.unprotect (self)
 
 
     def _additional_description (self, formatter):
@@ -50,7 +50,7 @@ def _build_extensions ():
 
 
 
-_TEST_MODULES = ('all', 'base', 'bind', 'condition', '_gc', 'mediator', 'signal',
+_TEST_MODULES = ('all', 'array', 'base', 'bind', 'condition', '_gc', 'mediator', 'signal',
                  'utils', 'variable')
 
 def _import_module (module_name):
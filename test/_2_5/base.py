@@ -27,13 +27,18 @@
 
 from __future__      import with_statement
 
+import threading
+
 from contextlib      import nested
 
-from notify.variable import AbstractVariable, Variable
+from notify.base      import ChangeTransaction
+from notify.condition import Condition
+from notify.variable  import AbstractVariable, Variable
 from test.__common   import NotifyTestCase, NotifyTestObject, ignoring_exceptions
 
 
-__all__ = ('BaseContextManagerTestCase', 'BaseChangesFrozenContextManagerTestCase')
+__all__ = ('BaseContextManagerTestCase', 'BaseChangesFrozenContextManagerTestCase',
+           'BaseChangeTransactionTestCase')
 
 
 
@@ -305,6 +310,139 @@ class BaseChangesFrozenContextManagerTestCase (NotifyTestCase):
 
 
 
+class BaseChangeTransactionTestCase (NotifyTestCase):
+
+    def test_transaction_1 (self):
+        test      = NotifyTestObject ()
+        variable1 = Variable ()
+        variable2 = Variable ()
+
+        variable1.changed.connect (test.simple_handler)
+        variable2.changed.connect (test.simple_handler)
+
+        transaction = ChangeTransaction ()
+        self.assert_(repr (transaction).endswith (': inactive>'))
+
+        with transaction:
+            variable1.value = 1
+            variable2.value = 2
+            variable1.value = 3
+
+            self.assert_(repr (transaction).endswith (': active>'))
+            test.assert_results ()
+
+        test.assert_results (3, 2)
+
+
+    def test_transaction_2 (self):
+        test      = NotifyTestObject ()
+        variable1 = Variable ()
+        variable2 = Variable ()
+
+        variable1.changed.connect (test.simple_handler)
+        variable2.changed.connect (test.simple_handler)
+
+        with ChangeTransaction ():
+            variable1.value = 1
+            variable1.value = None
+
+            with ChangeTransaction ():
+                variable2.value = 2
+
+            test.assert_results ()
+
+        # Must not emit for `variable1': value returned to original.
+        test.assert_results (2)
+
+
+    def test_transaction_3 (self):
+        test      = NotifyTestObject ()
+        variable  = Variable ()
+
+        variable.changed.connect (test.simple_handler)
+
+        with nested (ignoring_exceptions (), ChangeTransaction ()):
+            variable.value = 1
+            raise Exception
+
+        test.assert_results (1)
+
+        variable.value = 2
+        test.assert_results (1, 2)
+
+
+    def test_transaction_setter (self):
+        test     = NotifyTestObject ()
+        backend  = []
+        variable = Variable.derive_type ('DerivedVariable',
+                                         setter = lambda variable, value:
+                                                      backend.append (value)) (0)
+
+        variable.changed.connect (test.simple_handler)
+
+        with ChangeTransaction ():
+            variable.value = 1
+            variable.value = 0
+
+        # Set and reverted, so no emission even though the setter was called.
+        self.assertEqual (backend, [0, 1, 0])
+        test.assert_results ()
+
+        with ChangeTransaction ():
+            variable.value = 2
+
+        self.assertEqual (variable.value, 2)
+        test.assert_results (2)
+
+
+    def test_transaction_threads (self):
+        variable1 = Variable ()
+        variable2 = Variable ()
+        emitted   = []
+
+        def handler (value):
+            emitted.append ((value, threading.currentThread ().getName ()))
+
+        variable1.changed.connect (handler)
+        variable2.changed.connect (handler)
+
+        def change_in_thread ():
+            variable2.value = 2
+
+        with ChangeTransaction ():
+            variable1.value = 1
+
+            thread = threading.Thread (target = change_in_thread, name = 'other')
+            thread.start ()
+            thread.join ()
+
+            # Changes in other threads are not part of the transaction.
+            self.assertEqual (emitted, [(2, 'other')])
+
+        self.assertEqual (emitted, [(2, 'other'), (1, threading.currentThread ().getName ())])
+
+
+    def test_transaction_conditions (self):
+        test       = NotifyTestObject ()
+        condition1 = Condition (False)
+        condition2 = Condition (True)
+        negation   = ~condition1
+        both       = condition1 & condition2
+
+        negation.changed.connect (test.simple_handler)
+        both    .changed.connect (test.simple_handler)
+
+        with ChangeTransaction ():
+            condition1.state = True
+            condition2.state = False
+
+            test.assert_results ()
+
+        # `both' stays False, so only the negation emits.
+        test.assert_results (False)
+
+
+
 # Local variables:
 # mode: python
 # python-indent: 4
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+#--------------------------------------------------------------------#
+# This file is part of Py-notify.                                    #
+#                                                                    #
+# Copyright (C) 2007, 2008 Paul Pogonyshev.                          #
+#                                                                    #
+# This library is free software; you can redistribute it and/or      #
+# modify it under the terms of the GNU Lesser General Public License #
+# as published by the Free Software Foundation; either version 2.1   #
+# of the License, or (at your option) any later version.             #
+#                                                                    #
+# This library is distributed in the hope that it will be useful,    #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of     #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU  #
+# Lesser General Public License for more details.                    #
+#                                                                    #
+# You should have received a copy of the GNU Lesser General Public   #
+# License along with this library; if not, write to the Free         #
+# Software Foundation, Inc., 51 Franklin Street, Fifth Floor,        #
+# Boston, MA 02110-1301 USA                                          #
+#--------------------------------------------------------------------#
+
+
+
+
+# TODO: Merge this file into `test/signal.py' when Py-notify relies on Python 3.5 or
+#       later.
+
+
+import asyncio
+
+from notify.signal import AbstractSignal, AsyncSignal
+from test.__common import NotifyTestCase, NotifyTestObject
+
+
+__all__ = ('AsyncSignalCoroutineTestCase',)
+
+
+
+class AsyncSignalCoroutineTestCase (NotifyTestCase):
+
+    def test_coroutine_handlers (self):
+        test   = NotifyTestObject ()
+        signal = AsyncSignal (AbstractSignal.VALUE_LIST)
+
+        async def handler (value):
+            await asyncio.sleep (0)
+            test.simple_handler (value)
+            return value + 1
+
+        signal.connect (handler)
+        signal.connect (lambda value: value + 2)
+
+        self.assertEqual    (_run (signal.emit (1)), [2, 3])
+        test.assert_results (1)
+
+
+    def test_concurrent_handlers (self):
+        test   = NotifyTestObject ()
+        signal = AsyncSignal ()
+        events = []
+
+        # The first handler can only finish if the second one is already running, i.e.
+        # if handlers are awaited concurrently.
+        async def waiting_handler ():
+            await events[0].wait ()
+            test.simple_handler ('waiting')
+
+        async def starting_handler ():
+            events[0].set ()
+            test.simple_handler ('starting')
+
+        async def emit ():
+            # The event must be created in the loop that runs the emission.
+            events.append (asyncio.Event ())
+            await asyncio.wait_for (signal.emit (), 5)
+
+        signal.connect (waiting_handler)
+        signal.connect (starting_handler)
+
+        _run (emit ())
+        test.assert_results ('starting', 'waiting')
+
+
+    def test_cancellation (self):
+        test   = NotifyTestObject ()
+        signal = AsyncSignal (AbstractSignal.VALUE_LIST)
+
+        async def handler ():
+            await asyncio.sleep (10)
+            test.simple_handler ('finished')
+
+        signal.connect (handler)
+
+        self.assertRaises   ((asyncio.TimeoutError, asyncio.CancelledError),
+                             lambda: _run (asyncio.wait_for (signal.emit (), 0.01)))
+        self.assertEqual    (signal.emission_level, 0)
+        test.assert_results ()
+
+
+
+def _run (awaitable):
+    loop = asyncio.new_event_loop ()
+    try:
+        return loop.run_until_complete (awaitable)
+    finally:
+        loop.close ()
+
+
+
+# Local variables:
+# mode: python
+# python-indent: 4
+# indent-tabs-mode: nil
+# fill-column: 90
+# End:
@@ -88,6 +88,7 @@ class NotifyTestCase (unittest.TestCase):
 
     REASON_OLD_PYTHON                 = 'because they require a later Python version to run'
     REASON_INVALID_FOR_IMPLEMENTATION = 'because they are not valid for your Python implementation'
+    REASON_MISSING_MODULE             = 'because they require a module that is not installed'
 
     __test_skip_reasons = []
 
@@ -79,6 +79,11 @@ class AllTestCase (NotifyTestCase):
             self.assert_is_class (_class)
 
 
+    def test_array (self):
+        self.assert_is_class (VariableArray)
+        self.assert_is_class (ConditionArray)
+
+
     def test_base (self):
         self.assert_is_class (AbstractValueObject)
 
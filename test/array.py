@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+
+#--------------------------------------------------------------------#
+# This file is part of Py-notify.                                    #
+#                                                                    #
+# Copyright (C) 2007, 2008 Paul Pogonyshev.                          #
+#                                                                    #
+# This library is free software; you can redistribute it and/or      #
+# modify it under the terms of the GNU Lesser General Public License #
+# as published by the Free Software Foundation; either version 2.1   #
+# of the License, or (at your option) any later version.             #
+#                                                                    #
+# This library is distributed in the hope that it will be useful,    #
+# but WITHOUT ANY WARRANTY; without even the implied warranty of     #
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU  #
+# Lesser General Public License for more details.                    #
+#                                                                    #
+# You should have received a copy of the GNU Lesser General Public   #
+# License along with this library; if not, write to the Free         #
+# Software Foundation, Inc., 51 Franklin Street, Fifth Floor,        #
+# Boston, MA 02110-1301 USA                                          #
+#--------------------------------------------------------------------#
+
+
+if __name__ == '__main__':
+    import os
+    import sys
+
+    sys.path.insert (0, os.path.join (sys.path[0], os.pardir))
+
+
+import unittest
+import weakref
+
+from notify.array     import VariableArray, ConditionArray
+from notify.base      import ChangeCoalescer
+from notify.condition import AbstractCondition
+from notify.variable  import AbstractVariable
+from test.__common    import NotifyTestCase, NotifyTestObject
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+
+if NotifyTestCase.note_skipped_tests (numpy is not None, NotifyTestCase.REASON_MISSING_MODULE):
+
+    class VariableArrayTestCase (NotifyTestCase):
+
+        def test_mutable (self):
+            array = VariableArray ([1, 2, 3])
+
+            self.assert_(array.mutable)
+            self.assert_(array[0].mutable)
+
+
+        def test_get (self):
+            array = VariableArray ([1, 2, 3])
+
+            self.assertEqual (list (array.get ()), [1, 2, 3])
+            self.assertEqual (len (array), 3)
+            self.assertRaises (ValueError, lambda: array.get ().__setitem__(0, 10))
+
+
+        def test_set (self):
+            test  = NotifyTestObject ()
+            array = VariableArray ([1, 2, 3, 4])
+            array.elements_changed.connect (lambda indices, values:
+                                                test.simple_handler (list (indices),
+                                                                     list (values)))
+
+            self.assert_(not array.set ([1, 2, 3, 4]))
+            self.assert_(array.set ([1, 20, 3, 40]))
+            self.assertEqual (list (array.get ()), [1, 20, 3, 40])
+
+            test.assert_results (([1, 3], [20, 40]))
+
+
+        def test_set_elements (self):
+            test  = NotifyTestObject ()
+            array = VariableArray ([1, 2, 3, 4])
+            array.elements_changed.connect (lambda indices, values:
+                                                test.simple_handler (list (indices)))
+
+            self.assert_(not array.set_elements ([0, 1], [1, 2]))
+            self.assert_(array.set_elements ([3, 0, 1], [5, 5, 2]))
+            self.assert_(array.set_elements (slice (2, None), 0))
+            self.assert_(not array.set_elements ([1, 1], [3, 2]))
+
+            test.assert_results ([0, 3], [2, 3])
+
+
+        def test_changed (self):
+            test  = NotifyTestObject ()
+            array = VariableArray ([1, 2])
+            array.changed.connect (lambda values: test.simple_handler (list (values)))
+
+            array.set ([1, 3])
+            array.set ([1, 3])
+            array.set_elements (0, 2)
+
+            test.assert_results ([1, 3], [2, 3])
+
+
+        def test_coalescing (self):
+            test      = NotifyTestObject ()
+            array     = VariableArray ([1.0, 2.0])
+            coalescer = ChangeCoalescer ()
+            array.changed.connect (lambda values: test.simple_handler (list (values)))
+
+            coalescer.add (array)
+
+            array.set_elements ([0], [5.0])
+            array.set_elements ([0], [1.0])
+            self.assert_(not coalescer.flush ())
+
+            array.set_elements ([0], [5.0])
+            array.set_elements ([1], [6.0])
+            self.assert_(coalescer.flush ())
+
+            coalescer.remove (array)
+            test.assert_results ([5.0, 6.0])
+
+
+        def test_changes_frozen (self):
+            test  = NotifyTestObject ()
+            array = VariableArray ([1, 2])
+            array.changed.connect (lambda values: test.simple_handler (list (values)))
+
+            array.with_changes_frozen (lambda: (array.set ([3, 4]), array.set ([1, 2])))
+            array.with_changes_frozen (lambda: array.set ([3, 4]))
+
+            test.assert_results ([3, 4])
+
+
+        def test_shape (self):
+            array = VariableArray ([1, 2, 3])
+
+            self.assertRaises (ValueError, lambda: array.set ([1, 2]))
+            self.assertRaises (ValueError, lambda: VariableArray ([[1, 2], [3, 4]]))
+
+
+        def test_elements (self):
+            test  = NotifyTestObject ()
+            array = VariableArray ([1, 2, 3])
+
+            element = array[-1]
+            self.assert_(isinstance (element, AbstractVariable))
+            self.assert_(array[2] is element)
+            self.assertEqual (element.index, 2)
+            self.assertEqual (element.get (), 3)
+            self.assertRaises (IndexError, lambda: array[3])
+
+            array[1].store (test.simple_handler)
+
+            array.set ([10, 20, 30])
+            array.set_elements (0, 100)
+            array[1].set (200)
+
+            self.assertEqual (list (array.get ()), [100, 200, 30])
+
+            array[1].changed.disconnect (test.simple_handler)
+            test.assert_results (2, 20, 200)
+
+
+
+    class ConditionArrayTestCase (NotifyTestCase):
+
+        def test_get (self):
+            calls = []
+
+            def is_positive (values):
+                calls.append (len (values))
+                return values > 0
+
+            array      = VariableArray ([1, -2, 3])
+            conditions = array.predicate (is_positive)
+
+            self.assert_(isinstance (conditions, ConditionArray))
+            self.assertEqual (list (conditions.get ()), [True, False, True])
+            self.assertEqual (list (conditions.get ()), [True, False, True])
+            self.assertEqual (calls, [3])
+
+            array.set_elements (1, 2)
+            self.assertEqual (list (conditions.get ()), [True, True, True])
+            self.assertEqual (calls, [3, 3])
+
+
+        def test_elements_changed (self):
+            test  = NotifyTestObject ()
+            calls = []
+
+            def is_positive (values):
+                calls.append (len (values))
+                return values > 0
+
+            array      = VariableArray ([1, -2, 3, 4])
+            conditions = array.predicate (is_positive)
+            handler    = lambda indices, states: test.simple_handler (list (indices),
+                                                                      list (states))
+
+            conditions.elements_changed.connect (handler)
+            self.assertEqual (calls, [4])
+
+            array.set ([5, 6, 7, 4])
+            array.set_elements ([0, 3], [-1, 10])
+
+            conditions.elements_changed.disconnect (handler)
+            self.collect_garbage ()
+
+            array.set ([1, 1, 1, 1])
+            self.assertEqual (calls, [4, 3, 2])
+
+            test.assert_results (([1], [True]), ([0], [False]))
+
+
+        def test_garbage_collection (self):
+            test    = NotifyTestObject ()
+            array   = VariableArray ([1, -2, 3])
+            handler = lambda indices, states: test.simple_handler (list (indices),
+                                                                   list (states))
+
+            # Signals only reference their condition arrays weakly.
+            elements_changed = array.predicate (lambda values: values > 0).elements_changed
+            elements_changed.connect (handler)
+
+            conditions = array.predicate (lambda values: values > 2)
+            conditions.changed.connect (test.simple_handler)
+
+            # Condition arrays in use must not be garbage-collected even if not referenced.
+            conditions_reference = weakref.ref (conditions)
+            del conditions
+            self.collect_garbage ()
+
+            array.set ([-1, -2, 3])
+            array.set ([-1, 5, 3])
+
+            self.assertEqual (test.results[:2], [([0], [False]), ([1], [True])])
+            self.assertEqual (list (test.results[2]), [False, True, True])
+
+            elements_changed.disconnect (handler)
+            conditions_reference ().changed.disconnect (test.simple_handler)
+            del elements_changed
+            self.collect_garbage ()
+
+            self.assertEqual (conditions_reference (), None)
+
+
+        def test_elements (self):
+            test       = NotifyTestObject ()
+            array      = VariableArray ([1, -2, 3])
+            conditions = array.predicate (lambda values: values > 0)
+
+            self.assert_(isinstance (conditions[0], AbstractCondition))
+            self.assert_(conditions[1] is conditions[-2])
+            self.assert_(not conditions[1].mutable)
+
+            conditions[1].store (test.simple_handler)
+
+            array.set ([2, 3, 4])
+            array.set ([3, 4, 5])
+            array[1].set (-4)
+
+            conditions[1].changed.disconnect (test.simple_handler)
+            test.assert_results (False, True, False)
+
+
+        def test_errors (self):
+            array = VariableArray ([1, 2])
+
+            self.assertRaises (TypeError, lambda: array.predicate (None))
+            self.assertRaises (TypeError, lambda: ConditionArray (bool, [1, 2]))
+            self.assertRaises (ValueError, lambda: array.predicate (lambda values: True).get ())
+
+
+
+if __name__ == '__main__':
+    unittest.main ()
+
+
+
+# Local variables:
+# mode: python
+# python-indent: 4
+# indent-tabs-mode: nil
+# fill-column: 90
+# End:
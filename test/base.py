@@ -31,7 +31,7 @@ if __name__ == '__main__':
 
 import unittest
 
-from notify.base      import AbstractValueObject
+from notify.base      import AbstractValueObject, ChangeCoalescer
 from notify.condition import Condition
 from notify.variable  import AbstractVariable, Variable
 from test.__common    import NotifyTestCase, NotifyTestObject
@@ -77,6 +77,125 @@ class BaseInternalsTestCase (NotifyTestCase):
 
 
 
+class BaseChangeCoalescerTestCase (NotifyTestCase):
+
+    def test_coalescing_1 (self):
+        test      = NotifyTestObject ()
+        variable1 = Variable ()
+        variable2 = Variable (0)
+        coalescer = ChangeCoalescer ()
+
+        variable1.changed.connect (test.simple_handler)
+        variable2.changed.connect (test.simple_handler)
+
+        coalescer.add (variable1)
+        coalescer.add (variable2)
+
+        for k in range (10):
+            variable2.value = k
+            variable1.value = k
+
+        test.assert_results ()
+
+        self.assert_        (coalescer.flush ())
+        self.assert_        (not coalescer.flush ())
+        test.assert_results (9, 9)
+
+        coalescer.remove (variable1)
+        coalescer.remove (variable2)
+
+
+    def test_coalescing_2 (self):
+        test      = NotifyTestObject ()
+        variable  = Variable ()
+        coalescer = ChangeCoalescer ()
+
+        variable.changed.connect (test.simple_handler)
+        coalescer.add (variable)
+
+        variable.value = 1
+        variable.value = None
+        self.assert_ (not coalescer.flush ())
+
+        variable.value = 2
+        coalescer.remove (variable)
+
+        # Not coalesced anymore.
+        variable.value = 3
+
+        test.assert_results (2, 3)
+
+
+    def test_coalescing_schedule (self):
+        test      = NotifyTestObject ()
+        variable  = Variable ()
+        scheduled = []
+        coalescer = ChangeCoalescer (scheduled.append)
+
+        variable.changed.connect (test.simple_handler)
+        coalescer.add (variable)
+
+        variable.value = 1
+        variable.value = 2
+        self.assertEqual (len (scheduled), 1)
+
+        scheduled.pop () ()
+        test.assert_results (2)
+
+        variable.value = 3
+        self.assertEqual (len (scheduled), 1)
+
+        coalescer.remove (variable)
+        test.assert_results (2, 3)
+
+
+    def test_coalescing_errors (self):
+        variable   = Variable ()
+        coalescer1 = ChangeCoalescer ()
+        coalescer2 = ChangeCoalescer ()
+
+        self.assert_      (coalescer1.add (variable))
+        self.assert_      (not coalescer1.add (variable))
+        self.assertRaises (ValueError, lambda: coalescer2.add (variable))
+        self.assertRaises (TypeError,  lambda: coalescer2.add (object ()))
+
+        self.assert_      (not coalescer2.remove (variable))
+        self.assert_      (coalescer1.remove (variable))
+
+
+    def test_coalescing_representation (self):
+        variable  = Variable ()
+        coalescer = ChangeCoalescer ()
+
+        coalescer.add (variable)
+        variable.value = 1
+
+        self.assert_(repr (coalescer).endswith (': 1 objects, 1 changed>'))
+
+        coalescer.remove (variable)
+
+
+    def test_coalescing_garbage_collection (self):
+        test      = NotifyTestObject ()
+        variable  = Variable ()
+        coalescer = ChangeCoalescer ()
+
+        variable.changed.connect (test.simple_handler)
+        coalescer.add (variable)
+
+        variable.value = 1
+
+        del coalescer
+        self.collect_garbage ()
+
+        # The variable must not stay coalesced by a coalescer that no longer exists.
+        variable.value = 2
+        self.assert_ (ChangeCoalescer ().add (variable))
+
+        test.assert_results (2)
+
+
+
 class BaseWithChangesFrozenTestCase (NotifyTestCase):
 
     def test_with_changes_frozen_1 (self):
@@ -259,7 +378,8 @@ class BaseDerivationTestCase (NotifyTestCase):
 import __future__
 
 if NotifyTestCase.note_skipped_tests ('with_statement' in __future__.all_feature_names):
-    from test._2_5.base import BaseContextManagerTestCase, BaseChangesFrozenContextManagerTestCase
+    from test._2_5.base import BaseContextManagerTestCase, BaseChangesFrozenContextManagerTestCase, \
+         BaseChangeTransactionTestCase
 
 
 
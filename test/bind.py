@@ -103,6 +103,25 @@ class BindingTestCase (NotifyTestCase):
         self.assertEqual (RaisingWeakBinding (DUMMY.keyword_dict_function, (), None, keywords) (),
                           keywords)
 
+    def test_invocation_with_arguments_and_keywords (self):
+        def function (*arguments, **keywords):
+            return arguments, keywords
+
+        binding = Binding (function, (1, 2, 3, 4, 5, 6, 7, 8), { 'a': 1 })
+        self.assertEqual (binding (9, 10), ((1, 2, 3, 4, 5, 6, 7, 8, 9, 10), { 'a': 1 }))
+        self.assertEqual (binding (a = 2), ((1, 2, 3, 4, 5, 6, 7, 8), { 'a': 2 }))
+
+
+    def test_overriden_getter (self):
+        class DerivedBinding (Binding):
+            def _get_arguments (self):
+                return (100,) + super (DerivedBinding, self)._get_arguments ()
+
+        self.assertEqual (DerivedBinding (DUMMY.identity_function, (33,)) ('test'),
+                          (100, 33, 'test'))
+        self.assertEqual (DerivedBinding (DUMMY.identity_function, (33,)).im_args,
+                          (100, 33))
+
 
     if NotifyTestCase.note_skipped_tests (not NotifyTestCase.ALL_OBJECTS_ARE_WEAKLY_REFERABLE,
                                           NotifyTestCase.REASON_INVALID_FOR_IMPLEMENTATION):
@@ -225,6 +244,34 @@ class BindingTestCase (NotifyTestCase):
                                                             keywords = keywords2))
 
 
+    def test_hash (self):
+        for binding_type in (Binding, WeakBinding, RaisingWeakBinding):
+            self.assertEqual (hash (binding_type (DUMMY.identity_function)),
+                              hash (DUMMY.identity_function))
+            self.assertEqual (hash (binding_type (Dummy.static_identity)),
+                              hash (Dummy.static_identity))
+
+            # Unhashable arguments make the binding unhashable, but it must still compare.
+            self.assertRaises (TypeError,
+                               lambda: hash (binding_type (DUMMY.identity_function, ([],))))
+            self.assert_equal_thoroughly (binding_type (DUMMY.identity_function, ([],)),
+                                          binding_type (DUMMY.identity_function, ([],)))
+
+
+    def test_representation (self):
+        for binding_type in (Binding, WeakBinding, RaisingWeakBinding):
+            representation = repr (binding_type (DUMMY.identity_function, (1,)))
+
+            self.assert_(representation.startswith ('<bound %s.%s at 0x'
+                                                    % (binding_type.__module__,
+                                                       binding_type.__name__)))
+            self.assert_(representation.endswith ('for Dummy.identity_function of %r (1, ...)>'
+                                                  % DUMMY))
+
+            self.assert_(str (binding_type (Dummy.static_identity)).startswith
+                         ('<%s at 0x' % binding_type.__name__))
+
+
     def test_garbage_collection_1 (self):
         object = Dummy ()
         method = WeakBinding (object.identity_function)
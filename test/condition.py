@@ -29,11 +29,13 @@ if __name__ == '__main__':
     sys.path.insert (0, os.path.join (sys.path[0], os.pardir))
 
 
+import threading
 import unittest
 import weakref
 import operator
 
 from notify.condition import AbstractCondition, AbstractStateTrackingCondition, Condition, \
+                             all_of, any_of, at_least, \
                              PredicateCondition, WatcherCondition
 from notify.variable  import Variable
 from test.__common    import NotifyTestCase, NotifyTestObject
@@ -260,6 +262,175 @@ class LogicConditionTestCase (NotifyTestCase):
         test.assert_results (True, False)
 
 
+    def test_all_of (self):
+        test = NotifyTestObject ()
+
+        conditions = [Condition (False) for k in range (10)]
+
+        all_condition = all_of (*conditions)
+        all_condition.store (test.simple_handler)
+
+        for condition in conditions:
+            condition.state = True
+
+        self.assertEqual (all_condition.state, True)
+
+        conditions[5].state = False
+        conditions[6].state = False
+        conditions[5].state = True
+
+        self.assertEqual (all_condition.state, False)
+
+        test.assert_results (False, True, False)
+
+
+    def test_any_of (self):
+        test = NotifyTestObject ()
+
+        conditions = [Condition (False) for k in range (10)]
+
+        any_condition = any_of (*conditions)
+        any_condition.store (test.simple_handler)
+
+        conditions[0].state = True
+        conditions[1].state = True
+        conditions[0].state = False
+
+        self.assertEqual (any_condition.state, True)
+
+        conditions[1].state = False
+
+        self.assertEqual (any_condition.state, False)
+
+        test.assert_results (False, True, False)
+
+
+    def test_all_of_any_of_special_cases (self):
+        condition = Condition (False)
+
+        true  = condition.TRUE
+        false = condition.FALSE
+
+        self.assert_ (all_of ()                  is true)
+        self.assert_ (any_of ()                  is false)
+        self.assert_ (all_of (condition)         is condition)
+        self.assert_ (any_of (condition, false)  is condition)
+        self.assert_ (all_of (condition, false)  is false)
+        self.assert_ (any_of (condition, true)   is true)
+
+        self.assertRaises (TypeError, lambda: all_of (condition, None))
+
+
+    def test_at_least (self):
+        test = NotifyTestObject ()
+
+        conditions = [Condition (False) for k in range (5)]
+
+        at_least_condition = at_least (3, conditions)
+        at_least_condition.store (test.simple_handler)
+
+        conditions[0].state = True
+        conditions[1].state = True
+        self.assertEqual (at_least_condition.state, False)
+
+        conditions[2].state = True
+        conditions[3].state = True
+        self.assertEqual (at_least_condition.state, True)
+
+        conditions[0].state = False
+        conditions[1].state = False
+        self.assertEqual (at_least_condition.state, False)
+
+        test.assert_results (False, True, False)
+
+
+    def test_at_least_special_cases (self):
+        condition1 = Condition (False)
+        condition2 = Condition (True)
+        true       = condition1.TRUE
+        false      = condition1.FALSE
+
+        self.assert_ (at_least (0, [condition1, condition2])       is true)
+        self.assert_ (at_least (3, [condition1, condition2])       is false)
+        self.assert_ (at_least (2, [condition1, true])             is condition1)
+        self.assert_ (at_least (1, [condition1, false])            is condition1)
+        self.assertEqual (at_least (2, (condition1, condition2)).state, False)
+        self.assertEqual (at_least (1, (condition1, condition2)).state, True)
+
+        self.assertRaises (TypeError, lambda: at_least (1.5, [condition1]))
+        self.assertRaises (TypeError, lambda: at_least (1,   [condition1, None]))
+
+
+    def test_diamond_1 (self):
+        test = NotifyTestObject ()
+
+        condition = Condition (False)
+        negation  = ~condition
+
+        # Always true, but naive propagation would make it briefly false.
+        or_condition = condition | negation
+        or_condition.changed.connect (test.simple_handler)
+
+        xor_condition = condition ^ negation
+        xor_condition.changed.connect (test.simple_handler)
+
+        condition.state = True
+        condition.state = False
+
+        test.assert_results ()
+
+
+    def test_diamond_2 (self):
+        test = NotifyTestObject ()
+
+        condition1 = Condition (False)
+        condition2 = Condition (False)
+        negation   = ~condition1
+
+        and_condition = (condition1 & condition2) | (negation & condition2)
+        and_condition.changed.connect (test.simple_handler)
+
+        # Handlers must only see consistent states of all involved conditions.
+        handler = lambda state: test.simple_handler (negation.state)
+        and_condition.changed.connect (handler)
+
+        condition2.state = True
+        condition1.state = True
+        condition2.state = False
+
+        and_condition.changed.disconnect (handler)
+        test.assert_results (True, True, False, False)
+
+
+    def test_propagation_threads (self):
+        emitted    = []
+        condition1 = Condition (False)
+        condition2 = Condition (False)
+        negation   = ~condition2
+
+        def set_in_thread (state):
+            thread = threading.Thread (target = lambda: condition2.set (True), name = 'other')
+            thread.start ()
+            thread.join ()
+
+            # Not postponed until the propagation in this thread ends.
+            emitted.append ('joined')
+
+        def handler (state):
+            emitted.append ((state, threading.currentThread ().getName ()))
+
+        negation.changed.connect (handler)
+
+        # Propagation of this change is in progress while the other thread changes
+        # `condition2'.
+        condition1.changed.connect (set_in_thread)
+        condition1.state = True
+        condition1.changed.disconnect (set_in_thread)
+
+        self.assertEqual (emitted, [(False, 'other'), 'joined'])
+        negation.changed.disconnect (handler)
+
+
 
 class PredicateConditionTestCase (NotifyTestCase):
 
@@ -348,6 +519,29 @@ class WatcherConditionTestCase (NotifyTestCase):
         test.assert_results (True, False)
 
 
+    def test_watcher_condition_diamond (self):
+        test      = NotifyTestObject ()
+        condition = Condition (False)
+        true      = Condition (True)
+        deep      = ((condition & true) & true) & true
+
+        watcher = WatcherCondition ()
+        xor     = watcher ^ condition
+
+        # `xor' already depends on `watcher', so it must be moved below `deep' too.
+        watcher.watch (deep)
+
+        xor.changed.connect (test.simple_handler)
+
+        # Always false, but if `xor' was updated before `watcher', it would briefly be
+        # true.
+        condition.state = True
+        condition.state = False
+
+        xor.changed.disconnect (test.simple_handler)
+        test.assert_results ()
+
+
     def test_watcher_condition_error_1 (self):
         self.assertRaises (TypeError, lambda: WatcherCondition (25))
 
@@ -29,11 +29,24 @@ if __name__ == '__main__':
     sys.path.insert (0, os.path.join (sys.path[0], os.pardir))
 
 
+import sys
+import threading
 import unittest
 
-from notify.signal import AbstractSignal, Signal
+from notify.signal import AbstractSignal, Signal, CleanSignal, ThreadSafeSignal, ExecutorSignal, \
+                          AsyncSignal, SignalFactory, TopicSignalFactory, signal_property
 from test.__common import NotifyTestCase, NotifyTestObject
 
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:
+    ThreadPoolExecutor = None
+
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
+
 
 
 # Note: generally, don't reuse one signal objects in several test methods.  If the signal
@@ -154,6 +167,128 @@ class SimpleSignalTestCase (NotifyTestCase):
         test.assert_results (1, 1, 1, 2, 2)
 
 
+    def test_disconnect_by_id (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        connection_1 = signal.connect_with_id (test.simple_handler)
+        connection_2 = signal.connect_with_id (test.simple_handler_100)
+        signal.connect (test.simple_handler, 'plain')
+        signal.emit (1)
+
+        self.assert_ (signal.disconnect_by_id (connection_1.id))
+        self.assert_ (not signal.disconnect_by_id (connection_1.id))
+        signal.emit (2)
+
+        self.assert_ (connection_2.disconnect ())
+        self.assert_ (not connection_2.disconnect ())
+        signal.emit (3)
+
+        self.assertEqual    (signal.count_handlers (), 1)
+        test.assert_results (1, 101, ('plain', 1), 102, ('plain', 2), ('plain', 3))
+
+
+    def test_disconnect_by_id_blocked (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        connection_1 = signal.connect_with_id (test.simple_handler)
+        connection_2 = signal.connect_with_id (test.simple_handler)
+        signal.connect (test.simple_handler_100)
+        signal.block (test.simple_handler)
+
+        # An equal handler is still connected, so it must remain blocked.
+        self.assert_ (connection_1.disconnect ())
+        signal.emit (1)
+
+        self.assert_ (connection_2.disconnect ())
+        signal.connect (test.simple_handler)
+        signal.emit (2)
+
+        test.assert_results (101, 102, 2)
+
+
+    def test_disconnect_by_id_after_disconnect (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        signal.connect (test.simple_handler)
+        connections = [signal.connect_with_id (test.simple_handler, k) for k in range (4)]
+
+        # Plain disconnection removes the first handler and must not confuse identifiers
+        # of the remaining ones.
+        signal.disconnect (test.simple_handler)
+
+        self.assert_ (connections[2].disconnect ())
+        self.assert_ (connections[0].disconnect ())
+        signal.emit ()
+
+        test.assert_results (1, 3)
+
+
+    def test_connect_with_priority (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        signal.connect               (test.simple_handler, 'a')
+        signal.connect_with_priority (-1, test.simple_handler, 'b')
+        signal.connect_with_priority (5, test.simple_handler, 'c')
+        signal.connect               (test.simple_handler, 'd')
+        signal.connect_with_priority (5, test.simple_handler, 'e')
+        signal.connect_with_priority (-1, test.simple_handler, 'f')
+        signal.emit ()
+
+        self.assert_ (signal.disconnect (test.simple_handler, 'c'))
+        signal.connect_with_priority (5, test.simple_handler, 'c')
+        signal.emit ()
+
+        test.assert_results ('c', 'e', 'a', 'd', 'b', 'f',
+                             'e', 'c', 'a', 'd', 'b', 'f')
+
+
+    def test_connect_with_priority_and_id (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        connection_1 = signal.connect_with_id (test.simple_handler, 1)
+        signal.connect_with_priority (-1, test.simple_handler, 2)
+        connection_3 = signal.connect_with_id (test.simple_handler, 3)
+        signal.connect_with_priority (1, test.simple_handler, 4)
+        signal.emit ()
+
+        # Identifiers must still point to the right handlers after insertions.
+        self.assert_ (connection_3.disconnect ())
+        signal.emit ()
+
+        self.assert_ (connection_1.disconnect ())
+        signal.emit ()
+
+        test.assert_results (4, 1, 3, 2,
+                             4, 1, 2,
+                             4, 2)
+
+
+    def test_connect_with_priority_and_id_compacting (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        connections = [signal.connect_with_id (test.simple_handler, k) for k in range (6)]
+
+        # Disconnecting half of the handlers compacts the list, inserting shifts the rest.
+        for k in (0, 2, 4):
+            self.assert_ (connections[k].disconnect ())
+
+        signal.connect_with_priority (1, test.simple_handler, 'high')
+        signal.emit ()
+
+        self.assert_ (connections[3].disconnect ())
+        self.assert_ (not connections[3].disconnect ())
+        signal.emit ()
+
+        test.assert_results ('high', 1, 3, 5,
+                             'high', 1, 5)
+
+
     def test_connect_disconnect (self):
         test   = NotifyTestObject ()
         signal = Signal ()
@@ -207,6 +342,33 @@ class SimpleSignalTestCase (NotifyTestCase):
         test.assert_results (1, 3)
 
 
+    def test_nested_block (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        signal.connect (test.simple_handler)
+        signal.connect (test.simple_keywords_handler, a = 1)
+
+        signal.block (test.simple_handler)
+        signal.block (test.simple_handler)
+        signal.block (test.simple_keywords_handler, a = 1)
+        signal.block (test.simple_keywords_handler, a = 1)
+        signal.emit (1)
+
+        self.assert_ (signal.unblock (test.simple_handler))
+        self.assert_ (signal.unblock (test.simple_keywords_handler, a = 1))
+        signal.emit (2)
+
+        self.assert_ (signal.unblock (test.simple_handler))
+        self.assert_ (signal.unblock (test.simple_keywords_handler, a = 1))
+        signal.emit (3)
+
+        self.assert_ (not signal.unblock (test.simple_handler))
+        self.assert_ (not signal.unblock (test.simple_keywords_handler, a = 1))
+
+        test.assert_results (3, (3, { 'a': 1 }))
+
+
     def test_emission_level_1 (self):
         signal = Signal (Signal.VALUE_LIST)
 
@@ -276,6 +438,32 @@ class SimpleSignalTestCase (NotifyTestCase):
         test.assert_results (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10)
 
 
+    def test_emit_many (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        signal.connect (test.simple_handler)
+        signal.connect (test.simple_handler_100)
+
+        self.assertEqual    (signal.emit_many ([(1,), (2,), (3,)]), None)
+        test.assert_results (1, 101, 2, 102, 3, 103)
+
+
+    def test_emit_many_emission_stop (self):
+        def stop_emission_on_2 (number):
+            if number == 2:
+                signal.stop_emission ()
+
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        signal.connect (stop_emission_on_2)
+        signal.connect (test.simple_handler)
+        signal.emit_many ([(1,), (2,), (3,)])
+
+        test.assert_results (1, 3)
+
+
     def test_emission_stop_3 (self):
         def stop_emission ():
             was_stopped = signal.emission_stopped
@@ -370,6 +558,100 @@ class RecursiveEmissionSignalTestCase (NotifyTestCase):
         test.assert_results (0, 1, 2)
 
 
+    def test_disconnect_by_id_in_emission (self):
+        test        = NotifyTestObject ()
+        signal      = Signal ()
+        connections = []
+
+        def disconnect_all_by_id ():
+            for connection in connections:
+                connection.disconnect ()
+
+        signal.connect (disconnect_all_by_id)
+        connections.append (signal.connect_with_id (test.simple_handler, 1))
+        connections.append (signal.connect_with_id (test.simple_handler, 2))
+        signal.emit ()
+        signal.emit ()
+
+        self.assert_        (not signal.disconnect_by_id (connections[0].id))
+        self.assertEqual    (signal.count_handlers (), 1)
+        test.assert_results ()
+
+        signal.disconnect (disconnect_all_by_id)
+
+
+    def test_connect_in_lone_handler_emission (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        def connecting_handler (value):
+            test.simple_handler (value)
+            if value == 1:
+                signal.connect (test.simple_handler_100)
+
+        signal.connect (connecting_handler)
+        signal.emit (1)
+        signal.emit (2)
+
+        test.assert_results (1, 101, 2, 102)
+
+
+    def test_replace_lone_handler_in_emission (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        def replacing_handler (value):
+            test.simple_handler (value)
+            signal.disconnect (replacing_handler)
+            signal.connect (test.simple_handler_100)
+
+        signal.connect (replacing_handler)
+        signal.emit (1)
+        signal.emit (2)
+
+        self.assertEqual    (signal.count_handlers (), 1)
+        test.assert_results (1, 101, 102)
+
+
+    def test_connect_with_priority_in_emission (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        def connecting_handler ():
+            signal.disconnect (connecting_handler)
+            signal.connect_with_priority (1, test.simple_handler, 'high')
+            signal.connect_with_priority (-1, test.simple_handler, 'low')
+
+        signal.connect (connecting_handler)
+        signal.connect (test.simple_handler, 'plain')
+        signal.emit ()
+
+        # The handler with high priority cannot be called in the same emission, since it
+        # ends up before the current one.
+        self.assertEqual (signal.count_handlers (), 3)
+        signal.emit ()
+
+        test.assert_results ('plain', 'low',
+                             'high', 'plain', 'low')
+
+
+    def test_disconnect_by_id_in_emission_with_priority (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        def connecting_handler ():
+            signal.disconnect (connecting_handler)
+            connection = signal.connect_with_id (test.simple_handler, 'plain')
+            self.assert_ (connection.disconnect ())
+
+        signal.connect_with_priority (1, connecting_handler)
+        signal.connect_with_priority (-1, test.simple_handler, 'low')
+        signal.emit ()
+        signal.emit ()
+
+        test.assert_results ('low', 'low')
+
+
     def test_block_in_recursive_emission_1 (self):
         test = self._RecursiveTestObject (Signal ())
 
@@ -522,6 +804,17 @@ class AccumulatorSignalTestCase (NotifyTestCase):
         self.assertEqual (signal.emit (), 'I accept')
 
 
+    def test_any_accepts_accumulator_with_priority (self):
+        test   = NotifyTestObject ()
+        signal = Signal (AbstractSignal.ANY_ACCEPTS)
+
+        signal.connect (test.simple_handler)
+        signal.connect_with_priority (1, lambda: 'I accept')
+
+        self.assertEqual    (signal.emit (), 'I accept')
+        test.assert_results ()
+
+
     def test_all_accept_accumulator (self):
         signal = Signal (AbstractSignal.ALL_ACCEPT)
         self.assertEqual (signal.emit (), True)
@@ -562,6 +855,16 @@ class AccumulatorSignalTestCase (NotifyTestCase):
         self.assertEqual (signal.emit (), [50, None, ()])
 
 
+    def test_emit_many_with_accumulator (self):
+        signal = Signal (AbstractSignal.VALUE_LIST)
+        self.assertEqual (signal.emit_many ([(), ()]), [[], []])
+
+        signal.connect (lambda *arguments: len (arguments))
+        signal.connect (lambda *arguments: arguments)
+        self.assertEqual (signal.emit_many ([(), (1, 2), [3]]),
+                          [[0, ()], [2, (1, 2)], [1, (3,)]])
+
+
     def test_custom_accumulator (self):
 
         class CustomAccumulator (AbstractSignal.AbstractAccumulator):
@@ -597,6 +900,27 @@ class AccumulatorSignalTestCase (NotifyTestCase):
 
 
 
+    def test_derived_builtin_accumulator (self):
+
+        class FirstValueAccumulator (AbstractSignal.LastValueAccumulator):
+
+            def should_continue (self, accumulated_value):
+                return False
+
+
+        signal = Signal (FirstValueAccumulator ())
+        signal.connect (lambda: 'first')
+        signal.connect (lambda: 'second')
+
+        self.assertEqual (signal.emit (), 'first')
+
+        signal = Signal (FirstValueAccumulator ())
+        signal.connect (lambda: 'lone')
+
+        self.assertEqual (signal.emit (), 'lone')
+
+
+
 # Note: we explicitly test protected field of `Signal' class, because there is nothing
 # public that indicates number of garbage-collected, but not yet removed handlers.  Yet we
 # want that a call to emit() does remove such handlers, so that list of signal handlers
@@ -691,6 +1015,24 @@ class HandlerGarbageCollectionTestCase (NotifyTestCase):
         test.assert_results (101, 102)
 
 
+    def test_disconnect_by_id_garbage_collected (self):
+        test   = NotifyTestObject ()
+        signal = Signal ()
+
+        handler    = HandlerGarbageCollectionTestCase.HandlerObject (test)
+        connection = signal.connect_with_id (handler.simple_handler)
+        signal.connect (test.simple_handler)
+
+        del handler
+        self.collect_garbage ()
+
+        self.assert_(not connection.disconnect ())
+        signal.emit (1)
+
+        self.assertEqual    (signal.count_handlers (), 1)
+        test.assert_results (1)
+
+
 
 class ExoticSignalTestCase (NotifyTestCase):
 
@@ -760,11 +1102,695 @@ class ExoticSignalTestCase (NotifyTestCase):
 
 
 
+class SignalPropertyTestCase (NotifyTestCase):
+
+    class Model (object):
+        __slots__ = ('_created_signal', '_deleted_signal', '__weakref__')
+
+        created = signal_property (clean = False)
+        deleted = signal_property (AbstractSignal.VALUE_LIST)
+
+
+    def test_lazy_creation (self):
+        test  = NotifyTestObject ()
+        model = self.Model ()
+
+        self.assert_      (not self.Model.created.has_handlers (model))
+        self.assertEqual  (self.Model.created.emit (model, 1), None)
+        self.assertEqual  (self.Model.deleted.emit (model, 1), [])
+        self.assertRaises (AttributeError, lambda: model._created_signal)
+
+        model.created.connect (test.simple_handler)
+        self.assert_      (model.created is model._created_signal)
+        self.assert_      (self.Model.created.has_handlers (model))
+
+        self.Model.created.emit (model, 2)
+        model.created (3)
+
+        test.assert_results (2, 3)
+
+
+    def test_signal_types (self):
+        model = self.Model ()
+
+        self.assertEqual  (type (model.created), Signal)
+        self.assertEqual  (type (model.deleted), CleanSignal)
+        self.assert_      (model.deleted.parent is model)
+        self.assertEqual  (model.deleted.accumulator, AbstractSignal.VALUE_LIST)
+
+        def reassign ():
+            model.created = Signal ()
+
+        self.assertRaises (AttributeError, reassign)
+
+
+    def test_clean_signal (self):
+        model = self.Model ()
+
+        def handler ():
+            return 'deleted'
+
+        model.deleted.connect (handler)
+        self.assertEqual (model.deleted (), ['deleted'])
+        self.assertEqual (self.Model.deleted.emit (model), ['deleted'])
+
+        # The model is protected from garbage collection while it has handlers.
+        self.assert_     (model.deleted.disconnect (handler))
+        self.assert_     (not self.Model.deleted.has_handlers (model))
+
+
+class SignalFactoryTestCase (NotifyTestCase):
+
+    def test_connect_and_emit (self):
+        test    = NotifyTestObject ()
+        factory = SignalFactory ()
+
+        signal = factory['create']
+        signal.connect (test.simple_handler, 'create')
+        factory['delete'].connect (test.simple_handler, 'delete')
+
+        signal.emit (1)
+        factory['delete'] (2)
+        factory['update'] (3)
+
+        self.assert_      (factory['create'].has_handlers ())
+        self.assert_      (not factory['update'].has_handlers ())
+        self.assert_      (factory['create'].is_connected (test.simple_handler, 'create'))
+        self.assert_      (not signal.is_connected (test.simple_handler, 'delete'))
+
+        self.assert_      (factory['delete'].disconnect (test.simple_handler, 'delete'))
+        self.assert_      (not factory['delete'].has_handlers ())
+        factory['delete'] (4)
+
+        test.assert_results (('create', 1), ('delete', 2))
+
+
+    def test_block (self):
+        test    = NotifyTestObject ()
+        factory = SignalFactory ()
+
+        factory['a'].connect (test.simple_handler)
+        self.assert_ (factory['a'].block (test.simple_handler))
+        self.assert_ (not factory['b'].block (test.simple_handler))
+        factory['a'] (1)
+
+        self.assert_ (factory['a'].unblock (test.simple_handler))
+        factory['a'] (2)
+
+        test.assert_results (2)
+
+
+    def test_disconnect_by_id (self):
+        test    = NotifyTestObject ()
+        factory = SignalFactory ()
+
+        connection_1 = factory['a'].connect_with_id (test.simple_handler, 1)
+        self.assert_ (connection_1.disconnect ())
+
+        # Identifiers of the forgotten handler storage must not be reused.
+        connection_2 = factory['a'].connect_with_id (test.simple_handler, 2)
+        self.assert_ (not connection_1.disconnect ())
+        factory['a'] ()
+
+        self.assert_ (connection_2.disconnect ())
+        factory['a'] ()
+
+        test.assert_results (2)
+
+
+    def test_emission_stop (self):
+        test    = NotifyTestObject ()
+        factory = SignalFactory ()
+
+        def stop_emission ():
+            factory['a'].stop_emission ()
+
+        factory['a'].connect (stop_emission)
+        factory['a'].connect (test.simple_handler)
+        factory['a'] ()
+
+        self.assert_        (not factory['a'].stop_emission ())
+        test.assert_results ()
+
+
+    def test_accumulator (self):
+        factory = SignalFactory (AbstractSignal.VALUE_LIST)
+
+        factory['a'].connect (lambda x: x)
+        factory['a'].connect (lambda x: x * 10)
+
+        self.assertEqual (factory['a'] (1), [1, 10])
+        self.assertEqual (factory['b'] (1), [])
+        self.assertEqual (factory['a'].emit_many ([(1,), (2,)]), [[1, 10], [2, 20]])
+
+
+    def test_restricted_names (self):
+        factory = SignalFactory (names = ('create', 'delete'))
+
+        factory['create']
+        self.assertRaises (KeyError, lambda: factory['update'])
+        self.assertEqual  (factory.names, frozenset (['create', 'delete']))
+
+
+    def test_signal_attributes (self):
+        factory = SignalFactory ()
+        signal  = factory['a']
+
+        self.assert_(signal.factory is factory)
+        self.assertEqual (signal.name, 'a')
+
+        factory = TopicSignalFactory ()
+        signal  = factory['a.*']
+
+        self.assert_(signal.factory is factory)
+        self.assertEqual (signal.name, 'a.*')
+
+
+
+class TopicSignalFactoryTestCase (NotifyTestCase):
+
+    def test_wildcards (self):
+        test    = NotifyTestObject ()
+        factory = TopicSignalFactory ()
+
+        factory['orders.42.created'].connect (test.simple_handler, 'exact')
+        factory['orders.*.created'].connect (test.simple_handler, 'star')
+        factory['orders.#'].connect (test.simple_handler, 'hash')
+        factory['*.created'].connect (test.simple_handler, 'short')
+
+        factory['orders.42.created'] (1)
+        factory['orders.1.created'] (2)
+        factory['orders'] (3)
+        factory['orders.1.deleted'] (4)
+        factory['invoices.created'] (5)
+
+        test.assert_results (('exact', 1), ('star', 1), ('hash', 1),
+                             ('star', 2), ('hash', 2),
+                             ('hash', 3),
+                             ('hash', 4),
+                             ('short', 5))
+
+
+    def test_disconnect (self):
+        test    = NotifyTestObject ()
+        factory = TopicSignalFactory ()
+
+        factory['a.#'].connect (test.simple_handler, 'a')
+        factory['a.b.#'].connect (test.simple_handler, 'b')
+        factory['a.b.c'] (1)
+
+        self.assert_ (factory['a.#'].disconnect (test.simple_handler, 'a'))
+        self.assert_ (not factory['a.#'].has_handlers ())
+        factory['a.b.c'] (2)
+
+        self.assert_ (factory['a.b.#'].disconnect (test.simple_handler, 'b'))
+        factory['a.b.c'] (3)
+
+        factory['a.#'].connect (test.simple_handler, 'a')
+        factory['a.b.c'] (4)
+
+        test.assert_results (('b', 1), ('a', 1), ('b', 2), ('a', 4))
+
+
+    def test_block (self):
+        test    = NotifyTestObject ()
+        factory = TopicSignalFactory ()
+
+        factory['a.*'].connect (test.simple_handler, 'a')
+        factory['#'].connect (test.simple_handler, 'any')
+
+        factory['a.*'].block (test.simple_handler, 'a')
+        factory['a.b'] (1)
+
+        factory['a.*'].unblock (test.simple_handler, 'a')
+        factory['a.b'] (2)
+
+        test.assert_results (('any', 1), ('a', 2), ('any', 2))
+
+
+    def test_accumulator (self):
+        factory = TopicSignalFactory (AbstractSignal.ANY_ACCEPTS)
+        test    = NotifyTestObject ()
+
+        factory['a.*'].connect (lambda: False)
+        factory['a.b'].connect (lambda: 'accepted')
+        factory['#'].connect (test.simple_handler)
+
+        self.assertEqual    (factory['a.b'] (), 'accepted')
+        self.assertEqual    (factory['a.c'] (), None)
+        self.assertEqual    (factory['x'].emit_many ([(), ()]), [None, None])
+
+        # The handler for all topics is not reached when emitting 'a.b'.
+        test.assert_results ((), (), ())
+
+
+    def test_emission_stop (self):
+        test    = NotifyTestObject ()
+        factory = TopicSignalFactory ()
+
+        def stop_emission ():
+            factory['a.*'].stop_emission ()
+
+        factory['a.*'].connect (stop_emission)
+        factory['a.#'].connect (test.simple_handler)
+        factory['a.b'] ()
+
+        test.assert_results ()
+
+
+    def test_invalid_topics (self):
+        factory = TopicSignalFactory ()
+
+        self.assertRaises (ValueError, lambda: factory['a..b'])
+        self.assertRaises (ValueError, lambda: factory['a.b*'])
+        self.assertRaises (ValueError, factory['a.*'].emit)
+
+
+
+class ThreadSafeSignalTestCase (NotifyTestCase):
+
+    def test_connect_and_disconnect (self):
+        test   = NotifyTestObject ()
+        signal = ThreadSafeSignal ()
+
+        signal.connect (test.simple_handler)
+        connection = signal.connect_with_id (test.simple_handler, 'a')
+        signal.connect (test.simple_handler)
+        signal.emit (1)
+
+        self.assert_      (connection.disconnect ())
+        self.assert_      (not connection.disconnect ())
+        self.assert_      (signal.disconnect (test.simple_handler))
+        signal.emit (2)
+
+        self.assert_      (signal.disconnect_all (test.simple_handler))
+        self.assert_      (not signal.has_handlers ())
+        signal.emit (3)
+
+        test.assert_results (1, ('a', 1), 1, 2)
+
+
+    def test_block (self):
+        test   = NotifyTestObject ()
+        signal = ThreadSafeSignal ()
+
+        signal.connect (test.simple_handler)
+        signal.block   (test.simple_handler)
+        signal.block   (test.simple_handler)
+        signal.emit (1)
+
+        # Like with Signal, each decrement of the block counter counts.
+        self.assert_ (signal.unblock (test.simple_handler))
+        self.assert_ (signal.is_blocked (test.simple_handler))
+        signal.emit (2)
+
+        self.assert_ (signal.unblock (test.simple_handler))
+        self.assert_ (not signal.is_blocked (test.simple_handler))
+        self.assert_ (not signal.unblock (test.simple_handler))
+        signal.emit (3)
+
+        test.assert_results (3)
+
+
+    def test_accumulator (self):
+        signal = ThreadSafeSignal (AbstractSignal.VALUE_LIST)
+
+        signal.connect (lambda: 1)
+        signal.connect (lambda: 2)
+
+        self.assertEqual (signal.emit (), [1, 2])
+
+
+    def test_emit_many (self):
+        test   = NotifyTestObject ()
+        signal = ThreadSafeSignal ()
+
+        def stop_on_two (value):
+            if value == 2:
+                signal.stop_emission ()
+
+        signal.connect (stop_on_two)
+        signal.connect (test.simple_handler)
+
+        # Stopping only affects the current item.
+        self.assertEqual    (signal.emit_many ([(1,), (2,), [3]]), None)
+        test.assert_results (1, 3)
+
+        signal = ThreadSafeSignal (AbstractSignal.VALUE_LIST)
+        signal.connect (lambda value: value)
+        signal.connect (lambda value: -value)
+
+        self.assertEqual (signal.emit_many ([(1,), (2,)]), [[1, -1], [2, -2]])
+        self.assertEqual (signal.emit_many ([]), [])
+
+
+    def test_emission_snapshot (self):
+        test   = NotifyTestObject ()
+        signal = ThreadSafeSignal ()
+
+        def reconnect (value):
+            signal.disconnect (test.simple_handler)
+            signal.connect    (test.simple_handler_100)
+
+        signal.connect (reconnect)
+        signal.connect (test.simple_handler)
+
+        # Changes only take effect for the next emission.
+        signal.emit (1)
+        signal.emit (2)
+
+        test.assert_results (1, 102)
+
+        signal.disconnect_all (test.simple_handler_100)
+
+
+    def test_per_thread_emission_stop (self):
+        test   = NotifyTestObject ()
+        signal = ThreadSafeSignal ()
+
+        def stop_and_emit_in_thread (value):
+            if value == 1:
+                signal.stop_emission ()
+
+                thread = threading.Thread (target = signal.emit, args = (2,))
+                thread.start ()
+                thread.join ()
+
+        signal.connect (stop_and_emit_in_thread)
+        signal.connect (test.simple_handler)
+
+        signal.emit (1)
+
+        test.assert_results (2)
+
+
+    def test_concurrent_modification (self):
+        test     = NotifyTestObject ()
+        signal   = ThreadSafeSignal ()
+        finished = []
+
+        def modify ():
+            for k in range (1000):
+                signal.connect    (test.simple_handler, k)
+                signal.disconnect (test.simple_handler, k)
+
+            finished.append (True)
+
+        signal.connect (test.simple_handler)
+
+        thread = threading.Thread (target = modify)
+        thread.start ()
+
+        while not finished:
+            signal.emit ()
+
+        thread.join ()
+
+        self.assertEqual (signal.count_handlers (), 1)
+
+
+
+if NotifyTestCase.note_skipped_tests (ThreadPoolExecutor is not None):
+
+    # Shared, so that tests don't leave worker threads behind.
+    _EXECUTOR = ThreadPoolExecutor (2)
+
+    class ExecutorSignalTestCase (NotifyTestCase):
+
+        def test_emit (self):
+            test   = NotifyTestObject ()
+            signal = ExecutorSignal (_EXECUTOR)
+
+            signal.connect (test.simple_handler)
+            signal.connect (test.simple_handler_100)
+            signal.emit (1)
+
+            self.assertEqual (sorted (test.results), [1, 101])
+
+
+        def test_accumulator (self):
+            signal = ExecutorSignal (_EXECUTOR, AbstractSignal.VALUE_LIST)
+
+            signal.connect (lambda value: value)
+            signal.connect (lambda value: value + 1)
+            signal.connect (lambda value: value + 2)
+
+            self.assertEqual (signal.emit (1), [1, 2, 3])
+
+
+        def test_emit_many (self):
+            test    = NotifyTestObject ()
+            threads = []
+            signal  = ExecutorSignal (_EXECUTOR)
+
+            def handler (value):
+                threads.append (threading.currentThread ())
+                test.simple_handler (value)
+
+            signal.connect (handler)
+
+            self.assertEqual    (signal.emit_many ([(1,), [2]]), None)
+            test.assert_results (1, 2)
+
+            # Handlers must run in the executor, as with emit().
+            self.assert_(threading.currentThread () not in threads)
+
+            signal = ExecutorSignal (_EXECUTOR, AbstractSignal.VALUE_LIST)
+            signal.connect (lambda value: value)
+            signal.connect (lambda value: value + 1)
+
+            self.assertEqual (signal.emit_many ([(1,), (5,)]), [[1, 2], [5, 6]])
+
+
+        def test_exception (self):
+            signal     = ExecutorSignal (_EXECUTOR, AbstractSignal.VALUE_LIST)
+            exceptions = []
+
+            signal.connect (lambda: 1)
+            signal.connect (lambda: 1 // 0)
+            signal.connect (lambda: 3)
+
+            original_excepthook = sys.excepthook
+            sys.excepthook      = lambda *exception_info: exceptions.append (exception_info[0])
+
+            try:
+                self.assertEqual (signal.emit (), [1, 3])
+            finally:
+                sys.excepthook = original_excepthook
+
+            self.assertEqual (exceptions, [ZeroDivisionError])
+
+
+        def test_emit_detached (self):
+            test     = NotifyTestObject ()
+            signal   = ExecutorSignal (_EXECUTOR, AbstractSignal.VALUE_LIST)
+            started  = threading.Event ()
+            finished = threading.Event ()
+
+            def handler (value):
+                started.wait ()
+                test.simple_handler (value)
+                finished.set ()
+
+            signal.connect (handler)
+
+            self.assertEqual (signal.emit_detached (1), None)
+            test.assert_results ()
+
+            started.set ()
+            finished.wait ()
+
+            test.assert_results (1)
+
+
+
+class AsyncSignalTestCase (NotifyTestCase):
+
+    def test_emit_1 (self):
+        test   = NotifyTestObject ()
+        signal = AsyncSignal ()
+
+        signal.connect (test.simple_handler)
+        signal.connect (lambda value: _Awaitable (test.simple_handler, value + 10))
+        signal.connect (test.simple_handler, 'x')
+
+        test.assert_results ()
+
+        self.assertEqual (_run (signal.emit (1)), None)
+        test.assert_results (1, ('x', 1), 11)
+
+
+    def test_emit_2 (self):
+        test   = NotifyTestObject ()
+        signal = AsyncSignal ()
+
+        signal.connect (lambda value: _Awaitable (test.simple_handler, value))
+
+        coroutine = signal (1)
+        test.assert_results ()
+
+        _run (coroutine)
+        test.assert_results (1)
+
+
+    def test_accumulator (self):
+        signal = AsyncSignal (AbstractSignal.VALUE_LIST)
+
+        signal.connect (lambda value: _Awaitable (None, value))
+        signal.connect (lambda value: value + 1)
+        signal.connect (lambda value: _Awaitable (None, value + 2))
+
+        self.assertEqual (_run (signal.emit (1)), [1, 2, 3])
+        self.assertEqual (_run (signal.emit_many ([(1,), (5,)])), [[1, 2, 3], [5, 6, 7]])
+
+
+    def test_emission_stop (self):
+        test   = NotifyTestObject ()
+        signal = AsyncSignal (AbstractSignal.LAST_VALUE)
+
+        def stop_emission (value):
+            signal.stop_emission ()
+            return _Awaitable (test.simple_handler, value)
+
+        signal.connect (stop_emission)
+        signal.connect (test.simple_handler)
+
+        self.assertEqual (_run (signal.emit (1)), 1)
+        test.assert_results (1)
+
+
+    def test_emission_stopped (self):
+        test   = NotifyTestObject ()
+        signal = AsyncSignal (AbstractSignal.VALUE_LIST)
+
+        def stop_emission ():
+            was_stopped = signal.emission_stopped
+            stopped     = signal.stop_emission ()
+            return _Awaitable (None, (was_stopped, stopped, signal.stop_emission (),
+                                      signal.emission_stopped))
+
+        signal.connect (stop_emission)
+        signal.connect (test.simple_handler)
+
+        self.assertEqual    (_run (signal.emit ()), [(False, True, False, True)])
+        self.assert_        (not signal.emission_stopped)
+        self.assert_        (not signal.stop_emission ())
+        test.assert_results ()
+
+
+    def test_blocking (self):
+        test   = NotifyTestObject ()
+        signal = AsyncSignal ()
+
+        signal.connect (test.simple_handler)
+        signal.block   (test.simple_handler)
+        _run (signal.emit (1))
+
+        signal.unblock (test.simple_handler)
+        _run (signal.emit (2))
+
+        test.assert_results (2)
+
+
+    def test_exception (self):
+        test       = NotifyTestObject ()
+        signal     = AsyncSignal ()
+        exceptions = []
+
+        signal.connect (lambda: _Awaitable (None, None, ValueError ()))
+        signal.connect (lambda: _Awaitable (test.simple_handler, 1))
+
+        original_excepthook = sys.excepthook
+        sys.excepthook      = lambda *exception_info: exceptions.append (exception_info[0])
+
+        try:
+            _run (signal.emit ())
+        finally:
+            sys.excepthook = original_excepthook
+
+        self.assertEqual (exceptions, [ValueError])
+        test.assert_results (1)
+
+
+    def test_disconnect_while_emitting (self):
+        test   = NotifyTestObject ()
+        signal = AsyncSignal (AbstractSignal.VALUE_LIST)
+
+        def disconnect (value):
+            signal.disconnect (test.simple_handler)
+            return _Awaitable (None, value)
+
+        signal.connect (disconnect)
+        signal.connect (test.simple_handler)
+
+        self.assertEqual (_run (signal.emit (1)), [1])
+        self.assertEqual (signal.count_handlers (), 1)
+        test.assert_results ()
+
+
+
+# Awaitable that works both with and without `asyncio' and in Python versions without
+# `async' syntax.
+class _Awaitable (object):
+
+    def __init__(self, handler, value, exception = None):
+        self.__handler   = handler
+        self.__value     = value
+        self.__exception = exception
+        self.__suspended = False
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not self.__suspended:
+            self.__suspended = True
+            return None
+
+        if self.__exception is not None:
+            raise self.__exception
+
+        if self.__handler is not None:
+            self.__handler (self.__value)
+
+        raise StopIteration (self.__value)
+
+    next = __next__
+
+
+def _run (coroutine):
+    if asyncio is not None:
+        loop = asyncio.new_event_loop ()
+        try:
+            return loop.run_until_complete (coroutine)
+        finally:
+            loop.close ()
+
+    try:
+        while True:
+            coroutine.send (None)
+    except StopIteration:
+        arguments = sys.exc_info () [1].args
+        if arguments:
+            return arguments[0]
+        else:
+            return None
+
+
+
 import __future__
 
 if NotifyTestCase.note_skipped_tests ('with_statement' in __future__.all_feature_names):
     from test._2_5.signal import SignalContextManagerTestCase
 
+if NotifyTestCase.note_skipped_tests (sys.version_info >= (3, 5)):
+    if NotifyTestCase.note_skipped_tests (asyncio is not None,
+                                          NotifyTestCase.REASON_MISSING_MODULE):
+        from test._3_5.signal import AsyncSignalCoroutineTestCase
+
 
 
 if __name__ == '__main__':
@@ -30,12 +30,14 @@ if __name__ == '__main__':
 
 
 import math
+import threading
 import unittest
 
-from notify.variable import AbstractVariable, AbstractValueTrackingVariable, Variable, \
-                            WatcherVariable
-from notify.utils    import StringType
-from test.__common   import NotifyTestCase, NotifyTestObject
+from notify.condition import Condition
+from notify.variable  import AbstractVariable, AbstractValueTrackingVariable, Variable, \
+                             WatcherVariable, ComputedVariable
+from notify.utils     import StringType
+from test.__common    import NotifyTestCase, NotifyTestObject
 
 
 
@@ -128,6 +130,69 @@ class BaseVariableTestCase (NotifyTestCase):
         test.assert_results (0, 5, 15, 16)
 
 
+    def test_lazy_transformation (self):
+        arguments = []
+
+        def transformer (value):
+            arguments.append (value)
+            return value * 2
+
+        variable = Variable (1)
+        doubled  = variable.transform (transformer)
+        self.assertEqual (arguments, [])
+
+        variable.value = 2
+        variable.value = 3
+        self.assertEqual (arguments, [])
+
+        self.assertEqual (doubled.get (), 6)
+        self.assertEqual (doubled.get (), 6)
+        self.assertEqual (arguments, [3])
+
+        test = NotifyTestObject ()
+        doubled.changed.connect (test.simple_handler)
+
+        variable.value = 4
+        self.assertEqual (arguments, [3, 4])
+
+        doubled.changed.disconnect (test.simple_handler)
+        self.collect_garbage ()
+
+        variable.value = 5
+        self.assertEqual (arguments, [3, 4])
+        self.assertEqual (doubled.get (), 10)
+
+        test.assert_results (8)
+
+
+    def test_lazy_predicate (self):
+        arguments = []
+
+        def predicate (value):
+            arguments.append (value)
+            return value > 0
+
+        variable    = Variable (1)
+        is_positive = variable.predicate (predicate)
+
+        variable.value = -1
+        self.assertEqual (arguments, [])
+        self.assert_(not is_positive)
+
+        test = NotifyTestObject ()
+        is_positive.store (test.simple_handler)
+
+        variable.value = 7
+        is_positive.changed.disconnect (test.simple_handler)
+        self.collect_garbage ()
+
+        variable.value = -7
+        self.assertEqual (arguments, [-1, 7])
+        self.assert_(not is_positive)
+
+        test.assert_results (False, True)
+
+
     def test_is_allowed_value (self):
 
         class PositiveVariable (Variable):
@@ -206,6 +271,75 @@ class WatcherVariableTestCase (NotifyTestCase):
 
 
 
+class ComputedVariableTestCase (NotifyTestCase):
+
+    def test_computed_variable_1 (self):
+        calls     = []
+        variable1 = Variable (1)
+        variable2 = Variable (2)
+
+        def compute ():
+            calls.append (None)
+            return variable1.get () + variable2.get ()
+
+        computed = ComputedVariable (compute)
+        self.assertEqual (len (calls), 0)
+
+        self.assertEqual (computed.get (), 3)
+        self.assertEqual (computed.get (), 3)
+        self.assertEqual (len (calls), 1)
+        self.assertEqual (set (computed.dependencies), set ((variable1, variable2)))
+
+        variable2.value = 10
+        self.assertEqual (computed.dependencies, ())
+        self.assertEqual (computed.get (), 11)
+        self.assertEqual (len (calls), 2)
+
+
+    def test_computed_variable_2 (self):
+        test      = NotifyTestObject ()
+        condition = Condition (True)
+        variable1 = Variable (1)
+        variable2 = Variable (2)
+
+        computed = ComputedVariable (lambda: (condition.get () and variable1.get ()
+                                              or variable2.get ()))
+        computed.store (test.simple_handler)
+
+        variable2.value = 20
+        condition.set (False)
+        variable1.value = 10
+        variable2.value = 30
+
+        self.assertEqual (set (computed.dependencies), set ((condition, variable2)))
+
+        computed.changed.disconnect (test.simple_handler)
+        test.assert_results (1, 20, 30)
+
+
+    def test_computed_variable_threads (self):
+        variable1 = Variable (1)
+        variable2 = Variable (2)
+
+        def read_in_thread ():
+            thread = threading.Thread (target = variable2.get)
+            thread.start ()
+            thread.join ()
+
+            return variable1.get ()
+
+        computed = ComputedVariable (read_in_thread)
+
+        # Reads in other threads are not dependencies.
+        self.assertEqual (computed.get (), 1)
+        self.assertEqual (computed.dependencies, (variable1,))
+
+
+    def test_computed_variable_error (self):
+        self.assertRaises (TypeError, lambda: ComputedVariable (25))
+
+
+
 class VariableDerivationTestCase (NotifyTestCase):
 
     def test_derivation_1 (self):
@@ -432,6 +566,124 @@ class VariableDerivationTestCase (NotifyTestCase):
         self.assertRaises (AttributeError, set_main_x)
 
 
+    def test_change_detection_1 (self):
+        test             = NotifyTestObject ()
+        IdentityVariable = Variable.derive_type ('IdentityVariable',
+                                                 change_detection = 'identity')
+
+        value    = [1, 2]
+        variable = IdentityVariable (value)
+        variable.changed.connect (test.simple_handler)
+
+        variable.value = value
+        variable.value = [1, 2]
+
+        variable.changed.disconnect (test.simple_handler)
+        test.assert_results ([1, 2])
+
+
+    def test_change_detection_2 (self):
+        def same_length (value1, value2):
+            return len (value1) == len (value2)
+
+        test           = NotifyTestObject ()
+        LengthVariable = Variable.derive_type ('LengthVariable',
+                                               change_detection = same_length)
+
+        variable = LengthVariable ('abc')
+        variable.changed.connect (test.simple_handler)
+
+        variable.value = 'def'
+        variable.value = 'defg'
+
+        variable.changed.disconnect (test.simple_handler)
+        test.assert_results ('defg')
+
+
+    def test_change_detection_3 (self):
+
+        class Versioned (object):
+
+            def __init__(self):
+                self.version = 0
+
+
+        test            = NotifyTestObject ()
+        VersionVariable = Variable.derive_type ('VersionVariable',
+                                                change_key = lambda value: value.version)
+
+        value    = Versioned ()
+        variable = VersionVariable (value)
+        variable.changed.connect (test.simple_handler)
+
+        variable.value = value
+
+        value.version += 1
+        variable.value = value
+        variable.value = value
+
+        variable.changed.disconnect (test.simple_handler)
+        test.assert_results (value)
+
+
+    def test_change_detection_frozen (self):
+
+        class Versioned (object):
+
+            def __init__(self, version):
+                self.version = version
+
+
+        test            = NotifyTestObject ()
+        VersionVariable = Variable.derive_type ('VersionVariable',
+                                                change_key = lambda value: value.version)
+
+        variable = VersionVariable (Versioned (0))
+        variable.changed.connect (test.simple_handler)
+
+        # Values are different objects, but with the same key in the end.
+        variable.with_changes_frozen (lambda: (variable.set (Versioned (1)),
+                                               variable.set (Versioned (0))))
+        self.assertEqual (variable.value.version, 0)
+        test.assert_results ()
+
+        value = Versioned (2)
+        variable.with_changes_frozen (lambda: variable.set (value))
+
+        variable.changed.disconnect (test.simple_handler)
+        test.assert_results (value)
+
+
+    def test_change_detection_errors (self):
+        self.assertRaises (ValueError,
+                           lambda: Variable.derive_type ('Foo', change_detection = 'foo'))
+        self.assertRaises (ValueError,
+                           lambda: Variable.derive_type ('Foo', change_detection = 'identity',
+                                                         change_key = id))
+        self.assertRaises (TypeError,
+                           lambda: Variable.derive_type ('Foo', change_key = 1))
+
+
+    def test_values_differ (self):
+
+        class IdentityVariable (Variable):
+
+            def values_differ (self, old_value, new_value):
+                return old_value is not new_value
+
+
+        test     = NotifyTestObject ()
+        variable = IdentityVariable (())
+        variable.changed.connect (test.simple_handler)
+
+        variable.value = ()
+        variable.value = [1]
+        variable.value = [1]
+
+        variable.changed.disconnect (test.simple_handler)
+        test.assert_results ([1], [1])
+
+
 
     def test_derivation_slots (self):
         DerivedVariable = AbstractVariable.derive_type ('DerivedVariable')